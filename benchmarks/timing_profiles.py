@@ -0,0 +1,107 @@
+"""
+Benchmarks the --timing profiles against a local listener farm.
+
+Opens --listeners TCP listeners on 127.0.0.1 (plus as many closed ports),
+then scans them with each profile's timeout, jobs, retries, connect rate and
+per-host limit, and prints the wall time, achieved connect rate and the most
+connections the farm (one host) had open at once.
+
+    PYTHONPATH=. python3 benchmarks/timing_profiles.py [--listeners 50] [--profiles polite,normal]
+"""
+import argparse
+import socket
+import threading
+import time
+from typing import List, Tuple
+
+from netcheck.cli import iter_concurrent_checks
+from netcheck.utils.profiles import TIMING_PROFILES
+from netcheck.utils.throttle import ScanThrottle
+from netcheck.utils.scan_options import ScanOptions
+
+class ListenerFarm:
+    """Listening sockets that accept, hold each connection briefly and count concurrent peers."""
+    def __init__(self, count: int, hold: float = 0.005):
+        self.hold = hold
+        self.sockets: List[socket.socket] = []
+        self.peak = 0
+        self._open = 0
+        self._lock = threading.Lock()
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(("127.0.0.1", 0))
+            sock.listen(512)
+            self.sockets.append(sock)
+            threading.Thread(target=self._accept_loop, args=(sock,), daemon=True).start()
+
+    @property
+    def ports(self) -> List[int]:
+        return [sock.getsockname()[1] for sock in self.sockets]
+
+    def _accept_loop(self, sock: socket.socket) -> None:
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._hold, args=(conn,), daemon=True).start()
+
+    def _hold(self, conn: socket.socket) -> None:
+        with self._lock:
+            self._open += 1
+            self.peak = max(self.peak, self._open)
+        time.sleep(self.hold)
+        conn.close()
+        with self._lock:
+            self._open -= 1
+
+    def close(self) -> None:
+        for sock in self.sockets:
+            sock.close()
+
+def closed_ports(count: int) -> List[int]:
+    """Ports that were free a moment ago, so connects to them are refused."""
+    ports = []
+    for _ in range(count):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            ports.append(sock.getsockname()[1])
+    return ports
+
+def run_profile(name: str, targets: List[Tuple[str, int]], farm: ListenerFarm) -> Tuple[float, int, int]:
+    profile = TIMING_PROFILES[name]
+    throttle = None
+    if profile["max_rate"] or profile["host_concurrency"]:
+        throttle = ScanThrottle(profile["max_rate"], profile["host_concurrency"])
+    farm.peak = 0
+    start = time.monotonic()
+    options = ScanOptions(profile["timeout"], profile["jobs"], profile["retry"], profile["retry_delay"], throttle=throttle)
+    open_ports = sum(1 for _, res in iter_concurrent_checks(targets, options) if res["success"])
+    return time.monotonic() - start, open_ports, farm.peak
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listeners", type=int, default=50)
+    parser.add_argument("--profiles", default=",".join(TIMING_PROFILES))
+    parser.add_argument("--max-seconds", type=float, default=30.0,
+                        help="Shrink each profile's target list so a rate-capped run takes about this long")
+    args = parser.parse_args()
+
+    farm = ListenerFarm(args.listeners)
+    # Open and closed ports alternate, so a shortened list still has both
+    ports = [p for pair in zip(farm.ports, closed_ports(args.listeners)) for p in pair]
+    all_targets = [("127.0.0.1", p) for p in ports]
+    print(f"{'profile':<11} {'targets':>7} {'open':>5} {'seconds':>8} {'connects/s':>10} {'peak/host':>9}")
+    try:
+        for name in args.profiles.split(","):
+            rate = TIMING_PROFILES[name]["max_rate"]
+            limit = len(all_targets) if not rate else max(2, min(len(all_targets), int(rate * args.max_seconds)))
+            targets = all_targets[:limit]
+            elapsed, open_ports, peak = run_profile(name, targets, farm)
+            print(f"{name:<11} {len(targets):>7} {open_ports:>5} {elapsed:>8.2f} {len(targets) / elapsed:>10.1f} {peak:>9}")
+    finally:
+        farm.close()
+
+if __name__ == "__main__":
+    main()
@@ -2,34 +2,73 @@ import sys
 import os
 import time
 import argparse
+import atexit
 import csv
+import sqlite3
 import io
+import ipaddress
+import random
+from bisect import bisect_right
+from collections import deque
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Tuple, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator, Sequence, Union, Callable
 
-from netcheck.modules.tcp import check_tcp_connect
-from netcheck.modules.dns import dns_lookup
+from netcheck.modules.tcp import check_tcp_connect, new_tcp_result, mark_tcp_dns_failure
+from netcheck.modules.async_tcp import AsyncCheckExecutor, async_check_tcp_connect, async_run_check_with_retry
+from netcheck.modules.dns import dns_lookup, set_resolver, RESOLVERS
 from netcheck.modules.http import check_http_status
 from netcheck.modules.ssl import check_ssl_certificate
 from netcheck.modules.ping import ping_host
 from netcheck.modules.interfaces import get_network_interfaces
 from netcheck.utils.formatters import format_text, format_json, format_csv, format_xml, get_colors
-from netcheck.utils.range_expanders import expand_ip_range, expand_port_range
+from netcheck.utils.range_expanders import parse_ip_range, ip_range_size, expand_port_range
 from netcheck.utils.normalize import parse_line_to_raw_host_port
+from netcheck.utils.pipeline import BoundedScheduler
+from netcheck.utils.dedupe import DuplicateFilter, dedupe_targets
+from netcheck.utils.fair_queue import FairQueue
+from netcheck.utils.permutation import FeistelPermutation
+from netcheck.utils.journal import ScanJournal, targets_fingerprint
+from netcheck.utils.circuit_breaker import HostCircuitBreaker, SKIPPED_HOST_DOWN
+from netcheck.utils.concurrency import AIMDController
+from netcheck.utils.throttle import ScanThrottle
+from netcheck.utils.profiles import TIMING_PROFILES, get_timing_profile
+from netcheck.utils.sinks import open_stream_writer, BatchFileSinks
+from netcheck.utils.deadline import Deadline, accepts_deadline
+from netcheck.utils.retry import backoff_delay, RetryPolicy, DEFAULT_RETRY_POLICY
+from netcheck.utils.scan_options import ScanOptions
+from netcheck.utils.cache import dns_cache, rdns_cache, general_cache
+from netcheck.utils.timeout import timeout_pool_stats
+from netcheck.utils.persistent_cache import enable_persistent_cache, persistent_cache_requested
+from netcheck.resolverd.client import set_resolverd
 
-def run_check_with_retry(check_fn, args=(), kwargs=None, retries=1, delay=1.0) -> Dict[str, Any]:
-    """Runs a check function and retries it if it fails or returns success=False."""
+def run_check_with_retry(check_fn, args=(), kwargs=None, retries=1, delay=1.0, budget: Optional[float] = None, backoff: float = 1.0, jitter: float = 0.0, policy: Optional[RetryPolicy] = None, on_attempt: Optional[Callable[[Dict[str, Any]], None]] = None, abort: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """
+    Runs a check function and retries it if it fails or returns success=False.
+    Only failures whose error class `policy` retries (default: the
+    transient ones, see RetryPolicy) get another attempt.
+    The wait after attempt n is `delay * backoff ** (n - 1)`, spread by
+    +/- `jitter` (see backoff_delay).
+    With a `budget` (seconds), one Deadline covers every attempt and the waits
+    between them: checks that accept a `deadline` are cut short by it, and no
+    retry is started once the remaining budget can't cover the retry delay.
+    `on_attempt(result)` sees every attempt's result, and `abort()` is asked
+    before each retry; returning True (e.g. the host's circuit breaker
+    opened meanwhile) ends the retries early.
+    """
     if kwargs is None:
         kwargs = {}
+    if policy is None:
+        policy = DEFAULT_RETRY_POLICY
+    deadline = Deadline(budget) if budget is not None else None
+    if deadline is not None and accepts_deadline(check_fn):
+        kwargs = dict(kwargs, deadline=deadline)
         
     attempt = 1
     result = None
     while attempt <= retries:
         try:
             result = check_fn(*args, **kwargs)
-            if result.get("success", False):
-                return result
         except Exception as e:
             result = {
                 "target": str(args[0]) if args else "unknown",
@@ -39,9 +78,21 @@ def run_check_with_retry(check_fn, args=(), kwargs=None, retries=1, delay=1.0) -
                 "error": str(e),
                 "metadata": {}
             }
+        if on_attempt is not None:
+            on_attempt(result)
+        if result.get("success", False):
+            return result
             
         if attempt < retries:
-            time.sleep(delay)
+            if not policy.should_retry(result, attempt):
+                break
+            wait = backoff_delay(attempt, delay, backoff, jitter)
+            if deadline is not None and deadline.remaining() <= wait:
+                # Not enough budget left to wait and try again
+                break
+            if abort is not None and abort():
+                break
+            time.sleep(wait)
         attempt += 1
         
     return result or {"success": False, "status": "FAILED", "target": "unknown", "error": "No attempts made"}
@@ -108,6 +159,16 @@ Usage: {cmd_name} [OPTIONS] [input_file]
 OPTIONS:
     -t, --timeout <seconds>     Connection timeout (default: 5)
     -j, --jobs <number>         Max parallel jobs (default: 10)
+    --auto-jobs                 Adapt parallel jobs to the network (AIMD on timeouts and RTT),
+                                starting from --jobs; the trajectory is shown at the end
+    --min-jobs / --max-jobs <n> Floor and ceiling for --auto-jobs (default: 4 / 500)
+    --max-rate <per-second>     Start at most this many TCP connects per second overall
+    --host-concurrency <n>      Check at most this many ports of one host at a time
+    --host-rate <per-second>    Start at most this many connects per second to one host
+    --subnet-rate <per-second>  Start at most this many connects per second to one /24 (IPv6: /64)
+    --timing <profile>          paranoid, polite, normal, aggressive or insane: sets timeout,
+                                jobs, retries, retry delay, --max-rate and --host-concurrency
+                                (explicit flags still win)
     -V, --verbose               Verbose output
     -f, --format <format>       Output format: text, json, csv, xml (default: text)
     -c, --combined              Create combined report with all results
@@ -121,6 +182,45 @@ OPTIONS:
     --my-ip --all               Show all interfaces including inactive ones
     --retry <number>            Retry failed connections N times (default: 1, no retry)
     --retry-delay <seconds>     Delay between retries in seconds (default: 1)
+    --retry-backoff <factor>    Multiply the retry delay by this after each retry (default: 1)
+    --retry-jitter <fraction>   Randomize each retry delay by up to +/- this fraction (default: 0)
+    --retry-on <classes>        Error classes to retry, optionally capped as class=attempts, or
+                                all/none (default: timeout,reset,unreachable=2,dns_timeout,
+                                dns_failure,http_server_error,unknown)
+    --deadline <seconds>        Total time budget per check across all retries and delays
+                               (each attempt is always bounded by --timeout)
+    --dns-nxdomain-ttl <secs>   How long to remember names that do not exist (default: 300, 0 disables)
+    --dns-servfail-ttl <secs>   How long to remember resolver failures/timeouts (default: 30, 0 disables)
+    --resolver <resolver>       DNS resolver: system (getaddrinfo) or builtin (UDP/TCP stub
+                               resolver using /etc/resolv.conf, honours record TTLs) (default: system)
+    --engine <engine>           TCP check engine: thread, async (default: thread)
+                               async keeps --jobs connects in flight on one event loop
+    --stream                    Write each result to the console/output files as it completes
+                               (bounded memory for very large scans)
+    --resolve-jobs <number>     Resolve a batch's hostnames this many at a time before connecting;
+                               unresolvable hosts fail without a connect slot (default: 50, 0 disables)
+    --dedupe-endpoints          Connect once per resolved (IPs, port) endpoint and copy the result to
+                               every target that shares it (aliases, CNAMEs, name + IP literal)
+    --dedupe                    Drop repeated host:port targets before they are checked (exact up to
+                               100k targets, then a Bloom filter with bounded memory)
+    --dedupe-fp-rate <rate>     Bloom filter false-positive rate for --dedupe (default: 0.001)
+    --interleave                Round-robin batch checks across input lines, and across each line's
+                               hosts, instead of checking line by line and host by host
+    --randomize                 Check quick/batch targets in a pseudo-random order spread over all
+                               hosts and ports (takes precedence over --interleave)
+    --seed <number>             Seed for --randomize; the same seed gives the same order (default:
+                               random, printed at the start)
+    --journal <file>            Append each batch result to a checkpoint journal as it completes
+    --resume <file>             Continue the batch scan recorded in a journal, skipping finished
+                               targets (same input; order and dedupe settings come from the journal)
+    --host-down-after <N>       Treat a host as down after N consecutive timed-out checks and report
+                               its remaining ports as SKIPPED_HOST_DOWN (default: 0, off)
+    --host-down-probe <secs>    With --host-down-after, still probe a down host once per interval
+                               and resume checking it if it answers
+    --stats                     Print cache hit/miss/eviction and resolver pool statistics to stderr
+    --persistent-cache          Share DNS and public IP answers across runs via an on-disk cache in
+                               $XDG_CACHE_HOME/netcheck (also enabled by NETCHECK_PERSISTENT_CACHE=1)
+    --no-resolverd              Resolve in this process even if a `netcheck resolverd` daemon is running
     --csv                       Input file is in CSV format (host,port)
     -h, --help                  Show this help message
     -v, --version               Show version information
@@ -141,6 +241,9 @@ EXAMPLES:
     {cmd_name} -q 10.0.0.1-50 22                    # Quick test IP range
     {cmd_name} -q 192.168.1.90-95 22 -o results.txt # Save quick mode to file
     {cmd_name} -q 10.0.0.1-100 22 -j 20             # Quick mode with parallel jobs
+    {cmd_name} -q 10.0.0.0/16 22 --engine async -j 5000  # Large sweep on the async engine
+    {cmd_name} -q 10.0.0.5 1-1024 --host-down-after 3 # Stop probing a host that drops everything
+    {cmd_name} --stream -f csv big-ranges.txt       # Stream results with flat memory use
     {cmd_name} -d google.com                        # Resolve DNS to IP
     {cmd_name} -d https://api.example.com           # DNS from URL (strips scheme/path)
     {cmd_name} -p 8.8.8.8                           # Ping Google DNS
@@ -152,6 +255,8 @@ EXAMPLES:
     {cmd_name} --my-ip                              # Show all network interfaces and IPs
     {cmd_name} --my-ip --all                        # Show all interfaces (including down)
     {cmd_name} --retry 3 --retry-delay 2 hosts.txt  # Retry failed connections 3 times with 2s delay
+    {cmd_name} --retry 3 --deadline 8 hosts.txt     # Retry, but give up on a target after 8s in total
+    {cmd_name} resolverd &                          # Share one DNS cache between all local netcheck runs
     {cmd_name} -v                                   # Show version
     {cmd_name} -q localhost 8000-8100               # Quick test port range
     echo "192.168.1.1-50 80" | {cmd_name}          # Check IP range
@@ -197,7 +302,7 @@ def main():
         # Check if stdin has data
         if not sys.stdin.isatty():
             lines = sys.stdin.read().splitlines()
-            run_batch_lines(lines, timeout=5.0, max_jobs=10, format_name="text", combined=False, retries=1, retry_delay=1.0, verbose=False)
+            run_batch_lines(lines, ScanOptions(), "text", combined=False)
             return
         print_help()
         sys.exit(1)
@@ -205,7 +310,7 @@ def main():
     first_arg = sys.argv[1]
     
     # 1. Redesigned Subcommand Route
-    if first_arg in ("tcp", "dns", "http", "ssl", "ping", "interfaces"):
+    if first_arg in ("tcp", "dns", "http", "ssl", "ping", "interfaces", "resolverd"):
         handle_subcommands(first_arg, sys.argv[2:])
         return
         
@@ -223,16 +328,49 @@ def main():
     parser.add_argument("--csv", action="store_true")
     parser.add_argument("-t", "--timeout", type=float, default=5.0)
     parser.add_argument("-j", "--jobs", type=int, default=10)
+    parser.add_argument("--auto-jobs", action="store_true")
+    parser.add_argument("--min-jobs", type=int, default=4)
+    parser.add_argument("--max-jobs", type=int, default=500)
+    parser.add_argument("--max-rate", type=float)
+    parser.add_argument("--host-concurrency", type=int)
+    parser.add_argument("--host-rate", type=float)
+    parser.add_argument("--subnet-rate", type=float)
     parser.add_argument("-f", "--format", default="text", choices=["text", "json", "csv", "xml"])
     parser.add_argument("-c", "--combined", action="store_true")
     parser.add_argument("-o", "--output")
     parser.add_argument("--retry", type=int, default=1)
     parser.add_argument("--retry-delay", type=float, default=1.0)
+    parser.add_argument("--retry-backoff", type=float, default=1.0)
+    parser.add_argument("--retry-jitter", type=float, default=0.0)
+    parser.add_argument("--retry-on", type=parse_retry_policy, default=DEFAULT_RETRY_POLICY)
+    parser.add_argument("--timing", choices=list(TIMING_PROFILES))
+    parser.add_argument("--deadline", type=float)
+    parser.add_argument("--dns-nxdomain-ttl", type=float, default=300.0)
+    parser.add_argument("--dns-servfail-ttl", type=float, default=30.0)
+    parser.add_argument("--resolver", default="system", choices=RESOLVERS)
+    parser.add_argument("--stats", action="store_true")
+    parser.add_argument("--persistent-cache", action="store_true")
+    parser.add_argument("--no-resolverd", action="store_true")
+    parser.add_argument("--engine", default="thread", choices=["thread", "async"])
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--resolve-jobs", type=int, default=50)
+    parser.add_argument("--dedupe-endpoints", action="store_true")
+    parser.add_argument("--host-down-after", type=int, default=0)
+    parser.add_argument("--host-down-probe", type=float)
+    parser.add_argument("--dedupe", action="store_true")
+    parser.add_argument("--dedupe-fp-rate", type=parse_fp_rate, default=0.001)
+    parser.add_argument("--interleave", action="store_true")
+    parser.add_argument("--randomize", action="store_true")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--journal")
+    parser.add_argument("--resume")
     parser.add_argument("-V", "--verbose", action="store_true")
     parser.add_argument("--all", action="store_true")
     parser.add_argument("input_file", nargs="?")
     
     args, unknown = parser.parse_known_args()
+    if apply_timing_profile(parser, args):
+        args, unknown = parser.parse_known_args()
     
     if args.help:
         print_help()
@@ -243,6 +381,8 @@ def main():
         print(f"netcheck version {__version__}")
         sys.exit(0)
         
+    apply_runtime_options(args)
+
     if args.mcp:
         from netcheck.mcp.server import start_mcp_server
         start_mcp_server()
@@ -253,6 +393,7 @@ def main():
     timeout = args.timeout
     retries = args.retry
     retry_delay = args.retry_delay
+    deadline = args.deadline
     verbose = args.verbose
     
     if args.my_ip:
@@ -261,32 +402,31 @@ def main():
         sys.exit(0 if res["success"] else 1)
         
     if args.dns:
-        res = run_check_with_retry(dns_lookup, (args.dns, timeout), retries=retries, delay=retry_delay)
+        res = run_check_with_retry(dns_lookup, (args.dns, timeout), {"reverse": True}, retries=retries, delay=retry_delay, budget=deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], fmt, verbose=verbose))
         sys.exit(0 if res["success"] else 1)
         
     if args.ping:
-        res = run_check_with_retry(ping_host, (args.ping, 4, timeout), retries=retries, delay=retry_delay)
+        res = run_check_with_retry(ping_host, (args.ping, 4, timeout), retries=retries, delay=retry_delay, budget=deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], fmt, verbose=verbose))
         sys.exit(0 if res["success"] else 1)
         
     if args.status:
-        res = run_check_with_retry(check_http_status, (args.status, timeout), retries=retries, delay=retry_delay)
+        res = run_check_with_retry(check_http_status, (args.status, timeout), retries=retries, delay=retry_delay, budget=deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], fmt, verbose=verbose))
         sys.exit(0 if res["success"] else 1)
         
     if args.cert:
-        res = run_check_with_retry(check_ssl_certificate, (args.cert, 443, timeout), retries=retries, delay=retry_delay)
+        res = run_check_with_retry(check_ssl_certificate, (args.cert, 443, timeout), retries=retries, delay=retry_delay, budget=deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], fmt, verbose=verbose))
         sys.exit(0 if res["success"] else 1)
         
     if args.quick:
         host, port_str = args.quick
-        run_quick_test(host, port_str, timeout, args.jobs, fmt, args.output, retries, retry_delay, verbose=verbose)
+        run_quick_test(host, port_str, build_scan_options(args), fmt, args.output, verbose=verbose, stream=args.stream, shuffle_seed=randomize_seed(args))
         return
         
     # Stdin or File Batch checks
-    targets = []
     if args.csv:
         if args.input_file:
             targets = parse_csv_file(args.input_file)
@@ -295,22 +435,16 @@ def main():
         else:
             print("Error: No CSV input file or stdin stream provided", file=sys.stderr)
             sys.exit(1)
-        run_batch_targets(targets, timeout, args.jobs, fmt, args.combined, retries, retry_delay, verbose=verbose)
-        return
-        
-    if args.input_file:
+    elif args.input_file:
         targets = parse_batch_file(args.input_file)
-        run_batch_targets(targets, timeout, args.jobs, fmt, args.combined, retries, retry_delay, verbose=verbose)
-        return
-        
-    # Stdin fallback if no args are matched
-    if not sys.stdin.isatty():
+    elif not sys.stdin.isatty():
+        # Stdin fallback if no args are matched
         targets = parse_batch_content(sys.stdin.read())
-        run_batch_targets(targets, timeout, args.jobs, fmt, args.combined, retries, retry_delay, verbose=verbose)
-        return
+    else:
+        print_help()
+        sys.exit(1)
         
-    print_help()
-    sys.exit(1)
+    run_batch_targets(targets, build_scan_options(args), fmt, args.combined, verbose=verbose, stream=args.stream, resolve_jobs=args.resolve_jobs, dedupe_endpoints=args.dedupe_endpoints, dedupe_fp_rate=args.dedupe_fp_rate if args.dedupe else None, interleave=args.interleave, shuffle_seed=randomize_seed(args), journal_file=args.resume or args.journal, resume=args.resume is not None)
 
 def handle_subcommands(subcommand: str, sub_args: List[str]):
     parser = argparse.ArgumentParser(prog=f"netcheck {subcommand}")
@@ -318,70 +452,225 @@ def handle_subcommands(subcommand: str, sub_args: List[str]):
     parser.add_argument("-f", "--format", default="text", choices=["text", "json", "csv", "xml"])
     parser.add_argument("--retry", type=int, default=1)
     parser.add_argument("--retry-delay", type=float, default=1.0)
+    parser.add_argument("--retry-backoff", type=float, default=1.0)
+    parser.add_argument("--retry-jitter", type=float, default=0.0)
+    parser.add_argument("--retry-on", type=parse_retry_policy, default=DEFAULT_RETRY_POLICY)
+    parser.add_argument("--timing", choices=list(TIMING_PROFILES))
+    parser.add_argument("--deadline", type=float)
+    parser.add_argument("--dns-nxdomain-ttl", type=float, default=300.0)
+    parser.add_argument("--dns-servfail-ttl", type=float, default=30.0)
+    parser.add_argument("--resolver", default="system", choices=RESOLVERS)
+    parser.add_argument("--stats", action="store_true")
+    parser.add_argument("--persistent-cache", action="store_true")
+    parser.add_argument("--no-resolverd", action="store_true")
     parser.add_argument("-V", "--verbose", action="store_true")
     
     if subcommand == "tcp":
         parser.add_argument("host")
         parser.add_argument("port")
         parser.add_argument("-j", "--jobs", type=int, default=10)
+        parser.add_argument("--auto-jobs", action="store_true")
+        parser.add_argument("--min-jobs", type=int, default=4)
+        parser.add_argument("--max-jobs", type=int, default=500)
+        parser.add_argument("--max-rate", type=float)
+        parser.add_argument("--host-concurrency", type=int)
+        parser.add_argument("--host-rate", type=float)
+        parser.add_argument("--subnet-rate", type=float)
+        parser.add_argument("--randomize", action="store_true")
+        parser.add_argument("--seed", type=int)
         parser.add_argument("-o", "--output")
-        args = parser.parse_args(sub_args)
-        run_quick_test(args.host, args.port, args.timeout, args.jobs, args.format, args.output, args.retry, args.retry_delay, verbose=args.verbose)
+        parser.add_argument("--engine", default="thread", choices=["thread", "async"])
+        parser.add_argument("--stream", action="store_true")
+        parser.add_argument("--host-down-after", type=int, default=0)
+        parser.add_argument("--host-down-probe", type=float)
+        args = parse_subcommand_args(parser, sub_args)
+        apply_runtime_options(args)
+        run_quick_test(args.host, args.port, build_scan_options(args), args.format, args.output, verbose=args.verbose, stream=args.stream, shuffle_seed=randomize_seed(args))
         
     elif subcommand == "dns":
         parser.add_argument("host")
-        args = parser.parse_args(sub_args)
-        res = run_check_with_retry(dns_lookup, (args.host, args.timeout), retries=args.retry, delay=args.retry_delay)
+        args = parse_subcommand_args(parser, sub_args)
+        apply_runtime_options(args)
+        res = run_check_with_retry(dns_lookup, (args.host, args.timeout), {"reverse": True}, retries=args.retry, delay=args.retry_delay, budget=args.deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], args.format, verbose=args.verbose))
         sys.exit(0 if res["success"] else 1)
         
     elif subcommand == "http":
         parser.add_argument("url")
-        args = parser.parse_args(sub_args)
-        res = run_check_with_retry(check_http_status, (args.url, args.timeout), retries=args.retry, delay=args.retry_delay)
+        args = parse_subcommand_args(parser, sub_args)
+        apply_runtime_options(args)
+        res = run_check_with_retry(check_http_status, (args.url, args.timeout), retries=args.retry, delay=args.retry_delay, budget=args.deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], args.format, verbose=args.verbose))
         sys.exit(0 if res["success"] else 1)
         
     elif subcommand == "ssl":
         parser.add_argument("host")
         parser.add_argument("port", type=int, nargs="?", default=443)
-        args = parser.parse_args(sub_args)
-        res = run_check_with_retry(check_ssl_certificate, (args.host, args.port, args.timeout), retries=args.retry, delay=args.retry_delay)
+        args = parse_subcommand_args(parser, sub_args)
+        apply_runtime_options(args)
+        res = run_check_with_retry(check_ssl_certificate, (args.host, args.port, args.timeout), retries=args.retry, delay=args.retry_delay, budget=args.deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], args.format, verbose=args.verbose))
         sys.exit(0 if res["success"] else 1)
         
     elif subcommand == "ping":
         parser.add_argument("host")
         parser.add_argument("-c", "--count", type=int, default=4)
-        args = parser.parse_args(sub_args)
-        res = run_check_with_retry(ping_host, (args.host, args.count, args.timeout), retries=args.retry, delay=args.retry_delay)
+        args = parse_subcommand_args(parser, sub_args)
+        apply_runtime_options(args)
+        res = run_check_with_retry(ping_host, (args.host, args.count, args.timeout), retries=args.retry, delay=args.retry_delay, budget=args.deadline, backoff=args.retry_backoff, jitter=args.retry_jitter, policy=args.retry_on)
         print(format_output([res], args.format, verbose=args.verbose))
         sys.exit(0 if res["success"] else 1)
         
     elif subcommand == "interfaces":
         parser.add_argument("--all", action="store_true")
-        args = parser.parse_args(sub_args)
+        args = parse_subcommand_args(parser, sub_args)
+        apply_runtime_options(args)
         res = get_network_interfaces(all_interfaces=args.all)
         print(format_output([res], args.format, verbose=args.verbose))
         sys.exit(0 if res["success"] else 1)
 
-def run_quick_test(host: str, port_str: str, timeout: float, max_jobs: int, fmt: str, output_file: str, retries: int, retry_delay: float, verbose: bool = False):
-    hosts = expand_ip_range(host)
+    elif subcommand == "resolverd":
+        parser.add_argument("--socket")
+        parser.add_argument("--workers", type=int, default=64)
+        args = parse_subcommand_args(parser, sub_args)
+        apply_runtime_options(args)
+        from netcheck.resolverd.server import run_resolverd
+        run_resolverd(args.socket, args.workers)
+
+def apply_timing_profile(parser: argparse.ArgumentParser, args: argparse.Namespace) -> bool:
+    """
+    Makes the --timing profile's settings the parser's defaults, so parsing
+    again applies them wherever no explicit flag was given. Returns whether
+    there was a profile to apply.
+    """
+    if not args.timing:
+        return False
+    profile = get_timing_profile(args.timing)
+    parser.set_defaults(**{dest: value for dest, value in profile.items() if hasattr(args, dest)})
+    return True
+
+def parse_subcommand_args(parser: argparse.ArgumentParser, sub_args: List[str]) -> argparse.Namespace:
+    args = parser.parse_args(sub_args)
+    if apply_timing_profile(parser, args):
+        args = parser.parse_args(sub_args)
+    return args
+
+def parse_retry_policy(spec: str) -> RetryPolicy:
+    """argparse type for --retry-on."""
+    try:
+        return RetryPolicy.parse(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def parse_fp_rate(spec: str) -> float:
+    """argparse type for --dedupe-fp-rate: a probability strictly between 0 and 1."""
+    try:
+        rate = float(spec)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid rate: {spec}")
+    if not 0 < rate < 1:
+        raise argparse.ArgumentTypeError(f"rate must be between 0 and 1 (exclusive): {spec}")
+    return rate
+
+def build_concurrency_controller(args: argparse.Namespace) -> Optional[AIMDController]:
+    """The adaptive in-flight limit asked for by --auto-jobs (starting at --jobs), if any."""
+    if not args.auto_jobs:
+        return None
+    return AIMDController(args.jobs, floor=args.min_jobs, ceiling=args.max_jobs)
+
+def randomize_seed(args: argparse.Namespace) -> Optional[int]:
+    """The --randomize seed (--seed, or a fresh one that is reported so the order can be repeated), if any."""
+    if not args.randomize or getattr(args, "resume", None):
+        # A resumed scan keeps the order recorded in its journal
+        return None
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    print(f"Randomized target order with seed {seed} (repeat with --seed {seed})", file=sys.stderr)
+    return seed
+
+def build_scan_throttle(args: argparse.Namespace) -> Optional[ScanThrottle]:
+    """The connect rate caps and per-host limit asked for by --max-rate / --host-concurrency / --host-rate / --subnet-rate, if any."""
+    if not (args.max_rate or args.host_concurrency or args.host_rate or args.subnet_rate):
+        return None
+    return ScanThrottle(args.max_rate, args.host_concurrency, host_rate=args.host_rate, subnet_rate=args.subnet_rate)
+
+def build_circuit_breaker(args: argparse.Namespace) -> Optional[HostCircuitBreaker]:
+    """The per-host circuit breaker asked for by --host-down-after / --host-down-probe, if any."""
+    if args.host_down_after <= 0:
+        return None
+    return HostCircuitBreaker(args.host_down_after, args.host_down_probe)
+
+def build_scan_options(args: argparse.Namespace) -> ScanOptions:
+    """The ScanOptions for a quick or batch scan: timeouts, retries, engine and the limiters built above."""
+    return ScanOptions(args.timeout, args.jobs, args.retry, args.retry_delay, retry_backoff=args.retry_backoff,
+                       retry_jitter=args.retry_jitter, retry_policy=args.retry_on, engine=args.engine,
+                       deadline=args.deadline, breaker=build_circuit_breaker(args),
+                       concurrency=build_concurrency_controller(args), throttle=build_scan_throttle(args))
+
+def apply_runtime_options(args: argparse.Namespace) -> None:
+    """Applies the resolver choice, negative DNS cache TTLs, the persistent cache, --no-resolverd and --stats."""
+    set_resolver(args.resolver)
+    if args.no_resolverd:
+        set_resolverd(False)
+    dns_cache.negative_ttls["nxdomain"] = args.dns_nxdomain_ttl
+    dns_cache.negative_ttls["servfail"] = args.dns_servfail_ttl
+    if args.persistent_cache or persistent_cache_requested():
+        try:
+            enable_persistent_cache()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: persistent cache unavailable, continuing without it: {e}", file=sys.stderr)
+    if args.stats:
+        # Every command ends in sys.exit(), so print once the run is over
+        atexit.register(lambda: print(format_runtime_stats(), file=sys.stderr))
+
+def format_runtime_stats() -> str:
+    """Cache hit rates and resolver pool saturation counters for --stats."""
+    lines = ["Runtime statistics:"]
+    for name, cache in (("dns_cache", dns_cache), ("rdns_cache", rdns_cache), ("general_cache", general_cache)):
+        st = cache.stats()
+        lines.append(
+            f"  {name}: {st['hits']} hits, {st['misses']} misses ({st['hit_rate'] * 100:.1f}% hit rate), "
+            f"{st['negative_hits']} negative hits, {st['evictions']} evictions, {st['expirations']} expired, "
+            f"{st['entries']}/{st['max_entries']} entries"
+        )
+    pool = timeout_pool_stats()
+    lines.append(
+        f"  resolver pool: {pool['in_flight']}/{pool['max_workers']} in flight, {pool['queued']} queued, "
+        f"{pool['stuck']} stuck, {pool['timed_out']} timed out, {pool['cancelled']} cancelled, {pool['rejected']} rejected"
+    )
+    return "\n".join(lines)
+
+def run_quick_test(host: Union[str, Sequence], port_str: str, options: ScanOptions, fmt: str, output_file: str, verbose: bool = False, stream: bool = False, shuffle_seed: Optional[int] = None):
+    hosts = parse_ip_range(host)
     ports = expand_port_range(port_str)
     
-    targets = []
-    for h in hosts:
-        for p in ports:
-            targets.append((h, p))
-            
-    if not targets:
+    total = ip_range_size(hosts) * len(ports)
+    if not total:
         print("Error: No valid host or port specified", file=sys.stderr)
         sys.exit(1)
         
-    results = execute_concurrent_checks(targets, timeout, max_jobs, retries, retry_delay, verbose=verbose)
+    if shuffle_seed is not None:
+        targets = iter_randomized_targets([(host, port_str)], shuffle_seed)
+    else:
+        targets = ((h, p) for h in hosts for p in ports)
+    
+    if stream:
+        sinks = [open_stream_writer(fmt, sys.stdout, "all")]
+        try:
+            if output_file:
+                sinks.append(open_stream_writer(fmt, open(output_file, "w"), "all", use_color=False))
+        except Exception as e:
+            print(f"Error saving results to file {output_file}: {e}", file=sys.stderr)
+        _, failures = stream_concurrent_checks(targets, total, sinks, options, verbose=verbose)
+        if len(sinks) > 1:
+            print(f"Results saved to: {output_file}", file=sys.stderr)
+        report_concurrency(options.concurrency)
+        sys.exit(0 if failures == 0 else 1)
+        
+    results = execute_concurrent_checks(targets, options, verbose=verbose, total=total)
     
     output_str = format_output(results, fmt, verbose=verbose)
     print(output_str)
+    report_concurrency(options.concurrency)
     
     if output_file:
         try:
@@ -394,31 +683,207 @@ def run_quick_test(host: str, port_str: str, timeout: float, max_jobs: int, fmt:
     all_success = all(r["success"] for r in results)
     sys.exit(0 if all_success else 1)
 
-def run_batch_targets(targets: List[Tuple[str, str]], timeout: float, max_jobs: int, fmt: str, combined: bool, retries: int, retry_delay: float, verbose: bool = False):
-    expanded_targets = []
+def iter_expanded_targets(targets: Iterable[Tuple[Union[str, Sequence], str]]) -> Iterator[Tuple[str, int]]:
+    """Lazily expands raw (host, ports) pairs into individual (host, port) checks."""
     for host, p_str in targets:
         ports = expand_port_range(p_str)
-        hosts = expand_ip_range(host)
-        for h in hosts:
+        if not ports:
+            continue
+        for h in parse_ip_range(host):
             for p in ports:
-                expanded_targets.append((h, p))
-            
-    if not expanded_targets:
+                yield (h, p)
+
+def iter_interleaved_targets(targets: Iterable[Tuple[Union[str, Sequence], str]]) -> Iterator[Tuple[str, int]]:
+    """
+    Expands raw (host, ports) pairs like iter_expanded_targets, but fairly:
+    lines take turns (round robin through a FairQueue, so a short line is
+    not stuck behind a /16), and within a line each port is checked on
+    every host before the next port, so no host sees a run of its ports.
+    """
+    def port_major(hosts: Sequence[str], ports: List[int]) -> Iterator[Tuple[str, int]]:
+        for p in ports:
+            for h in hosts:
+                yield (h, p)
+
+    queue: FairQueue[Tuple[str, int]] = FairQueue()
+    for host, p_str in targets:
+        ports = expand_port_range(p_str)
+        if ports:
+            queue.add(port_major(parse_ip_range(host), ports))
+    return iter(queue)
+
+def iter_randomized_targets(targets: Iterable[Tuple[Union[str, Sequence], str]], seed: int) -> Iterator[Tuple[str, int]]:
+    """
+    Yields every check iter_expanded_targets would, in a pseudo-random order
+    over the combined host x port index space of all lines (see
+    FeistelPermutation). Ranges are indexed, never expanded, so memory does
+    not grow with their size; the order depends only on the input and seed.
+    """
+    lanes: List[Tuple[Sequence[str], List[int]]] = []
+    offsets: List[int] = []
+    total = 0
+    for host, p_str in targets:
+        ports = expand_port_range(p_str)
+        hosts = parse_ip_range(host)
+        size = ip_range_size(hosts) * len(ports)
+        if size:
+            lanes.append((hosts, ports))
+            offsets.append(total)
+            total += size
+    for index in FeistelPermutation(total, seed):
+        lane = bisect_right(offsets, index) - 1
+        hosts, ports = lanes[lane]
+        host_index, port_index = divmod(index - offsets[lane], len(ports))
+        yield (hosts[host_index], ports[port_index])
+
+def count_expanded_targets(targets: Iterable[Tuple[Union[str, Sequence], str]]) -> int:
+    """Counts the checks iter_expanded_targets will produce without expanding any range."""
+    return sum(ip_range_size(parse_ip_range(host)) * len(expand_port_range(p_str)) for host, p_str in targets)
+
+def collect_hostnames(targets: Iterable[Tuple[Union[str, Sequence], str]]) -> List[str]:
+    """Unique hostnames of a parsed batch in first-seen order (IP literals and ranges need no DNS)."""
+    hostnames: Dict[str, None] = {}
+    for host, p_str in targets:
+        hosts = parse_ip_range(host)
+        if not isinstance(hosts, list) or not expand_port_range(p_str):
+            continue
+        for h in hosts:
+            try:
+                ipaddress.ip_address(h)
+            except ValueError:
+                hostnames.setdefault(h, None)
+    return list(hostnames)
+
+def pre_resolve_hosts(hosts: Iterable[str], timeout: float, resolve_jobs: int, retries: int, retry_delay: float, deadline: Optional[float] = None) -> Tuple[Dict[str, List[str]], Dict[str, Dict[str, Any]]]:
+    """
+    Resolves every hostname of a batch up front, `resolve_jobs` at a time on a
+    pool of its own, so the connect phase finds them all in dns_cache and its
+    workers are spent only on connects. Returns (host -> resolved IPs,
+    host -> failed dns_lookup result); checks of unresolved hosts are
+    reported without connecting.
+    """
+    resolved: Dict[str, List[str]] = {}
+    unresolved: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, resolve_jobs)) as executor:
+        def submit(host):
+            return executor.submit(run_check_with_retry, dns_lookup, (host, min(timeout, 3.0)), retries=retries, delay=retry_delay, budget=deadline)
+
+        for host, fut in BoundedScheduler(submit, resolve_jobs * 2).run(hosts):
+            try:
+                res = fut.result()
+            except Exception as e:
+                unresolved[host] = {"success": False, "error": str(e), "metadata": {}}
+                continue
+            if not res["success"] or not res["metadata"].get("ips"):
+                unresolved[host] = res
+            else:
+                resolved[host] = res["metadata"]["ips"]
+    return resolved, unresolved
+
+def run_batch_targets(targets: List[Tuple[Union[str, Sequence], str]], options: ScanOptions, fmt: str, combined: bool, verbose: bool = False, stream: bool = False, resolve_jobs: int = 50, dedupe_endpoints: bool = False, dedupe_fp_rate: Optional[float] = None, interleave: bool = False, shuffle_seed: Optional[int] = None, journal_file: Optional[str] = None, resume: bool = False):
+    total = count_expanded_targets(targets)
+    if not total:
         print("Error: No targets found to test", file=sys.stderr)
         sys.exit(1)
+
+    # A resumed scan must number its targets exactly as before, so the journal's order and dedupe settings win
+    journal = None
+    if journal_file:
+        fingerprint = targets_fingerprint(targets)
+        try:
+            if resume:
+                journal = ScanJournal.resume(journal_file, fingerprint)
+                interleave = journal.options.get("interleave", False)
+                shuffle_seed = journal.options.get("seed")
+                dedupe_fp_rate = journal.options.get("dedupe_fp_rate")
+                print(f"Resuming {journal_file}: {journal.completed}/{total} checks already done", file=sys.stderr)
+            else:
+                journal = ScanJournal.create(journal_file, fingerprint, total, {"interleave": interleave, "seed": shuffle_seed, "dedupe_fp_rate": dedupe_fp_rate})
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot use journal {journal_file}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    # Resolve every hostname before the first connect, on its own pool
+    resolved: Dict[str, List[str]] = {}
+    unresolved: Dict[str, Dict[str, Any]] = {}
+    hostnames = collect_hostnames(targets) if resolve_jobs > 0 else []
+    if hostnames:
+        resolved, unresolved = pre_resolve_hosts(hostnames, options.timeout, resolve_jobs, options.retries, options.retry_delay, options.deadline)
+        if verbose:
+            sys.stderr.write(f"Resolved {len(hostnames) - len(unresolved)}/{len(hostnames)} hostnames before connecting\n")
+    endpoints = resolved if dedupe_endpoints else None
+    if options.throttle is not None:
+        # Hostnames share --subnet-rate with the subnet of their first address
+        options.throttle.addresses.update(resolved)
+
+    # Drop repeated host:port targets before they reach a worker
+    if shuffle_seed is not None:
+        checks = iter_randomized_targets(targets, shuffle_seed)
+    elif interleave:
+        checks = iter_interleaved_targets(targets)
+    else:
+        checks = iter_expanded_targets(targets)
+    seen = None
+    if dedupe_fp_rate is not None:
+        seen = DuplicateFilter(dedupe_fp_rate)
+        checks = dedupe_targets(checks, seen)
+    remaining = total
+    if journal is not None:
+        checks = journal.track(checks)
+        remaining = total - journal.completed
         
-    results = execute_concurrent_checks(expanded_targets, timeout, max_jobs, retries, retry_delay, verbose=verbose)
-    
     date_str = datetime.now().strftime("%Y-%m-%d")
     ext = "json" if fmt == "json" else "csv" if fmt == "csv" else "xml" if fmt == "xml" else "txt"
     
-    success_results = [r for r in results if r["success"]]
-    fail_results = [r for r in results if not r["success"]]
-    
     res_filename = f"result-{date_str}.{ext}"
     fail_filename = f"fail-{date_str}.{ext}"
     comb_filename = f"combined-{date_str}.{ext}"
     
+    if stream:
+        # Results go to the console and the dated files as they complete; nothing is kept in memory.
+        try:
+            file_sinks = BatchFileSinks(fmt, res_filename, fail_filename, comb_filename if combined else None)
+            console = open_stream_writer(fmt, sys.stdout, "all")
+            failures = 0
+            if journal is not None:
+                # The output files cover the whole scan, including what earlier runs checked
+                for res in journal.previous_results():
+                    file_sinks.write(res)
+                    failures += not res.get("success", False)
+            _, new_failures = stream_concurrent_checks(checks, remaining, [console, file_sinks], options, verbose=verbose, unresolved=unresolved, endpoints=endpoints, journal=journal)
+            failures += new_failures
+        except OSError as e:
+            print(f"Error saving batch output files: {e}", file=sys.stderr)
+            sys.exit(1)
+        except KeyboardInterrupt:
+            interrupted(journal)
+        finally:
+            if journal is not None:
+                journal.close()
+            
+        report_duplicates(seen)
+        report_concurrency(options.concurrency)
+        print("Check Complete! Results written to output files.", file=sys.stderr)
+        print(f"Successful checks written to: {res_filename} ({file_sinks.success_count} items)", file=sys.stderr)
+        print(f"Failed checks written to: {fail_filename} ({file_sinks.fail_count} items)", file=sys.stderr)
+        if combined:
+            print(f"Combined report written to: {comb_filename}", file=sys.stderr)
+        sys.exit(0 if failures == 0 else 1)
+        
+    try:
+        results = list(journal.previous_results()) if journal is not None else []
+        results += execute_concurrent_checks(checks, options, verbose=verbose, total=remaining, unresolved=unresolved, endpoints=endpoints, journal=journal, seen=seen)
+    except KeyboardInterrupt:
+        interrupted(journal)
+    finally:
+        if journal is not None:
+            journal.close()
+    
+    report_duplicates(seen)
+    report_concurrency(options.concurrency)
+    success_results = [r for r in results if r["success"]]
+    fail_results = [r for r in results if not r["success"]]
+    
     try:
         if success_results:
             with open(res_filename, "w") as f:
@@ -430,7 +895,7 @@ def run_batch_targets(targets: List[Tuple[str, str]], timeout: float, max_jobs:
             with open(comb_filename, "w") as f:
                 f.write(format_output(results, fmt, verbose=verbose, use_color=False))
                 
-        print(f"Check Complete! Results written to output files.")
+        print("Check Complete! Results written to output files.")
         print(f"Successful checks written to: {res_filename} ({len(success_results)} items)")
         print(f"Failed checks written to: {fail_filename} ({len(fail_results)} items)")
         if combined:
@@ -442,34 +907,150 @@ def run_batch_targets(targets: List[Tuple[str, str]], timeout: float, max_jobs:
     print(format_output(results, fmt, verbose=verbose))
     sys.exit(0 if len(fail_results) == 0 else 1)
 
-def run_batch_lines(lines: List[str], timeout: float, max_jobs: int, format_name: str, combined: bool, retries: int, retry_delay: float, verbose: bool = False):
+def interrupted(journal: Optional[ScanJournal]) -> None:
+    """Ctrl-C during a batch scan: tells how to pick it up again (with a journal) and exits."""
+    if journal is not None:
+        print(f"\nInterrupted: {journal.completed}/{journal.total} checks saved; continue with --resume {journal.path}", file=sys.stderr)
+    else:
+        print("\nInterrupted.", file=sys.stderr)
+    sys.exit(130)
+
+def report_concurrency(concurrency: Optional[AIMDController]) -> None:
+    """Prints how --auto-jobs moved the in-flight limit over the run."""
+    if concurrency is not None:
+        print(concurrency.summary(), file=sys.stderr)
+
+def report_duplicates(seen: Optional[DuplicateFilter]) -> None:
+    """Tells how many repeated targets --dedupe dropped."""
+    if seen is not None and seen.duplicates:
+        how = "exact" if seen.exact else f"Bloom filter, <= {seen.fp_rate:g} false-positive rate"
+        print(f"Skipped {seen.duplicates} duplicate targets ({how})", file=sys.stderr)
+
+def run_batch_lines(lines: List[str], options: ScanOptions, format_name: str, combined: bool, **kwargs: Any):
+    """run_batch_targets for raw input lines; `kwargs` are passed on to it."""
     content = "\n".join(lines)
     targets = parse_batch_content(content)
-    run_batch_targets(targets, timeout, max_jobs, format_name, combined, retries, retry_delay, verbose=verbose)
+    run_batch_targets(targets, options, format_name, combined, **kwargs)
 
-def execute_concurrent_checks(targets: List[Tuple[str, int]], timeout: float, max_jobs: int, retries: int, retry_delay: float, verbose: bool = False) -> List[Dict[str, Any]]:
-    results = []
-    
-    with ThreadPoolExecutor(max_workers=max_jobs) as executor:
-        futures = {}
-        for host, port in targets:
-            fut = executor.submit(
-                run_check_with_retry,
-                check_tcp_connect,
-                args=(host, int(port), timeout),
-                retries=retries,
-                delay=retry_delay
-            )
-            futures[fut] = (host, port)
-            
-        completed = 0
-        total = len(targets)
+def endpoint_key(host: str, port: Any, endpoints: Dict[str, List[str]]) -> Optional[Tuple[Tuple[str, ...], int]]:
+    """
+    (resolved IPs, port) a target actually connects to, or None if unknown.
+    IP literals are their own endpoint; hostnames use their pre-resolved IPs.
+    Targets sharing a key make the exact same connection attempts.
+    """
+    ips = endpoints.get(host)
+    if ips is None:
+        try:
+            ips = [str(ipaddress.ip_address(host))]
+        except ValueError:
+            return None
+    return tuple(sorted(ips)), int(port)
+
+def fan_out_result(res: Dict[str, Any], host: str, port: Any) -> Dict[str, Any]:
+    """Copies a check result to another target that shares its endpoint, noting where it came from."""
+    copy = dict(res, target=f"{host}:{port}")
+    copy["metadata"] = dict(res.get("metadata", {}), host=host, port=port, deduplicated_from=res["target"])
+    return copy
+
+def host_down_result(host: str, port: Any, breaker: HostCircuitBreaker) -> Dict[str, Any]:
+    """Result for a check the circuit breaker skipped because its host stopped answering."""
+    res = new_tcp_result(host, port)
+    res["status"] = SKIPPED_HOST_DOWN
+    res["error"] = f"Skipped: host down after {breaker.threshold} consecutive timeouts"
+    return res
+
+def iter_concurrent_checks(targets: Iterable[Tuple[str, int]], options: ScanOptions, window: Optional[int] = None, unresolved: Optional[Dict[str, Dict[str, Any]]] = None, endpoints: Optional[Dict[str, List[str]]] = None) -> Iterator[Tuple[Tuple[str, int], Dict[str, Any]]]:
+    """
+    Runs TCP checks through a bounded in-flight window and yields ((host, port), result)
+    in completion order. Targets are pulled from the iterable only as slots free up.
+    `options` (see ScanOptions) sets the timeouts, jobs, retries and limiters.
+    Each submission is a single attempt: a failed target waits out its retry
+    delay (`retry_delay * retry_backoff ** (n - 1)`, +/- `retry_jitter`) on the
+    scheduler's delay queue rather than in a worker, so fresh targets use the
+    slot meanwhile. Only error classes `retry_policy` retries are tried again.
+    `deadline` is the per-target budget (seconds) shared by all of its retries.
+    Targets whose host is in `unresolved` (host -> DNS result, see pre_resolve_hosts)
+    fail straight away without taking a connect slot.
+    With `endpoints` (host -> resolved IPs), targets that reach the same
+    (IPs, port) endpoint are connected once; the others get a copy of that
+    result with `metadata.deduplicated_from` naming the target that was checked.
+    With a `breaker`, checks of a host it considers down are not run but
+    reported as SKIPPED_HOST_DOWN, and its pending retries are dropped.
+    With a `concurrency` controller, the number of checks in flight follows
+    its limit, which every completed attempt feeds, instead of `max_jobs`.
+    A `throttle` paces connect starts (and retries) to its global, per-host
+    and per-subnet limits from the scheduler, without holding worker threads.
+    """
+    timeout, max_jobs, retries, deadline = options.timeout, options.jobs, options.retries, options.deadline
+    breaker, concurrency, throttle = options.breaker, options.concurrency, options.throttle
+    # The async engine multiplexes --jobs non-blocking connects on one event loop
+    # instead of parking one OS thread per connect.
+    # With --auto-jobs the executor is sized for the ceiling and the window is the live limit
+    workers = concurrency.ceiling if concurrency is not None else max_jobs
+    if options.engine == "async":
+        executor = AsyncCheckExecutor(max_in_flight=workers)
+        runner, check_fn = async_run_check_with_retry, async_check_tcp_connect
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        runner, check_fn = run_check_with_retry, check_tcp_connect
+
+    def settled(res: Dict[str, Any]) -> Future:
+        fut: Future = Future()
+        fut.set_result(res)
+        return fut
+
+    # A job is ((host, port), attempt number, Deadline or None, previous attempt's result)
+    def submit(job):
+        (host, port), attempt, budget, previous = job
+        if breaker is not None:
+            if previous is not None and breaker.is_open(host):
+                # The host went down while this retry waited; its last failure stands
+                return settled(previous)
+            if previous is None and not breaker.allow(host):
+                return settled(host_down_result(host, port, breaker))
+        return executor.submit(runner, check_fn, args=(host, int(port), timeout),
+                               budget=budget.remaining() if budget is not None else None)
         
-        for fut in as_completed(futures):
-            host, port = futures[fut]
+    # Results settled without a connect of their own, yielded between completions
+    ready: "deque[Tuple[Tuple[str, int], Dict[str, Any]]]" = deque()
+    checked: Dict[Tuple[Tuple[str, ...], int], Dict[str, Any]] = {}
+    waiting: Dict[Tuple[Tuple[str, ...], int], List[Tuple[str, int]]] = {}
+
+    def connectable():
+        for target in targets:
+            host, port = target
+            if unresolved and host in unresolved:
+                res = mark_tcp_dns_failure(new_tcp_result(host, port), unresolved[host])
+                ready.append((target, res))
+                continue
+            key = endpoint_key(host, port, endpoints) if endpoints is not None else None
+            if key is not None:
+                if key in checked:
+                    ready.append((target, fan_out_result(checked[key], host, port)))
+                    continue
+                if key in waiting:
+                    waiting[key].append(target)
+                    continue
+                waiting[key] = []
+            yield target, 1, Deadline(deadline) if deadline is not None else None, None
+
+    def drain_ready():
+        while ready:
+            yield ready.popleft()
+
+    # Keep a couple of checks queued per worker so no slot idles between completions
+    gate = release = None
+    if throttle is not None:
+        gate = lambda job: throttle.admit(job[0][0])
+        release = lambda job: throttle.release(job[0][0])
+    scheduler = BoundedScheduler(submit, concurrency.limit if concurrency is not None else window or max_jobs * 2,
+                                 gate=gate, release=release)
+    
+    with executor:
+        for ((host, port), attempt, budget, previous), fut in scheduler.run(connectable()):
+            yield from drain_ready()
             try:
                 res = fut.result()
-                results.append(res)
             except Exception as e:
                 res = {
                     "target": f"{host}:{port}",
@@ -479,28 +1060,81 @@ def execute_concurrent_checks(targets: List[Tuple[str, int]], timeout: float, ma
                     "error": str(e),
                     "metadata": {"host": host, "port": port}
                 }
-                results.append(res)
-                
-            completed += 1
-            
-            # Print real-time connection status if verbose is enabled
-            if verbose:
-                use_color = sys.stdout.isatty()
-                c_ansi = get_colors(use_color)
-                if res.get("success", False):
-                    sys.stderr.write(f"{c_ansi['green']}✓ SUCCESS:{c_ansi['reset']} {host}:{port} ({res.get('latency_ms', '?')}ms)\n")
-                else:
-                    sys.stderr.write(f"{c_ansi['red']}✗ FAILED:{c_ansi['reset']} {host}:{port} ({res.get('error', 'unknown error')})\n")
-                sys.stderr.flush()
-            elif total > 5 and sys.stdout.isatty():
-                sys.stdout.write(f"\rProgress: {completed}/{total} completed ({int(completed/total * 100)}%)...")
-                sys.stdout.flush()
-                
-        if total > 5 and sys.stdout.isatty() and not verbose:
-            print("")
-            
+            if res is not previous and res.get("status") != SKIPPED_HOST_DOWN:
+                if breaker is not None:
+                    breaker.record(host, res)
+                if concurrency is not None:
+                    scheduler.window = concurrency.record(res)
+                if not res.get("success", False) and attempt < retries and options.retry_policy.should_retry(res, attempt):
+                    wait = backoff_delay(attempt, options.retry_delay, options.retry_backoff, options.retry_jitter)
+                    if (budget is None or budget.remaining() > wait) and not (breaker is not None and breaker.is_open(host)):
+                        scheduler.retry_later(((host, port), attempt + 1, budget, res), wait)
+                        continue
+            yield (host, port), res
+            key = endpoint_key(host, port, endpoints) if endpoints is not None else None
+            if key is not None:
+                checked[key] = res
+                for other_host, other_port in waiting.pop(key):
+                    yield (other_host, other_port), fan_out_result(res, other_host, other_port)
+        yield from drain_ready()
+
+def report_progress(host: str, port: Any, res: Dict[str, Any], completed: int, total: Optional[int], verbose: bool, show_progress: bool = True) -> None:
+    """Prints the real-time per-check line (verbose) or the progress counter."""
+    if verbose:
+        use_color = sys.stdout.isatty()
+        c_ansi = get_colors(use_color)
+        if res.get("success", False):
+            sys.stderr.write(f"{c_ansi['green']}✓ SUCCESS:{c_ansi['reset']} {host}:{port} ({res.get('latency_ms', '?')}ms)\n")
+        else:
+            sys.stderr.write(f"{c_ansi['red']}✗ FAILED:{c_ansi['reset']} {host}:{port} ({res.get('error', 'unknown error')})\n")
+        sys.stderr.flush()
+    elif show_progress and total and total > 5 and sys.stdout.isatty():
+        sys.stdout.write(f"\rProgress: {completed}/{total} completed ({int(completed/total * 100)}%)...")
+        sys.stdout.flush()
+
+def execute_concurrent_checks(targets: Iterable[Tuple[str, int]], options: ScanOptions, verbose: bool = False, total: Optional[int] = None, unresolved: Optional[Dict[str, Dict[str, Any]]] = None, endpoints: Optional[Dict[str, List[str]]] = None, journal: Optional[ScanJournal] = None, seen: Optional[DuplicateFilter] = None) -> List[Dict[str, Any]]:
+    results = []
+    if total is None:
+        total = len(targets) if hasattr(targets, "__len__") else 0
+        
+    completed = 0
+    for (host, port), res in iter_concurrent_checks(targets, options, unresolved=unresolved, endpoints=endpoints):
+        if journal is not None:
+            journal.record((host, port), res)
+        results.append(res)
+        completed += 1
+        # Targets --dedupe dropped never produce a result; take them off the total as they are found
+        report_progress(host, port, res, completed, total - seen.duplicates if seen is not None else total, verbose)
+        
+    if total > 5 and sys.stdout.isatty() and not verbose:
+        print("")
+        
     return results
 
+def stream_concurrent_checks(targets: Iterable[Tuple[str, int]], total: int, sinks: List[Any], options: ScanOptions, verbose: bool = False, unresolved: Optional[Dict[str, Dict[str, Any]]] = None, endpoints: Optional[Dict[str, List[str]]] = None, journal: Optional[ScanJournal] = None) -> Tuple[int, int]:
+    """
+    Streaming counterpart of execute_concurrent_checks: every result is handed to
+    each sink (write/close) as soon as it completes and then dropped.
+    Returns (successes, failures).
+    """
+    successes = failures = 0
+    try:
+        for (host, port), res in iter_concurrent_checks(targets, options, unresolved=unresolved, endpoints=endpoints):
+            if journal is not None:
+                journal.record((host, port), res)
+            if res.get("success", False):
+                successes += 1
+            else:
+                failures += 1
+            for sink in sinks:
+                sink.write(res)
+            # Rows already show progress on stdout; only the verbose stderr feed applies
+            report_progress(host, port, res, successes + failures, total, verbose, show_progress=False)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return successes, failures
+
 def format_output(results: List[Dict[str, Any]], format_name: str, verbose: bool = False, use_color: Optional[bool] = None) -> str:
     if format_name == "json":
         return format_json(results)
@@ -7,8 +7,19 @@ from netcheck.modules.http import check_http_status
 from netcheck.modules.ssl import check_ssl_certificate
 from netcheck.modules.ping import ping_host
 from netcheck.modules.interfaces import get_network_interfaces, get_public_ip
-from netcheck.utils.range_expanders import expand_ip_range, expand_port_range
-from netcheck.cli import run_check_with_retry
+from netcheck.utils.range_expanders import parse_ip_range, expand_port_range
+from netcheck.utils.profiles import TIMING_PROFILES, get_timing_profile
+from netcheck.utils.throttle import ScanThrottle
+from netcheck.utils.scan_options import ScanOptions
+from netcheck.cli import run_check_with_retry, iter_concurrent_checks
+
+_TIMING_PROPERTY = {
+    "type": "string",
+    "enum": list(TIMING_PROFILES),
+    "description": "Timing profile (paranoid, polite, normal, aggressive, insane) supplying the timeout"
+                   " and, for TCP checks, parallelism, retries, connect rate and per-host limits."
+                   " Explicit arguments take precedence."
+}
 
 TOOLS_LIST = [
     {
@@ -34,7 +45,8 @@ TOOLS_LIST = [
                     "type": "integer",
                     "description": "Number of check attempts (default: 1).",
                     "default": 1
-                }
+                },
+                "timing": _TIMING_PROPERTY
             },
             "required": ["host", "port"]
         }
@@ -53,7 +65,8 @@ TOOLS_LIST = [
                     "type": "number",
                     "description": "Timeout in seconds (default: 5.0).",
                     "default": 5.0
-                }
+                },
+                "timing": _TIMING_PROPERTY
             },
             "required": ["url"]
         }
@@ -77,7 +90,8 @@ TOOLS_LIST = [
                     "type": "number",
                     "description": "Timeout in seconds (default: 5.0).",
                     "default": 5.0
-                }
+                },
+                "timing": _TIMING_PROPERTY
             },
             "required": ["host"]
         }
@@ -96,7 +110,8 @@ TOOLS_LIST = [
                     "type": "number",
                     "description": "Timeout in seconds (default: 5.0).",
                     "default": 5.0
-                }
+                },
+                "timing": _TIMING_PROPERTY
             },
             "required": ["host"]
         }
@@ -158,38 +173,47 @@ def call_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         if name == "check_tcp_connectivity":
             host = arguments.get("host")
             port_str = str(arguments.get("port"))
-            timeout = float(arguments.get("timeout", 5.0))
-            retries = int(arguments.get("retries", 1))
+            timing = _timing(arguments)
+            timeout = float(arguments.get("timeout", timing["timeout"]))
+            retries = int(arguments.get("retries", timing["retry"]))
             
-            # Expand hosts/ports
-            hosts = expand_ip_range(host)
+            # Hosts stay a lazy IPRange; addresses are produced one at a time as they are checked
+            hosts = parse_ip_range(host)
             ports = expand_port_range(port_str)
             
-            results = []
-            for h in hosts:
-                for p in ports:
-                    res = run_check_with_retry(check_tcp_connect, args=(h, p, timeout), retries=retries)
-                    results.append(res)
-                    
-            return _mcp_success_response(results)
+            if "timing" not in arguments:
+                results = []
+                for h in hosts:
+                    for p in ports:
+                        res = run_check_with_retry(check_tcp_connect, args=(h, p, timeout), retries=retries)
+                        results.append(res)
+                return _mcp_success_response(results)
+
+            # A profile runs the checks like the CLI does (parallel, paced), reported in input order
+            throttle = None
+            if timing["max_rate"] or timing["host_concurrency"]:
+                throttle = ScanThrottle(timing["max_rate"], timing["host_concurrency"])
+            options = ScanOptions(timeout, timing["jobs"], retries, timing["retry_delay"], throttle=throttle)
+            done = dict(iter_concurrent_checks(((h, p) for h in hosts for p in ports), options))
+            return _mcp_success_response([done[(h, p)] for h in hosts for p in ports])
             
         elif name == "check_http_status":
             url = arguments.get("url")
-            timeout = float(arguments.get("timeout", 5.0))
+            timeout = float(arguments.get("timeout", _timing(arguments)["timeout"]))
             res = check_http_status(url, timeout)
             return _mcp_success_response(res)
             
         elif name == "check_ssl_certificate":
             host = arguments.get("host")
             port = int(arguments.get("port", 443))
-            timeout = float(arguments.get("timeout", 5.0))
+            timeout = float(arguments.get("timeout", _timing(arguments)["timeout"]))
             res = check_ssl_certificate(host, port, timeout)
             return _mcp_success_response(res)
             
         elif name == "dns_lookup":
             host = arguments.get("host")
-            timeout = float(arguments.get("timeout", 5.0))
-            res = dns_lookup(host, timeout)
+            timeout = float(arguments.get("timeout", _timing(arguments)["timeout"]))
+            res = dns_lookup(host, timeout, reverse=True)
             return _mcp_success_response(res)
             
         elif name == "ping_host":
@@ -214,6 +238,10 @@ def call_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         return _mcp_error_response(f"Internal error executing tool {name}: {str(e)}")
 
+def _timing(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Settings of the requested timing profile ("normal", the defaults, when none is given)."""
+    return get_timing_profile(arguments.get("timing") or "normal")
+
 def _mcp_success_response(data: Any) -> Dict[str, Any]:
     return {
         "content": [
@@ -0,0 +1,247 @@
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import Executor, Future, wait as wait_futures
+from typing import Dict, Any, Callable, Optional, List, Set, Tuple
+
+from netcheck.modules.dns import dns_lookup
+from netcheck.modules.tcp import new_tcp_result, mark_tcp_success, mark_tcp_failure, mark_tcp_deadline_exceeded, mark_tcp_dns_failure
+from netcheck.utils.happy_eyeballs import interleave_families, describe_connect_error, HAPPY_EYEBALLS_DELAY
+from netcheck.utils.deadline import Deadline, accepts_deadline
+from netcheck.utils.retry import backoff_delay
+
+def literal_ips(host: str) -> Optional[List[str]]:
+    """Returns [host] if host is an IPv4/IPv6 literal, else None (DNS is required)."""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return [host]
+        except OSError:
+            pass
+    return None
+
+def raise_nofile_limit(wanted: int) -> None:
+    """Raises the soft open-file limit towards `wanted` so large in-flight windows don't hit EMFILE."""
+    try:
+        import resource
+    except ImportError:
+        # Windows has no RLIMIT_NOFILE; the proactor loop is not bound by it
+        return
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard != resource.RLIM_INFINITY:
+            wanted = min(wanted, hard)
+        if soft != resource.RLIM_INFINITY and soft < wanted:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+    except (ValueError, OSError):
+        pass
+
+async def async_check_tcp_connect(host: str, port: int, timeout: float = 5.0, happy_eyeballs: bool = True,
+                                  deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """
+    Event-loop counterpart of check_tcp_connect built on non-blocking sockets,
+    including the Happy Eyeballs race across resolved IPs.
+    Returns the exact same result structure so the formatters need no changes.
+    """
+    result = new_tcp_result(host, port)
+    loop = asyncio.get_running_loop()
+    deadline = Deadline(timeout, parent=deadline)
+
+    ips = literal_ips(host)
+    if ips is None:
+        # Hostnames go through the shared cached resolver on the loop's default executor
+        dns_res = await loop.run_in_executor(None, dns_lookup, host, min(timeout, 3.0), deadline)
+        ips = dns_res["metadata"]["ips"] if dns_res["success"] else []
+        if not ips:
+            return mark_tcp_dns_failure(result, dns_res)
+
+    result["metadata"]["resolved"] = True
+    if deadline.expired():
+        return mark_tcp_deadline_exceeded(result, ips, deadline)
+
+    start_time = time.perf_counter()
+    sock, ip, errors = await async_connect_first(ips, port, timeout, HAPPY_EYEBALLS_DELAY if happy_eyeballs else None, deadline)
+    if sock is not None:
+        sock.close()
+        return mark_tcp_success(result, ip, start_time)
+
+    return mark_tcp_failure(result, ips, errors, start_time)
+
+async def _async_connect(ip: str, port: int) -> socket.socket:
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET6 if ":" in ip else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        await loop.sock_connect(sock, (ip, port))
+    except BaseException:
+        # Includes cancellation by a faster Happy Eyeballs attempt
+        sock.close()
+        raise
+    return sock
+
+async def async_connect_first(ips: List[str], port: int, timeout: float, attempt_delay: Optional[float] = HAPPY_EYEBALLS_DELAY,
+                              deadline: Optional[Deadline] = None) -> Tuple[Optional[socket.socket], Optional[str], List[str]]:
+    """Event-loop version of connect_first (sequential or RFC 8305 racing)."""
+    errors: List[str] = []
+
+    if attempt_delay is None or len(ips) < 2:
+        for ip in ips:
+            attempt_timeout = timeout if deadline is None else deadline.remaining(timeout)
+            if attempt_timeout <= 0:
+                errors.append(f"{ip} (deadline exceeded)")
+                continue
+            try:
+                sock = await asyncio.wait_for(_async_connect(ip, port), attempt_timeout)
+                return sock, ip, errors
+            except asyncio.TimeoutError:
+                errors.append(f"{ip} (timed out)")
+            except Exception as e:
+                errors.append(describe_connect_error(ip, e))
+        return None, None, errors
+
+    if deadline is not None:
+        timeout = deadline.remaining(timeout)
+    loop = asyncio.get_running_loop()
+    ordered = interleave_families(ips)
+    race_end = loop.time() + timeout
+    pending: Dict[asyncio.Task, str] = {}
+    next_index = 0
+    winner = None
+
+    try:
+        while winner is None and (next_index < len(ordered) or pending):
+            if next_index < len(ordered):
+                ip = ordered[next_index]
+                next_index += 1
+                pending[loop.create_task(_async_connect(ip, port))] = ip
+
+            remaining = race_end - loop.time()
+            if remaining <= 0:
+                break
+            # Wait for a result, or for the stagger delay before starting the next attempt
+            wait_for = min(attempt_delay, remaining) if next_index < len(ordered) else remaining
+            done, _ = await asyncio.wait(set(pending), timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                ip = pending.pop(task)
+                if task.exception() is None:
+                    if winner is None:
+                        winner = (task.result(), ip)
+                    else:
+                        task.result().close()
+                else:
+                    errors.append(describe_connect_error(ip, task.exception()))
+            if not done and next_index >= len(ordered):
+                # Overall timeout with nothing left to start
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if winner is None:
+            errors.extend(f"{ip} (timed out)" for ip in pending.values())
+
+    if winner is None:
+        return None, None, errors
+    return winner[0], winner[1], errors
+
+async def async_run_check_with_retry(check_fn, args=(), kwargs=None, retries=1, delay=1.0, budget: Optional[float] = None, backoff: float = 1.0, jitter: float = 0.0, on_attempt: Optional[Callable[[Dict[str, Any]], None]] = None, abort: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """Coroutine version of run_check_with_retry; waits between attempts without holding a thread."""
+    if kwargs is None:
+        kwargs = {}
+    deadline = Deadline(budget) if budget is not None else None
+    if deadline is not None and accepts_deadline(check_fn):
+        kwargs = dict(kwargs, deadline=deadline)
+
+    attempt = 1
+    result = None
+    while attempt <= retries:
+        try:
+            result = await check_fn(*args, **kwargs)
+        except Exception as e:
+            result = {
+                "target": str(args[0]) if args else "unknown",
+                "status": "FAILED",
+                "latency_ms": 0.0,
+                "success": False,
+                "error": str(e),
+                "metadata": {}
+            }
+        if on_attempt is not None:
+            on_attempt(result)
+        if result.get("success", False):
+            return result
+
+        if attempt < retries:
+            wait = backoff_delay(attempt, delay, backoff, jitter)
+            if deadline is not None and deadline.remaining() <= wait:
+                # Not enough budget left to wait and try again
+                break
+            if abort is not None and abort():
+                break
+            await asyncio.sleep(wait)
+        attempt += 1
+
+    return result or {"success": False, "status": "FAILED", "target": "unknown", "error": "No attempts made"}
+
+class AsyncCheckExecutor(Executor):
+    """
+    Executor that runs coroutine functions on a private event loop thread.
+    At most `max_in_flight` coroutines run at once; submit() returns ordinary
+    concurrent.futures.Future objects so callers can treat it like ThreadPoolExecutor.
+    """
+    def __init__(self, max_in_flight: int = 1000):
+        raise_nofile_limit(max_in_flight + 256)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="async_engine", daemon=True)
+        self._thread.start()
+        self._semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(max_in_flight), self._loop).result()
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @staticmethod
+    async def _make_semaphore(limit: int) -> asyncio.Semaphore:
+        # Created inside the loop so it binds to the right loop on Python < 3.10
+        return asyncio.Semaphore(max(1, limit))
+
+    async def _guarded(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        async with self._semaphore:
+            return await fn(*args, **kwargs)
+
+    def _forget(self, fut: Future) -> None:
+        with self._lock:
+            self._pending.discard(fut)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            fut = asyncio.run_coroutine_threadsafe(self._guarded(fn, args, kwargs), self._loop)
+            self._pending.add(fut)
+        fut.add_done_callback(self._forget)
+        return fut
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            pending = list(self._pending)
+        if cancel_futures:
+            for fut in pending:
+                fut.cancel()
+        if not wait:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            return
+        wait_futures(pending)
+        if hasattr(self._loop, "shutdown_default_executor"):
+            asyncio.run_coroutine_threadsafe(self._loop.shutdown_default_executor(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
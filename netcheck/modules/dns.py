@@ -1,15 +1,108 @@
 import socket
 import time
-from typing import Dict, Any, List
-from netcheck.utils.cache import dns_cache
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional, Tuple
+from netcheck.utils.cache import dns_cache, rdns_cache
+from netcheck.utils.deadline import Deadline, DeadlineExceeded
 from netcheck.utils.normalize import normalize_host
-from netcheck.utils.timeout import run_with_timeout
+from netcheck.utils.error_classes import classify_dns_exception
+from netcheck.utils.timeout import run_with_timeout, TimeoutPool, PoolSaturatedError
+from netcheck.modules.resolver import StubResolver
+from netcheck.resolverd.client import get_resolverd_client
 
-def dns_lookup(raw_target: str, timeout: float = 5.0) -> Dict[str, Any]:
+RESOLVERS = ("system", "builtin")
+_resolver_mode = "system"
+_builtin_resolver: Optional[StubResolver] = None
+
+def set_resolver(mode: str, resolver: Optional[StubResolver] = None) -> None:
+    """
+    Selects how dns_lookup resolves names: 'system' (getaddrinfo) or 'builtin'
+    (the pure-Python StubResolver, configured from /etc/resolv.conf and
+    /etc/hosts unless a `resolver` instance is given).
+    """
+    global _resolver_mode, _builtin_resolver
+    if mode not in RESOLVERS:
+        raise ValueError(f"Unknown resolver: {mode}")
+    _resolver_mode = mode
+    if resolver is not None:
+        _builtin_resolver = resolver
+
+def get_builtin_resolver() -> StubResolver:
+    global _builtin_resolver
+    if _builtin_resolver is None:
+        _builtin_resolver = StubResolver.from_system()
+    return _builtin_resolver
+
+# getaddrinfo codes meaning the name (or any address for it) does not exist
+_NXDOMAIN_ERRORS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+# Resolver-side failures that may clear up soon (SERVFAIL, unreachable servers)
+_SERVFAIL_ERRORS = {socket.EAI_AGAIN, getattr(socket, "EAI_FAIL", socket.EAI_AGAIN)}
+
+def negative_cache_kind(error: BaseException) -> Optional[str]:
+    """
+    Classifies a failed resolution for the negative cache: 'nxdomain',
+    'servfail' (including resolver timeouts) or None (don't cache). Running out
+    of the caller's own budget says nothing about the name and is never cached.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return None
+    if isinstance(error, socket.gaierror):
+        if error.errno in _NXDOMAIN_ERRORS:
+            return "nxdomain"
+        if error.errno in _SERVFAIL_ERRORS:
+            return "servfail"
+        return None
+    if isinstance(error, (TimeoutError, FutureTimeoutError)):
+        return "servfail"
+    return None
+
+# PTR lookups get their own small pool so they never starve forward resolution
+_rdns_pool = TimeoutPool(max_workers=8, max_queue=256, name="rdns_runner", label="reverse resolver")
+
+def reverse_lookup(ip: str, timeout: float = 2.0) -> Optional[Tuple[str, List[str]]]:
+    """
+    Returns (PTR name, aliases) for an IP, or None if it has no usable PTR record.
+    Answers (including missing records) are kept in rdns_cache, and concurrent
+    lookups of the same IP share one query on the dedicated PTR pool.
+    """
+    negative = rdns_cache.get_negative(ip)
+    if negative is not None:
+        return None
+
+    def _load() -> Tuple[Optional[Tuple[str, List[str]]], Optional[str]]:
+        try:
+            name, aliases, _ = _rdns_pool.run(timeout, socket.gethostbyaddr, ip)
+            return (name, aliases), None
+        except (socket.herror, socket.gaierror):
+            return None, "nxdomain"
+        except PoolSaturatedError:
+            return None, None
+        except Exception:
+            return None, "servfail"
+
+    try:
+        names, _ = rdns_cache.get_or_load(ip, _load,
+                                          should_cache=lambda loaded: loaded[0] is not None,
+                                          negative_kind=lambda loaded: loaded[1],
+                                          wait_timeout=timeout)
+    except Exception:
+        return None
+    return names
+
+def dns_lookup(raw_target: str, timeout: float = 5.0, deadline: Optional[Deadline] = None, reverse: bool = False) -> Dict[str, Any]:
     """
     Resolves DNS for a given hostname or URL.
     Returns structured results with latency and A/AAAA IPs.
+    PTR names (reverse_dns / aliases) are only looked up with reverse=True;
+    connect checks leave it off so scans never wait on reverse DNS.
+    With a `deadline`, resolution and reverse lookup only get what is left of
+    the caller's budget (and never more than `timeout`).
+    Concurrent lookups of the same uncached host share a single resolution,
+    and NXDOMAIN / SERVFAIL answers are negatively cached (metadata.cached).
+    When a `netcheck resolverd` daemon is running, the lookup is served by it
+    (one cache and resolver pool for every netcheck process on the host).
     """
+    deadline = Deadline(timeout, parent=deadline)
     host = normalize_host(raw_target)
     if not host:
         return {
@@ -44,67 +137,110 @@ def dns_lookup(raw_target: str, timeout: float = 5.0) -> Dict[str, Any]:
             break
         except OSError:
             pass
+
+    # A local `netcheck resolverd` owns the shared cache; without one, resolve here
+    client = get_resolverd_client()
+    if client is not None and (reverse or not is_ip) and not deadline.expired():
+        remote = client.lookup(host, deadline.remaining(), reverse)
+        if remote is not None:
+            remote["target"] = raw_target
+            return remote
             
     if is_ip:
         result["status"] = "SUCCESS"
         result["success"] = True
         result["latency_ms"] = 0.0
         result["metadata"]["ips"] = [host]
-        # Attempt a quick reverse lookup
-        try:
-            def _quick_rev():
-                return socket.gethostbyaddr(host)[0]
-            rev_name = run_with_timeout(2.0, _quick_rev)
-            result["metadata"]["reverse_dns"] = rev_name
-        except Exception:
-            pass
+        if reverse and not deadline.expired():
+            names = reverse_lookup(host, deadline.remaining(2.0))
+            if names:
+                result["metadata"]["reverse_dns"] = names[0]
         return result
 
-    # Check the DNS cache
-    cached = dns_cache.get(host)
-    if cached:
-        result.update(cached)
+    # Names that recently failed to resolve are answered from the negative cache
+    negative = dns_cache.get_negative(host)
+    if negative is not None:
+        entry = negative[0]
+        result.update(entry)
+        result["latency_ms"] = 0.0
+        result["metadata"] = dict(entry["metadata"], cached=True)
         result["target"] = raw_target
         return result
 
+    # Served from the DNS cache, or resolved once for all concurrent callers
+    start_time = time.perf_counter()
+    try:
+        entry, _, _ = dns_cache.get_or_load(host, lambda: _resolve_host(host, timeout, deadline),
+                                            should_cache=lambda loaded: loaded[0]["success"],
+                                            negative_kind=lambda loaded: loaded[1],
+                                            ttl_of=lambda loaded: loaded[2],
+                                            wait_timeout=deadline.remaining())
+    except Exception as e:
+        result["latency_ms"] = round((time.perf_counter() - start_time) * 1000.0, 2)
+        result["error"] = str(e)
+        result["metadata"]["error_class"] = classify_dns_exception(e)
+        return result
+
+    result.update(entry)
+    result["metadata"] = dict(entry["metadata"])
+    result["target"] = raw_target
+    ips = result["metadata"]["ips"]
+    if reverse and ips and not deadline.expired():
+        names = reverse_lookup(ips[0], deadline.remaining(2.0))
+        if names:
+            result["metadata"]["reverse_dns"], result["metadata"]["aliases"] = names
+    return result
+
+def _resolve_host(host: str, timeout: float, deadline: Deadline) -> Tuple[Dict[str, Any], Optional[str], Optional[float]]:
+    """
+    Forward resolution of a hostname (PTR names are added per caller).
+    Returns the cacheable part of a dns_lookup result, the negative cache kind
+    for failures (see negative_cache_kind) and the record TTL when the
+    resolver knows it (builtin resolver only; None means the cache default).
+    """
+    entry = {
+        "status": "FAILED",
+        "success": False,
+        "latency_ms": None,
+        "error": None,
+        "metadata": {
+            "resolved_host": host,
+            "ips": [],
+            "aliases": [],
+            "reverse_dns": None
+        }
+    }
+
     start_time = time.perf_counter()
+    ttl = None
     try:
         def _resolve():
             return socket.getaddrinfo(host, None)
             
-        addr_info = run_with_timeout(timeout, _resolve)
+        wait = deadline.check("DNS resolution")
+        if _resolver_mode == "builtin":
+            # The stub resolver enforces its own timeouts; no worker thread is parked
+            addresses, ttl = get_builtin_resolver().resolve(host, wait)
+            ips = list(dict.fromkeys(addresses))
+        else:
+            addr_info = run_with_timeout(wait, _resolve)
+            ips = list(set(info[4][0] for info in addr_info))
         duration_ms = (time.perf_counter() - start_time) * 1000.0
         
-        ips = list(set(info[4][0] for info in addr_info))
-        result["status"] = "SUCCESS"
-        result["success"] = True
-        result["latency_ms"] = round(duration_ms, 2)
-        result["metadata"]["ips"] = ips
-        
-        if ips:
-            try:
-                def _reverse():
-                    name, aliases, _ = socket.gethostbyaddr(ips[0])
-                    return name, aliases
-                rev_name, aliases = run_with_timeout(2.0, _reverse)
-                result["metadata"]["reverse_dns"] = rev_name
-                result["metadata"]["aliases"] = aliases
-            except Exception:
-                pass
-                
-        # Cache successful resolutions
-        dns_cache.set(host, {
-            "status": "SUCCESS",
-            "success": True,
-            "latency_ms": result["latency_ms"],
-            "metadata": result["metadata"]
-        })
+        entry["status"] = "SUCCESS"
+        entry["success"] = True
+        entry["latency_ms"] = round(duration_ms, 2)
+        entry["metadata"]["ips"] = ips
         
     except Exception as e:
         duration_ms = (time.perf_counter() - start_time) * 1000.0
-        result["latency_ms"] = round(duration_ms, 2)
-        result["error"] = str(e)
-        result["status"] = "FAILED"
-        result["success"] = False
+        entry["latency_ms"] = round(duration_ms, 2)
+        entry["error"] = str(e)
+        entry["metadata"]["error_class"] = classify_dns_exception(e)
+        kind = negative_cache_kind(e)
+        if kind == "servfail" and deadline.capped and not isinstance(e, socket.gaierror):
+            # A timeout on a budget the caller cut short says nothing about the name
+            kind = None
+        return entry, kind, None
 
-    return result
+    return entry, None, ttl
@@ -3,6 +3,8 @@ import urllib.error
 import time
 from typing import Dict, Any
 
+from netcheck.utils.error_classes import HTTP_CLIENT_ERROR, HTTP_SERVER_ERROR, classify_exception
+
 def check_http_status(url: str, timeout: float = 5.0) -> Dict[str, Any]:
     """
     Validates the HTTP/HTTPS status code, response time, and size for a given URL.
@@ -57,6 +59,8 @@ def check_http_status(url: str, timeout: float = 5.0) -> Dict[str, Any]:
             # Success is defined as any status code < 400
             result["success"] = (200 <= status_code < 400)
             result["status"] = "SUCCESS" if result["success"] else "FAILED"
+            if not result["success"]:
+                result["metadata"]["error_class"] = HTTP_SERVER_ERROR if status_code >= 500 else HTTP_CLIENT_ERROR
             
             result["metadata"]["status_code"] = status_code
             result["metadata"]["size_bytes"] = size_bytes
@@ -75,6 +79,7 @@ def check_http_status(url: str, timeout: float = 5.0) -> Dict[str, Any]:
         result["success"] = False
         result["error"] = f"HTTP Error {e.code}: {e.reason}"
         result["metadata"]["status_code"] = e.code
+        result["metadata"]["error_class"] = HTTP_SERVER_ERROR if e.code >= 500 else HTTP_CLIENT_ERROR
         result["metadata"]["headers"] = {k.lower(): v for k, v in e.headers.items()}
     except urllib.error.URLError as e:
         duration_ms = (time.perf_counter() - start_time) * 1000.0
@@ -82,11 +87,14 @@ def check_http_status(url: str, timeout: float = 5.0) -> Dict[str, Any]:
         result["status"] = "FAILED"
         result["success"] = False
         result["error"] = f"URL Error: {e.reason}"
+        if isinstance(e.reason, BaseException):
+            result["metadata"]["error_class"] = classify_exception(e.reason)
     except Exception as e:
         duration_ms = (time.perf_counter() - start_time) * 1000.0
         result["latency_ms"] = round(duration_ms, 2)
         result["status"] = "FAILED"
         result["success"] = False
         result["error"] = str(e)
+        result["metadata"]["error_class"] = classify_exception(e)
         
     return result
@@ -3,6 +3,7 @@ import platform
 import subprocess
 import re
 from typing import Dict, Any, List, Tuple, Optional
+from netcheck.utils.cache import general_cache
 
 def get_active_local_ip() -> str:
     """
@@ -27,19 +28,22 @@ def get_active_local_ip() -> str:
         s.close()
 
 def get_public_ip(timeout: float = 3.0) -> str:
-    """Retrieves public IP address from public APIs."""
-    import urllib.request
-    services = ["https://api.ipify.org", "https://ifconfig.me", "https://icanhazip.com"]
-    for service in services:
-        try:
-            req = urllib.request.Request(service, headers={'User-Agent': 'NetCheck/2.0'})
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                ip = response.read().decode('utf-8').strip()
-                if ip:
-                    return ip
-        except Exception:
-            continue
-    return "Unknown"
+    """Retrieves public IP address from public APIs (cached for 5 minutes)."""
+    def _fetch() -> str:
+        import urllib.request
+        services = ["https://api.ipify.org", "https://ifconfig.me", "https://icanhazip.com"]
+        for service in services:
+            try:
+                req = urllib.request.Request(service, headers={'User-Agent': 'NetCheck/2.0'})
+                with urllib.request.urlopen(req, timeout=timeout) as response:
+                    ip = response.read().decode('utf-8').strip()
+                    if ip:
+                        return ip
+            except Exception:
+                continue
+        return "Unknown"
+
+    return general_cache.get_or_load("public_ip", _fetch, ttl=300.0, should_cache=lambda ip: ip != "Unknown")
 
 def get_default_gateway() -> Tuple[Optional[str], Optional[str]]:
     """Returns (gateway_ip, interface_name) for the default route."""
@@ -0,0 +1,386 @@
+import secrets
+import selectors
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional, Tuple
+
+# Record types and response codes used by the stub resolver
+TYPE_A = 1
+TYPE_CNAME = 5
+TYPE_AAAA = 28
+CLASS_IN = 1
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+
+_FLAG_QR = 0x8000
+_FLAG_TC = 0x0200
+_FLAG_RD = 0x0100
+_HEADER = struct.Struct("!HHHHHH")
+# Queries awaiting an answer across all sockets; a quarter of the 16-bit id space keeps free ids easy to find
+MAX_PENDING_QUERIES = 16384
+
+def parse_resolv_conf(path: str = "/etc/resolv.conf") -> Dict[str, Any]:
+    """
+    Reads nameservers, the search list and the options the stub resolver
+    honours (ndots, timeout, attempts) from a resolv.conf file.
+    Falls back to the local resolver (127.0.0.1) like glibc does.
+    """
+    conf = {"nameservers": [], "search": [], "ndots": 1, "timeout": 5.0, "attempts": 2}
+    try:
+        with open(path, "r") as f:
+            lines = f.readlines()
+    except OSError:
+        lines = []
+
+    for line in lines:
+        parts = line.split("#", 1)[0].split(";", 1)[0].split()
+        if not parts:
+            continue
+        key, values = parts[0], parts[1:]
+        if key == "nameserver" and values:
+            conf["nameservers"].append(values[0])
+        elif key in ("search", "domain") and values:
+            # The last search/domain line wins
+            conf["search"] = [v.rstrip(".") for v in values]
+        elif key == "options":
+            for opt in values:
+                name, _, val = opt.partition(":")
+                try:
+                    if name == "ndots":
+                        conf["ndots"] = min(int(val), 15)
+                    elif name == "timeout":
+                        conf["timeout"] = float(val)
+                    elif name == "attempts":
+                        conf["attempts"] = max(1, int(val))
+                except ValueError:
+                    pass
+
+    if not conf["nameservers"]:
+        conf["nameservers"] = ["127.0.0.1"]
+    return conf
+
+def parse_hosts_file(path: str = "/etc/hosts") -> Dict[str, List[str]]:
+    """Maps lower-cased names (and aliases) from a hosts file to their addresses."""
+    hosts: Dict[str, List[str]] = {}
+    try:
+        with open(path, "r") as f:
+            lines = f.readlines()
+    except OSError:
+        return hosts
+
+    for line in lines:
+        parts = line.split("#", 1)[0].split()
+        if len(parts) < 2:
+            continue
+        ip = parts[0]
+        for name in parts[1:]:
+            ips = hosts.setdefault(name.lower().rstrip("."), [])
+            if ip not in ips:
+                ips.append(ip)
+    return hosts
+
+def encode_name(name: str) -> bytes:
+    out = bytearray()
+    for label in name.rstrip(".").split("."):
+        if not label:
+            continue
+        raw = label.encode("idna")
+        if len(raw) > 63:
+            raise ValueError(f"DNS label too long: {label}")
+        out.append(len(raw))
+        out += raw
+    out.append(0)
+    return bytes(out)
+
+def build_query(qid: int, name: str, qtype: int) -> bytes:
+    """Builds a recursive (RD) query message for one question."""
+    return _HEADER.pack(qid, _FLAG_RD, 1, 0, 0, 0) + encode_name(name) + struct.pack("!HH", qtype, CLASS_IN)
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Decodes a possibly compressed name; returns (name, offset after it)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if jumps > 32:
+                raise ValueError("DNS name compression loop")
+            pointer = ((length & 0x3F) << 8) | data[offset + 1]
+            if end is None:
+                end = offset + 2
+            offset = pointer
+            jumps += 1
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("ascii", "replace"))
+        offset += length
+    return ".".join(labels), (end if end is not None else offset)
+
+def parse_response(data: bytes) -> Dict[str, Any]:
+    """
+    Parses a response message into its id, flags, question and the A/AAAA
+    addresses of the answer section, with the smallest TTL seen (CNAMEs included).
+    """
+    qid, flags, qdcount, ancount, _, _ = _HEADER.unpack_from(data, 0)
+    offset = _HEADER.size
+    question = None
+    for _ in range(qdcount):
+        qname, offset = _read_name(data, offset)
+        qtype, _ = struct.unpack_from("!HH", data, offset)
+        offset += 4
+        if question is None:
+            question = (qname.lower(), qtype)
+
+    addresses = []
+    ttl = None
+    for _ in range(ancount):
+        _, offset = _read_name(data, offset)
+        rtype, rclass, rttl, rdlength = struct.unpack_from("!HHIH", data, offset)
+        offset += 10
+        rdata = data[offset:offset + rdlength]
+        offset += rdlength
+        if rclass != CLASS_IN:
+            continue
+        if rtype == TYPE_A and rdlength == 4:
+            addresses.append(socket.inet_ntop(socket.AF_INET, rdata))
+        elif rtype == TYPE_AAAA and rdlength == 16:
+            addresses.append(socket.inet_ntop(socket.AF_INET6, rdata))
+        elif rtype != TYPE_CNAME:
+            continue
+        ttl = rttl if ttl is None else min(ttl, rttl)
+
+    return {
+        "id": qid,
+        "rcode": flags & 0x000F,
+        "truncated": bool(flags & _FLAG_TC),
+        "is_response": bool(flags & _FLAG_QR),
+        "question": question,
+        "addresses": addresses,
+        "ttl": ttl,
+    }
+
+class StubResolver:
+    """
+    Minimal recursive-query stub resolver speaking DNS directly.
+    Queries for every caller go out over one UDP socket per address family and
+    are matched back to their callers by id on a background receiver thread,
+    so thousands of lookups can be in flight without a thread each. Truncated
+    answers are retried over TCP. Names from the hosts file are answered
+    locally, and every answer carries the smallest TTL of its records.
+    """
+    def __init__(self, nameservers: Optional[List[str]] = None, port: int = 53,
+                 search: Optional[List[str]] = None, ndots: int = 1,
+                 attempts: int = 2, attempt_timeout: float = 2.0,
+                 hosts: Optional[Dict[str, List[str]]] = None):
+        self.nameservers = list(nameservers or ["127.0.0.1"])
+        self.port = port
+        self.search = list(search or [])
+        self.ndots = ndots
+        self.attempts = max(1, attempts)
+        self.attempt_timeout = attempt_timeout
+        self.hosts = hosts if hosts is not None else {}
+        self._pending: Dict[int, Tuple[Tuple[str, int], Future]] = {}
+        self._sockets: Dict[int, socket.socket] = {}
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._closed = False
+        self._receiver: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_system(cls, resolv_conf: str = "/etc/resolv.conf", hosts_file: str = "/etc/hosts") -> "StubResolver":
+        conf = parse_resolv_conf(resolv_conf)
+        return cls(conf["nameservers"], search=conf["search"], ndots=conf["ndots"],
+                   attempts=conf["attempts"], attempt_timeout=conf["timeout"],
+                   hosts=parse_hosts_file(hosts_file))
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for sock in self._sockets.values():
+                self._selector.unregister(sock)
+                sock.close()
+            self._sockets.clear()
+        if self._receiver is not None:
+            self._receiver.join(timeout=1.0)
+        self._selector.close()
+
+    def _socket_for(self, server: str) -> socket.socket:
+        family = socket.AF_INET6 if ":" in server else socket.AF_INET
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Resolver is closed")
+            sock = self._sockets.get(family)
+            if sock is None:
+                sock = socket.socket(family, socket.SOCK_DGRAM)
+                sock.setblocking(False)
+                self._sockets[family] = sock
+                self._selector.register(sock, selectors.EVENT_READ)
+                if self._receiver is None:
+                    self._receiver = threading.Thread(target=self._receive_loop, name="stub_resolver", daemon=True)
+                    self._receiver.start()
+            return sock
+
+    def _receive_loop(self) -> None:
+        while not self._closed:
+            try:
+                events = self._selector.select(0.2)
+            except (OSError, ValueError):
+                if self._closed:
+                    return
+                continue
+            for key, _ in events:
+                try:
+                    data, addr = key.fileobj.recvfrom(65535)
+                except OSError:
+                    continue
+                self._dispatch(data, addr)
+
+    def _dispatch(self, data: bytes, addr: Tuple) -> None:
+        try:
+            response = parse_response(data)
+        except (ValueError, IndexError, struct.error):
+            return
+        with self._lock:
+            waiting = self._pending.get(response["id"])
+            # Only accept an answer to the exact question, from the server asked
+            if waiting is None or not response["is_response"]:
+                return
+            (server, question), fut = waiting
+            if addr[0] != server or response["question"] != question:
+                return
+            del self._pending[response["id"]]
+        if not fut.done():
+            fut.set_result(response)
+
+    def _send(self, server: str, name: str, qtype: int) -> Tuple[int, Future]:
+        sock = self._socket_for(server)
+        fut: Future = Future()
+        with self._lock:
+            if len(self._pending) >= MAX_PENDING_QUERIES:
+                fut.set_exception(OSError("Too many DNS queries in flight"))
+                return -1, fut
+            qid = secrets.randbits(16)
+            while qid in self._pending:
+                qid = secrets.randbits(16)
+            self._pending[qid] = ((server, (name.lower().rstrip("."), qtype)), fut)
+        try:
+            sock.sendto(build_query(qid, name, qtype), (server, self.port))
+        except OSError as e:
+            self._forget(qid)
+            fut.set_exception(e)
+        return qid, fut
+
+    def _forget(self, qid: int) -> None:
+        with self._lock:
+            self._pending.pop(qid, None)
+
+    def _query_tcp(self, server: str, name: str, qtype: int, timeout: float) -> Dict[str, Any]:
+        qid = secrets.randbits(16)
+        message = build_query(qid, name, qtype)
+        with socket.create_connection((server, self.port), timeout=timeout) as sock:
+            sock.sendall(struct.pack("!H", len(message)) + message)
+            length = struct.unpack("!H", self._recv_exact(sock, 2))[0]
+            response = parse_response(self._recv_exact(sock, length))
+        # Same checks as answers on the shared UDP socket: the exact question, as a response
+        if response["id"] != qid or not response["is_response"] or response["question"] != (name.lower().rstrip("."), qtype):
+            raise OSError(f"Mismatched DNS response from {server}")
+        return response
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        buf = b""
+        while len(buf) < size:
+            chunk = sock.recv(size - len(buf))
+            if not chunk:
+                raise OSError("DNS server closed the TCP connection")
+            buf += chunk
+        return buf
+
+    def query(self, name: str, qtypes: Tuple[int, ...], timeout: float) -> Dict[int, Dict[str, Any]]:
+        """
+        Sends one question per qtype for `name`, all pipelined on the shared
+        socket, and returns {qtype: response}. Unanswered or SERVFAIL questions
+        move on to the next nameserver / attempt; questions still unanswered
+        when `timeout` runs out are missing from the result.
+        """
+        deadline = time.monotonic() + timeout
+        answers: Dict[int, Dict[str, Any]] = {}
+        outstanding = list(qtypes)
+        for _ in range(self.attempts):
+            for server in self.nameservers:
+                remaining = deadline - time.monotonic()
+                if not outstanding or remaining <= 0:
+                    return answers
+                sent = [(qtype,) + self._send(server, name, qtype) for qtype in outstanding]
+                wait_until = time.monotonic() + min(self.attempt_timeout, remaining)
+                for qtype, qid, fut in sent:
+                    try:
+                        response = fut.result(timeout=max(0.0, wait_until - time.monotonic()))
+                    except FutureTimeoutError:
+                        self._forget(qid)
+                        continue
+                    except OSError:
+                        continue
+                    if response["truncated"]:
+                        try:
+                            response = self._query_tcp(server, name, qtype, max(0.1, deadline - time.monotonic()))
+                        except (OSError, ValueError, struct.error):
+                            continue
+                    answers[qtype] = response
+                outstanding = [q for q in outstanding if q not in answers or answers[q]["rcode"] not in (RCODE_NOERROR, RCODE_NXDOMAIN)]
+        return answers
+
+    def _candidates(self, host: str) -> List[str]:
+        if host.endswith("."):
+            return [host.rstrip(".")]
+        searched = [f"{host}.{domain}" for domain in self.search]
+        if host.count(".") >= self.ndots:
+            return [host] + searched
+        return searched + [host]
+
+    def resolve(self, host: str, timeout: float = 5.0) -> Tuple[List[str], Optional[float]]:
+        """
+        Returns (addresses, ttl) for a hostname, querying A and AAAA together.
+        Raises socket.gaierror with EAI_NONAME when the name (or any address for
+        it) does not exist, EAI_AGAIN on SERVFAIL, and TimeoutError when no
+        nameserver answered in time, matching what getaddrinfo callers expect.
+        """
+        local = self.hosts.get(host.lower().rstrip("."))
+        if local:
+            return list(local), None
+
+        deadline = time.monotonic() + timeout
+        saw_failure = False
+        saw_timeout = False
+        for candidate in self._candidates(host):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                saw_timeout = True
+                break
+            answers = self.query(candidate, (TYPE_A, TYPE_AAAA), remaining)
+            if len(answers) < 2:
+                saw_timeout = True
+            addresses = []
+            ttls = []
+            for response in answers.values():
+                if response["rcode"] == RCODE_NOERROR:
+                    addresses.extend(response["addresses"])
+                    if response["ttl"] is not None:
+                        ttls.append(response["ttl"])
+                elif response["rcode"] != RCODE_NXDOMAIN:
+                    saw_failure = True
+            if addresses:
+                return addresses, float(min(ttls)) if ttls else None
+
+        if saw_timeout and not saw_failure:
+            raise TimeoutError(f"DNS query for {host} timed out after {timeout:g} seconds")
+        if saw_failure or saw_timeout:
+            raise socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")
+        raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
@@ -6,6 +6,11 @@ from typing import Dict, Any, Tuple, Optional
 
 from netcheck.utils.normalize import normalize_host
 from netcheck.modules.dns import dns_lookup
+from netcheck.utils.happy_eyeballs import connect_first, HAPPY_EYEBALLS_DELAY
+from netcheck.utils.deadline import Deadline
+from netcheck.utils.error_classes import (
+    DEADLINE, DNS_FAILURE, TLS_FAILURE, UNKNOWN, classify_connect_errors, classify_error_text, classify_exception
+)
 
 try:
     from cryptography import x509
@@ -33,11 +38,14 @@ def extract_dn_from_crypto(name) -> Dict[str, str]:
             pass
     return dn_dict
 
-def check_ssl_certificate(raw_target: str, port: int = 443, timeout: float = 5.0) -> Dict[str, Any]:
+def check_ssl_certificate(raw_target: str, port: int = 443, timeout: float = 5.0, happy_eyeballs: bool = True,
+                          deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Validates SSL/TLS certificate for a target host.
     Extracts validity dates, subject, issuer, and calculates days remaining.
-    Tries all resolved IPs to handle mixed IPv4/IPv6 networks.
+    Races connects across all resolved IPs (RFC 8305) to handle mixed IPv4/IPv6 networks.
+    DNS, connects, handshakes and the unverified fallback all share one
+    `timeout` budget, optionally shortened by the caller's `deadline`.
     """
     target = raw_target
     if "://" in target:
@@ -71,36 +79,54 @@ def check_ssl_certificate(raw_target: str, port: int = 443, timeout: float = 5.0
         }
     }
     
+    deadline = Deadline(timeout, parent=deadline)
+
     # Resolve DNS
-    dns_res = dns_lookup(target_host, timeout=min(timeout, 3.0))
+    dns_res = dns_lookup(target_host, timeout=min(timeout, 3.0), deadline=deadline)
     if not dns_res["success"]:
         result["error"] = f"DNS Resolution failed: {dns_res['error']}"
+        result["metadata"]["error_class"] = dns_res.get("metadata", {}).get("error_class") or classify_error_text(result["error"])
         return result
         
     ips = dns_res["metadata"]["ips"]
     if not ips:
         result["error"] = "No IP addresses resolved"
+        result["metadata"]["error_class"] = DNS_FAILURE
         return result
         
     start_time = time.perf_counter()
     cert = None
     verification_error = None
+    failure_class = None
     resolved_ip = None
     strict_success = False
     
-    # 1. Attempt connection with strict verification (try all resolved IPs)
-    for ip in ips:
-        family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    # 1. Attempt connection with strict verification. Connects are raced across the
+    #    resolved IPs (Happy Eyeballs); if the TLS handshake itself fails on the
+    #    winning IP, the race is repeated over the IPs not yet tried.
+    untried = list(ips)
+    while untried:
+        if deadline.expired():
+            if resolved_ip is None:
+                verification_error = f"Deadline of {deadline.budget:g}s exceeded before connecting"
+                failure_class = DEADLINE
+            break
+        sock, ip, errors = connect_first(untried, port, timeout, HAPPY_EYEBALLS_DELAY if happy_eyeballs else None, deadline)
+        if sock is None:
+            if resolved_ip is None:
+                verification_error = "All connection attempts failed: " + "; ".join(errors)
+                failure_class = classify_connect_errors(errors)
+            break
+        untried.remove(ip)
         try:
             context = ssl.create_default_context()
             context.check_hostname = True
             context.verify_mode = ssl.CERT_REQUIRED
             
-            with socket.socket(family, socket.SOCK_STREAM) as sock:
-                sock.settimeout(timeout)
+            with sock:
+                sock.settimeout(deadline.check("TLS handshake"))
                 # Wrap socket with hostname check
                 with context.wrap_socket(sock, server_hostname=target_host) as ssock:
-                    ssock.connect((ip, port))
                     cert = ssock.getpeercert()
             resolved_ip = ip
             strict_success = True
@@ -110,10 +136,12 @@ def check_ssl_certificate(raw_target: str, port: int = 443, timeout: float = 5.0
             break
         except ssl.SSLCertVerificationError as e:
             verification_error = f"SSL verification failed: {e.reason}"
+            failure_class = TLS_FAILURE
             resolved_ip = ip
             break
         except Exception as e:
             verification_error = str(e)
+            failure_class = classify_exception(e)
             resolved_ip = ip
             # Continue trying other resolved IPs
             continue
@@ -128,7 +156,7 @@ def check_ssl_certificate(raw_target: str, port: int = 443, timeout: float = 5.0
             family = socket.AF_INET6 if ":" in resolved_ip else socket.AF_INET
             fallback_start = time.perf_counter()
             with socket.socket(family, socket.SOCK_STREAM) as sock:
-                sock.settimeout(timeout)
+                sock.settimeout(deadline.check("certificate fallback fetch"))
                 with context_fallback.wrap_socket(sock, server_hostname=target_host) as ssock:
                     ssock.connect((resolved_ip, port))
                     
@@ -171,11 +199,13 @@ def check_ssl_certificate(raw_target: str, port: int = 443, timeout: float = 5.0
             result["latency_ms"] = round(duration_ms, 2)
         except Exception as e:
             result["error"] = verification_error or str(e)
+            result["metadata"]["error_class"] = failure_class or classify_exception(e)
             return result
 
     # 3. Parse certificate metadata
     if not cert:
         result["error"] = verification_error or "Failed to retrieve certificate details"
+        result["metadata"]["error_class"] = failure_class or UNKNOWN
         return result
         
     def parse_dn(dn_list) -> Dict[str, str]:
@@ -222,14 +252,17 @@ def check_ssl_certificate(raw_target: str, port: int = 443, timeout: float = 5.0
             result["error"] = verification_error
             result["status"] = "EXPIRED" if expired else "VERIFICATION_FAILED"
             result["success"] = False
+            result["metadata"]["error_class"] = TLS_FAILURE
         else:
             result["success"] = not expired
             result["status"] = "SUCCESS" if result["success"] else "EXPIRED"
             if expired:
                 result["error"] = "Certificate has expired"
+                result["metadata"]["error_class"] = TLS_FAILURE
     except Exception as e:
         result["error"] = f"Failed to parse cert dates: {e}"
         result["status"] = "FAILED"
         result["success"] = False
+        result["metadata"]["error_class"] = UNKNOWN
         
     return result
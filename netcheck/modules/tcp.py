@@ -1,17 +1,14 @@
-import socket
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from netcheck.modules.dns import dns_lookup
+from netcheck.utils.deadline import Deadline
+from netcheck.utils.happy_eyeballs import connect_first, HAPPY_EYEBALLS_DELAY
+from netcheck.utils.error_classes import DEADLINE, DNS_FAILURE, classify_connect_errors, classify_error_text
 
-def check_tcp_connect(host: str, port: int, timeout: float = 5.0) -> Dict[str, Any]:
-    """
-    Performs a TCP connection test to a host and port.
-    Resolves DNS beforehand and sequentially attempts connection to all resolved IPs
-    (handling dual-stack IPv4/IPv6 fallbacks).
-    """
-    target_str = f"{host}:{port}"
-    result = {
-        "target": target_str,
+def new_tcp_result(host: str, port: int) -> Dict[str, Any]:
+    """Returns the initial (failed) result structure shared by every TCP connect engine."""
+    return {
+        "target": f"{host}:{port}",
         "status": "FAILED",
         "latency_ms": None,
         "success": False,
@@ -23,48 +20,79 @@ def check_tcp_connect(host: str, port: int, timeout: float = 5.0) -> Dict[str, A
             "resolved": False
         }
     }
-    
-    # Resolve DNS first using our cached, timeout-guarded lookup
-    dns_res = dns_lookup(host, timeout=min(timeout, 3.0))
-    if not dns_res["success"]:
-        result["error"] = f"DNS Resolution failed: {dns_res['error']}"
-        return result
-        
-    ips = dns_res["metadata"]["ips"]
-    if not ips:
-        result["error"] = "No IP addresses resolved"
-        return result
-        
-    result["metadata"]["resolved"] = True
-    
-    start_time = time.perf_counter()
-    errors = []
-    
-    # Iterate over all resolved IPs and try connecting. Succeed if at least one works.
-    for ip in ips:
-        try:
-            family = socket.AF_INET6 if ":" in ip else socket.AF_INET
-            sock = socket.socket(family, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            sock.connect((ip, port))
-            sock.close()
-            
-            duration_ms = (time.perf_counter() - start_time) * 1000.0
-            result["status"] = "SUCCESS"
-            result["success"] = True
-            result["latency_ms"] = round(duration_ms, 2)
-            result["metadata"]["ip"] = ip
-            return result
-        except Exception as e:
-            errors.append(f"{ip} ({e})")
-            
-    # All connection attempts failed
+
+def mark_tcp_success(result: Dict[str, Any], ip: str, start_time: float) -> Dict[str, Any]:
+    """Fills in a successful connection to `ip`, measured from `start_time` (perf_counter)."""
+    duration_ms = (time.perf_counter() - start_time) * 1000.0
+    result["status"] = "SUCCESS"
+    result["success"] = True
+    result["latency_ms"] = round(duration_ms, 2)
+    result["metadata"]["ip"] = ip
+    return result
+
+def mark_tcp_failure(result: Dict[str, Any], ips: List[str], errors: List[str], start_time: float) -> Dict[str, Any]:
+    """Fills in the result after every resolved IP failed to connect."""
     duration_ms = (time.perf_counter() - start_time) * 1000.0
     result["latency_ms"] = round(duration_ms, 2)
     result["error"] = "All connection attempts failed: " + "; ".join(errors)
     result["status"] = "FAILED"
     result["success"] = False
-    
+
     # Store the first IP we tried as metadata reference
     result["metadata"]["ip"] = ips[0]
+    # No reply at all (not even a refusal) from any IP: what a dropping firewall looks like
+    result["metadata"]["timed_out"] = bool(errors) and all(e.endswith("(timed out)") for e in errors)
+    result["metadata"]["error_class"] = classify_connect_errors(errors)
     return result
+
+def mark_tcp_dns_failure(result: Dict[str, Any], dns_res: Dict[str, Any]) -> Dict[str, Any]:
+    """Fills in the result when the host did not resolve, or resolved to no addresses."""
+    if dns_res["success"]:
+        result["error"] = "No IP addresses resolved"
+        result["metadata"]["error_class"] = DNS_FAILURE
+        return result
+    result["error"] = f"DNS Resolution failed: {dns_res['error']}"
+    result["metadata"]["error_class"] = dns_res.get("metadata", {}).get("error_class") or classify_error_text(result["error"])
+    return result
+
+def mark_tcp_deadline_exceeded(result: Dict[str, Any], ips: List[str], deadline: Deadline) -> Dict[str, Any]:
+    """Fills in the result when DNS used up the whole budget before any connect."""
+    result["latency_ms"] = 0.0
+    result["error"] = f"Deadline of {deadline.budget:g}s exceeded before connecting"
+    result["metadata"]["ip"] = ips[0]
+    result["metadata"]["error_class"] = DEADLINE
+    return result
+
+def check_tcp_connect(host: str, port: int, timeout: float = 5.0, happy_eyeballs: bool = True,
+                      deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """
+    Performs a TCP connection test to a host and port.
+    Resolves DNS beforehand and connects to the first reachable resolved IP.
+    With several IPs, attempts are raced Happy Eyeballs style (RFC 8305):
+    address families are interleaved and staggered 250ms apart, so a dead
+    AAAA record no longer costs a full timeout before IPv4 is tried.
+    Pass happy_eyeballs=False to try the IPs one after another instead.
+    `timeout` bounds the whole check (DNS included); a caller's `deadline`
+    (e.g. from the retry wrapper) can only shorten it.
+    """
+    result = new_tcp_result(host, port)
+    deadline = Deadline(timeout, parent=deadline)
+
+    # Resolve DNS first using our cached, timeout-guarded lookup
+    dns_res = dns_lookup(host, timeout=min(timeout, 3.0), deadline=deadline)
+    ips = dns_res["metadata"]["ips"] if dns_res["success"] else []
+    if not ips:
+        return mark_tcp_dns_failure(result, dns_res)
+
+    result["metadata"]["resolved"] = True
+    if deadline.expired():
+        return mark_tcp_deadline_exceeded(result, ips, deadline)
+
+    start_time = time.perf_counter()
+    sock, ip, errors = connect_first(ips, port, timeout, HAPPY_EYEBALLS_DELAY if happy_eyeballs else None, deadline)
+    if sock is not None:
+        sock.close()
+        return mark_tcp_success(result, ip, start_time)
+
+    # All connection attempts failed
+    return mark_tcp_failure(result, ips, errors, start_time)
@@ -0,0 +1,183 @@
+import json
+import os
+import socket
+import stat
+import struct
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Dict, Optional
+
+# Overrides where clients (and `netcheck resolverd`) look for the daemon's socket
+SOCKET_ENV_VAR = "NETCHECK_RESOLVERD_SOCKET"
+# After a failed connect, lookups resolve locally for this long before trying the daemon again
+RECONNECT_INTERVAL = 5.0
+# Part of a lookup's timeout kept back from the daemon's own budget so its answer arrives in time
+RESPONSE_GRACE = 0.5
+
+def default_socket_path() -> str:
+    """$NETCHECK_RESOLVERD_SOCKET, else resolverd.sock in $XDG_RUNTIME_DIR/netcheck or a per-user temp dir."""
+    override = os.environ.get(SOCKET_ENV_VAR)
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "netcheck", "resolverd.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"netcheck-{uid}", "resolverd.sock")
+
+def check_socket_dir(directory: str) -> None:
+    """
+    Raises OSError unless `directory` is a real directory (not a symlink)
+    owned by this user with mode 0700. The default path under the temp dir is
+    guessable, so another user could otherwise create it first and serve
+    made-up answers from it.
+    """
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise OSError(f"{directory} is not a directory")
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise OSError(f"{directory} is owned by another user")
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        raise OSError(f"{directory} must have mode 0700, not {stat.S_IMODE(st.st_mode):04o}")
+
+def peer_uid(sock: socket.socket) -> Optional[int]:
+    """The uid of the process at the other end of a Unix socket (Linux SO_PEERCRED), or None where unknown."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+class ResolverdClient:
+    """
+    Connection to a local `netcheck resolverd` daemon.
+    Requests are newline-delimited JSON objects tagged with an `id`; one Unix
+    socket carries any number of concurrent requests, and a reader thread
+    hands each response to the caller waiting on that id. Every failure
+    (no daemon, daemon restarted, slow answer) makes call() return None so
+    the caller can resolve locally instead. A daemon is only trusted when its
+    socket directory passes check_socket_dir and, where the platform can
+    tell, it runs as the same user.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_socket_path()
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, Future] = {}
+        self._next_id = 0
+        self._retry_at = 0.0
+
+    def _connect(self) -> bool:
+        # Called with self._lock held
+        if self._sock is not None:
+            return True
+        if not hasattr(socket, "AF_UNIX") or time.monotonic() < self._retry_at:
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            check_socket_dir(os.path.dirname(os.path.abspath(self.path)))
+            sock.connect(self.path)
+            uid = peer_uid(sock)
+            if uid is not None and uid != os.getuid():
+                raise OSError(f"resolverd on {self.path} runs as another user")
+        except OSError:
+            sock.close()
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL
+            return False
+        self._sock = sock
+        threading.Thread(target=self._read_loop, args=(sock,), name="resolverd_client", daemon=True).start()
+        return True
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        try:
+            with sock.makefile("rb") as stream:
+                for line in stream:
+                    try:
+                        response = json.loads(line)
+                    except ValueError:
+                        continue
+                    with self._lock:
+                        future = self._pending.pop(response.get("id"), None)
+                    if future is not None:
+                        future.set_result(response)
+        except OSError:
+            pass
+        self._disconnect(sock)
+
+    def _disconnect(self, sock: socket.socket) -> None:
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_result(None)
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def call(self, op: str, wait: float, **params: Any) -> Optional[Dict[str, Any]]:
+        """Sends one request and waits up to `wait` seconds for the answer; None means resolve locally."""
+        future: Future = Future()
+        with self._lock:
+            if not self._connect():
+                return None
+            self._next_id += 1
+            request_id = self._next_id
+            self._pending[request_id] = future
+            sock = self._sock
+            try:
+                sock.sendall(json.dumps(dict(params, op=op, id=request_id)).encode("utf-8") + b"\n")
+            except OSError:
+                self._pending.pop(request_id, None)
+                sock = None
+        if sock is None:
+            return None
+        try:
+            response = future.result(wait)
+        except TimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            return None
+        if response is None or "error" in response:
+            return None
+        return response.get("result")
+
+    def lookup(self, host: str, timeout: float, reverse: bool = False) -> Optional[Dict[str, Any]]:
+        """dns_lookup() result from the daemon's shared cache, or None if it could not answer within `timeout`."""
+        budget = timeout - min(RESPONSE_GRACE, timeout / 2)
+        return self.call("lookup", timeout, host=host, timeout=budget, reverse=reverse)
+
+    def close(self) -> None:
+        with self._lock:
+            sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._disconnect(sock)
+
+_client: Optional[ResolverdClient] = None
+_enabled = True
+_client_lock = threading.Lock()
+
+def set_resolverd(enabled: bool, path: Optional[str] = None) -> None:
+    """Turns daemon lookups on or off for this process (the daemon itself turns them off)."""
+    global _client, _enabled
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = ResolverdClient(path) if enabled and path else None
+        _enabled = enabled
+
+def get_resolverd_client() -> Optional[ResolverdClient]:
+    """The shared client, created on first use; None when daemon lookups are disabled."""
+    global _client
+    if not _enabled:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = ResolverdClient()
+        return _client
@@ -0,0 +1,147 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from netcheck.modules.dns import dns_lookup
+from netcheck.resolverd.client import default_socket_path, set_resolverd, check_socket_dir
+from netcheck.utils.cache import dns_cache, rdns_cache
+from netcheck.utils.timeout import timeout_pool_stats
+
+# The daemon listens on a Unix domain socket, which not every platform has (e.g. Windows)
+UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+NOT_SUPPORTED = "netcheck resolverd is not supported on this platform (no Unix domain sockets)"
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: requests are read in order but answered as they complete."""
+
+    def handle(self):
+        write_lock = threading.Lock()
+
+        def _reply(response: Dict[str, Any]) -> None:
+            data = json.dumps(response).encode("utf-8") + b"\n"
+            with write_lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    pass
+
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                _reply({"id": None, "error": "Malformed request"})
+                continue
+            self.server.executor.submit(self.server.dispatch, request, _reply)
+
+if UNIX_SOCKETS:
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+class ResolverDaemon:
+    """
+    `netcheck resolverd`: serves dns_lookup() to local netcheck processes over
+    a Unix domain socket, so they all share one DNS cache (positive and
+    negative) and one resolver pool instead of each keeping its own.
+    Protocol: one JSON object per line, {"id", "op", ...} in and
+    {"id", "result"} or {"id", "error"} out. Ops: lookup (host, timeout,
+    reverse), stats and ping.
+    """
+    def __init__(self, path: Optional[str] = None, workers: int = 64):
+        self.path = path or default_socket_path()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resolverd")
+        self._server: Optional["_UnixServer"] = None
+
+    def dispatch(self, request: Dict[str, Any], reply) -> None:
+        request_id = request.get("id")
+        op = request.get("op")
+        try:
+            if op == "lookup":
+                result = dns_lookup(str(request["host"]), float(request.get("timeout", 5.0)),
+                                    reverse=bool(request.get("reverse", False)))
+            elif op == "stats":
+                result = {"dns_cache": dns_cache.stats(), "rdns_cache": rdns_cache.stats(),
+                          "resolver_pool": timeout_pool_stats()}
+            elif op == "ping":
+                result = "pong"
+            else:
+                reply({"id": request_id, "error": f"Unknown op: {op}"})
+                return
+        except Exception as e:
+            reply({"id": request_id, "error": str(e)})
+            return
+        reply({"id": request_id, "result": result})
+
+    def _claim_socket_path(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # makedirs leaves an existing directory as it is; never serve from one someone else controls
+        check_socket_dir(directory)
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(self.path)
+            else:
+                raise OSError(f"resolverd already running on {self.path}")
+            finally:
+                probe.close()
+
+    def start(self) -> None:
+        """Binds the socket (readable by this user only); serve_forever() then handles clients."""
+        if not UNIX_SOCKETS:
+            raise OSError(NOT_SUPPORTED)
+        set_resolverd(False)  # never forward our own lookups to ourselves
+        self._claim_socket_path()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.executor = self.executor
+        self._server.dispatch = self.dispatch
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.start()
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        self.executor.shutdown(wait=False)
+
+def run_resolverd(path: Optional[str] = None, workers: int = 64) -> None:
+    """Runs the daemon in the foreground until interrupted or terminated."""
+    if not UNIX_SOCKETS:
+        print(f"Error: {NOT_SUPPORTED}", file=sys.stderr)
+        sys.exit(1)
+    daemon = ResolverDaemon(path, workers)
+    try:
+        daemon.start()
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"netcheck resolverd listening on {daemon.path}", file=sys.stderr)
+    # Remove the socket on `kill` / service stop as well as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.shutdown()
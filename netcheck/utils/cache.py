@@ -1,34 +1,272 @@
 import time
 import threading
-from typing import Dict, Tuple, Any, Optional
+import weakref
+from collections import OrderedDict
+from typing import Dict, Tuple, Any, Optional, Callable, List
+
+# How often the background sweeper drops expired entries from every cache
+SWEEP_INTERVAL = 30.0
+
+class _Flight:
+    """One in-progress load that concurrent callers for the same key wait on."""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+class _Shard:
+    """One lock stripe: LRU-ordered positive and negative entries plus counters."""
+    __slots__ = ("lock", "entries", "negative", "hits", "misses", "negative_hits", "evictions", "expirations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.negative: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+        self.expirations = 0
 
 class Cache:
-    """Thread-safe cache with time-to-live (TTL) support."""
-    def __init__(self, default_ttl: float = 300.0):
-        self._cache: Dict[str, Tuple[Any, float]] = {}
-        self._lock = threading.Lock()
+    """
+    Thread-safe, size-bounded LRU cache with time-to-live (TTL) support.
+    Keys are spread over `shards` independently locked stripes, each holding at
+    most its share of `max_entries`; the least recently used entry is evicted
+    when a stripe is full. Expiry uses the monotonic clock, and a background
+    sweeper drops expired entries even if they are never read again.
+    A separate negative layer remembers failures (e.g. NXDOMAIN) under their
+    own, usually shorter, TTLs keyed by failure kind in `negative_ttls`.
+    With a persistent store attached (attach_store), the cache is warmed from
+    it and writes go through to it, so entries are shared across processes.
+    Reads stay in memory; only get_or_load() checks the store, once, right
+    before it would load a value itself.
+    """
+    def __init__(self, default_ttl: float = 300.0, negative_ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = 10000, shards: int = 16):
         self._default_ttl = default_ttl
+        self.negative_ttls: Dict[str, float] = dict(negative_ttls or {})
+        self.max_entries = max(1, max_entries)
+        self._shards: List[_Shard] = [_Shard() for _ in range(max(1, min(shards, self.max_entries)))]
+        self._shard_capacity = -(-self.max_entries // len(self._shards))
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+        self._backing: Optional[Tuple[Any, str]] = None
+        _register_for_sweeping(self)
+
+    def attach_store(self, store: Any, namespace: str) -> int:
+        """
+        Backs this cache with a persistent store (see PersistentCache) under
+        `namespace`, and warms it with the store's unexpired entries.
+        Returns the number of entries loaded.
+        """
+        self._backing = (store, namespace)
+        loaded = 0
+        for negative in (False, True):
+            for key, value, remaining in store.items(self._backing_namespace(negative)):
+                self._store(key, value, remaining, negative, write_through=False)
+                loaded += 1
+        return loaded
+
+    def _backing_namespace(self, negative: bool) -> str:
+        namespace = self._backing[1]
+        return namespace + ":negative" if negative else namespace
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _lookup(self, key: str, negative: bool = False) -> Tuple[bool, Any]:
+        shard = self._shard(key)
+        layer = shard.negative if negative else shard.entries
+        with shard.lock:
+            entry = layer.get(key)
+            if entry is not None and time.monotonic() > entry[1]:
+                del layer[key]
+                shard.expirations += 1
+                entry = None
+            if entry is not None:
+                layer.move_to_end(key)
+                if negative:
+                    shard.negative_hits += 1
+                else:
+                    shard.hits += 1
+                return True, entry[0]
+            if not negative:
+                shard.misses += 1
+        return False, None
+
+    def _read_through(self, key: str) -> Tuple[bool, Any]:
+        # A positive entry another process stored since this cache was warmed
+        if self._backing is None:
+            return False, None
+        stored = self._backing[0].get(self._backing_namespace(False), key)
+        if stored is None:
+            return False, None
+        self._store(key, stored[0], stored[1], write_through=False)
+        shard = self._shard(key)
+        with shard.lock:
+            shard.misses -= 1
+            shard.hits += 1
+        return True, stored[0]
+
+    def _store(self, key: str, value: Any, duration: float, negative: bool = False, write_through: bool = True) -> None:
+        shard = self._shard(key)
+        layer = shard.negative if negative else shard.entries
+        with shard.lock:
+            layer[key] = (value, time.monotonic() + duration)
+            layer.move_to_end(key)
+            while len(layer) > self._shard_capacity:
+                layer.popitem(last=False)
+                shard.evictions += 1
+        if write_through and self._backing is not None:
+            self._backing[0].set(self._backing_namespace(negative), key, value, duration)
 
     def get(self, key: str) -> Optional[Any]:
-        with self._lock:
-            if key not in self._cache:
-                return None
-            value, expiry = self._cache[key]
-            if time.time() > expiry:
-                del self._cache[key]
-                return None
-            return value
+        return self._lookup(key)[1]
 
     def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
         duration = ttl if ttl is not None else self._default_ttl
-        expiry = time.time() + duration
-        with self._lock:
-            self._cache[key] = (value, expiry)
+        self._store(key, value, duration)
+
+    def get_negative(self, key: str) -> Optional[Any]:
+        return self._lookup(key, negative=True)[1]
+
+    def set_negative(self, key: str, value: Any, kind: str) -> None:
+        """Remembers a failure for the TTL configured for its `kind` (not stored if 0 or unknown)."""
+        duration = self.negative_ttls.get(kind, 0.0)
+        if duration <= 0:
+            return
+        self._store(key, value, duration, negative=True)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+                    should_cache: Optional[Callable[[Any], bool]] = None,
+                    wait_timeout: Optional[float] = None,
+                    negative_kind: Optional[Callable[[Any], Optional[str]]] = None,
+                    ttl_of: Optional[Callable[[Any], Optional[float]]] = None) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader()` on a miss.
+        Single-flight: concurrent misses for the same key wait for the one
+        in-progress load and share its value (or its exception) instead of each
+        loading it again. The value is stored only if `should_cache(value)` is
+        true (default: always), for `ttl_of(value)` seconds if that gives one
+        (e.g. DNS record TTLs) and `ttl` otherwise; uncached values may instead
+        go to the negative layer under the kind `negative_kind(value)` names.
+        Waiters give up with TimeoutError after `wait_timeout` seconds.
+        With a persistent store, it is checked once before `loader()` runs.
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                # Re-check under the flight lock: a load may have finished meanwhile
+                shard = self._shard(key)
+                with shard.lock:
+                    entry = shard.entries.get(key)
+                if entry is not None and time.monotonic() <= entry[1]:
+                    return entry[0]
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(wait_timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight lookup of {key}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            found, value = self._read_through(key)
+            if found:
+                flight.value = value
+                return value
+            flight.value = loader()
+            if should_cache is None or should_cache(flight.value):
+                value_ttl = ttl_of(flight.value) if ttl_of is not None else None
+                self.set(key, flight.value, value_ttl if value_ttl is not None else ttl)
+            elif negative_kind is not None:
+                kind = negative_kind(flight.value)
+                if kind:
+                    self.set_negative(key, flight.value, kind)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def sweep(self) -> int:
+        """Drops every expired entry; returns how many were removed."""
+        removed = 0
+        now = time.monotonic()
+        for shard in self._shards:
+            with shard.lock:
+                for layer in (shard.entries, shard.negative):
+                    expired = [k for k, (_, expiry) in layer.items() if now > expiry]
+                    for k in expired:
+                        del layer[k]
+                    shard.expirations += len(expired)
+                    removed += len(expired)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size, summed over all shards."""
+        totals = {"entries": 0, "negative_entries": 0, "hits": 0, "misses": 0, "negative_hits": 0,
+                  "evictions": 0, "expirations": 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals["entries"] += len(shard.entries)
+                totals["negative_entries"] += len(shard.negative)
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["negative_hits"] += shard.negative_hits
+                totals["evictions"] += shard.evictions
+                totals["expirations"] += shard.expirations
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = round(totals["hits"] / lookups, 4) if lookups else 0.0
+        totals["max_entries"] = self.max_entries
+        return totals
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
 
     def clear(self) -> None:
-        with self._lock:
-            self._cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.negative.clear()
+
+_sweep_targets: "weakref.WeakSet[Cache]" = weakref.WeakSet()
+_sweeper: Optional[threading.Thread] = None
+_sweeper_lock = threading.Lock()
+
+def _sweep_loop() -> None:
+    while True:
+        time.sleep(SWEEP_INTERVAL)
+        for cache in list(_sweep_targets):
+            cache.sweep()
+
+def _register_for_sweeping(cache: Cache) -> None:
+    """Adds a cache to the shared daemon sweeper, starting it on first use."""
+    global _sweeper
+    with _sweeper_lock:
+        _sweep_targets.add(cache)
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_loop, name="cache_sweeper", daemon=True)
+            _sweeper.start()
 
 # Global instances for DNS and other resources
-dns_cache = Cache(default_ttl=3600.0)  # 1 hour for DNS
-general_cache = Cache(default_ttl=60.0)  # 1 minute for general lookups (e.g. public IP)
+# 1 hour for DNS answers; failed lookups are remembered for much less
+dns_cache = Cache(default_ttl=3600.0, max_entries=50000, negative_ttls={
+    "nxdomain": 300.0,  # 5 minutes for names that do not exist
+    "servfail": 30.0,   # 30 seconds for resolver failures and timeouts
+})
+# PTR answers change rarely; missing PTR records are remembered as long
+rdns_cache = Cache(default_ttl=3600.0, negative_ttls={"nxdomain": 3600.0, "servfail": 30.0})
+general_cache = Cache(default_ttl=60.0, max_entries=1000)  # 1 minute for general lookups (e.g. public IP)
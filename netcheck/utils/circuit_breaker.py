@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+SKIPPED_HOST_DOWN = "SKIPPED_HOST_DOWN"
+
+def is_timeout_result(res: Dict[str, Any]) -> bool:
+    """True for a failed check whose connection attempts all timed out (no reply at all)."""
+    return not res.get("success", False) and bool(res.get("metadata", {}).get("timed_out"))
+
+class _HostState:
+    __slots__ = ("timeouts", "next_probe")
+
+    def __init__(self):
+        self.timeouts = 0
+        self.next_probe: Optional[float] = None
+
+class HostCircuitBreaker:
+    """
+    Per-host circuit breaker for scans. After `threshold` consecutive connect
+    attempts (retries included) to a host time out, the host is considered
+    down and allow() refuses its remaining checks. With `probe_interval`, one
+    check is let through every that many seconds instead; any answer (even a
+    refused connection) closes the breaker again. Only hosts with recent
+    timeouts are tracked.
+    """
+    def __init__(self, threshold: int = 3, probe_interval: Optional[float] = None):
+        self.threshold = max(1, threshold)
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+        self.opened = 0
+        self.skipped = 0
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state.timeouts >= self.threshold
+
+    def allow(self, host: str) -> bool:
+        """Whether a check of `host` should run now; counts the ones refused."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state.timeouts < self.threshold:
+                return True
+            now = time.monotonic()
+            if self.probe_interval is not None and (state.next_probe is None or now >= state.next_probe):
+                state.next_probe = now + self.probe_interval
+                return True
+            self.skipped += 1
+            return False
+
+    def record(self, host: str, res: Dict[str, Any]) -> None:
+        """Feeds the result of one connect attempt to `host` into the breaker."""
+        with self._lock:
+            if not is_timeout_result(res):
+                self._hosts.pop(host, None)
+                return
+            state = self._hosts.setdefault(host, _HostState())
+            state.timeouts += 1
+            if state.timeouts == self.threshold:
+                self.opened += 1
+                if self.probe_interval is not None:
+                    state.next_probe = time.monotonic() + self.probe_interval
+
+    def timeouts(self, host: str) -> int:
+        with self._lock:
+            state = self._hosts.get(host)
+            return state.timeouts if state is not None else 0
@@ -0,0 +1,93 @@
+import statistics
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from netcheck.utils.error_classes import TIMEOUT, error_class
+
+# Fewest completions a round needs before the limit is adjusted
+MIN_ROUND = 8
+
+class AIMDController:
+    """
+    Adaptive in-flight limit for scans (--auto-jobs), in the style of TCP
+    congestion control. Completed checks are fed to record(); once per round
+    (as many completions as the current limit) the limit is cut by `decrease`
+    if more than `timeout_rate` of them timed out or their median RTT grew
+    past `rtt_factor` times the best round seen, and raised otherwise: doubled
+    until the first cut (slow start), then by `increase`. The limit always
+    stays within [floor, ceiling]; every change is kept in `trajectory`.
+    """
+    def __init__(self, initial: int, floor: int = 4, ceiling: int = 500, increase: int = 1,
+                 decrease: float = 0.5, timeout_rate: float = 0.05, rtt_factor: float = 3.0):
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.limit = min(self.ceiling, max(self.floor, initial))
+        self.increase = max(1, increase)
+        self.decrease = decrease
+        self.timeout_rate = timeout_rate
+        self.rtt_factor = rtt_factor
+        self.base_rtt: Optional[float] = None
+        self.increases = 0
+        self.decreases = 0
+        self.peak = self.limit
+        self._slow_start = True
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._completed = 0
+        self._timeouts = 0
+        self._rtts: List[float] = []
+        self.trajectory: List[Tuple[float, int]] = [(0.0, self.limit)]
+
+    def record(self, res: Dict[str, Any]) -> int:
+        """Feeds one completed connect attempt; returns the (possibly new) limit."""
+        with self._lock:
+            self._completed += 1
+            if error_class(res) == TIMEOUT:
+                self._timeouts += 1
+            elif res.get("latency_ms"):
+                # Refusals are answers too: their RTT measures the path just as well
+                self._rtts.append(res["latency_ms"])
+            if self._completed >= max(self.limit, MIN_ROUND):
+                self._adjust()
+            return self.limit
+
+    def _adjust(self) -> None:
+        # Called with self._lock held, at the end of a round
+        congested = self._timeouts / self._completed > self.timeout_rate
+        if self._rtts:
+            rtt = statistics.median(self._rtts)
+            if self.base_rtt is not None and rtt > self.base_rtt * self.rtt_factor:
+                congested = True
+            self.base_rtt = rtt if self.base_rtt is None else min(self.base_rtt, rtt)
+        self._completed = self._timeouts = 0
+        self._rtts = []
+
+        if congested:
+            self._slow_start = False
+            new_limit = max(self.floor, int(self.limit * self.decrease))
+        elif self._slow_start:
+            new_limit = min(self.ceiling, self.limit * 2)
+        else:
+            new_limit = min(self.ceiling, self.limit + self.increase)
+        if new_limit == self.limit:
+            return
+        if new_limit > self.limit:
+            self.increases += 1
+        else:
+            self.decreases += 1
+        self.limit = new_limit
+        self.peak = max(self.peak, new_limit)
+        self.trajectory.append((round(time.monotonic() - self._started, 2), new_limit))
+
+    def summary(self, max_points: int = 12) -> str:
+        """One line for the run summary: range, counts and a sampled trajectory."""
+        with self._lock:
+            points = list(self.trajectory)
+        if len(points) > max_points:
+            step = (len(points) - 1) / (max_points - 1)
+            points = [points[round(i * step)] for i in range(max_points)]
+        path = " -> ".join(f"{limit}@{elapsed:g}s" for elapsed, limit in points)
+        return (f"Concurrency (--auto-jobs {self.floor}-{self.ceiling}): started at {self.trajectory[0][1]}, "
+                f"peak {self.peak}, final {self.limit} ({self.increases} increases, {self.decreases} decreases); "
+                f"trajectory: {path}")
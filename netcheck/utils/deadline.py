@@ -0,0 +1,48 @@
+import inspect
+import time
+from typing import Optional
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a check has used up its time budget."""
+
+class Deadline:
+    """
+    Monotonic time budget shared by every stage of one check.
+    Created once per check (or per retry loop) and handed down to DNS, connect
+    and TLS handshake, each of which only gets what remains of the budget.
+    A deadline created with a `parent` never outlives the parent; `capped`
+    tells whether the parent cut it short of its own `budget`.
+    """
+    __slots__ = ("budget", "capped", "_expires_at")
+
+    def __init__(self, budget: float, parent: Optional["Deadline"] = None):
+        self.budget = max(0.0, budget)
+        self._expires_at = time.monotonic() + self.budget
+        self.capped = parent is not None and parent._expires_at < self._expires_at
+        if self.capped:
+            self._expires_at = parent._expires_at
+
+    def remaining(self, cap: Optional[float] = None) -> float:
+        """Seconds left (never negative), optionally capped at `cap`."""
+        left = max(0.0, self._expires_at - time.monotonic())
+        return left if cap is None else min(left, cap)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    def check(self, stage: str = "operation") -> float:
+        """Returns the remaining budget, raising DeadlineExceeded if none is left."""
+        left = self.remaining()
+        if left <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.budget:g}s exceeded before {stage}")
+        return left
+
+    def __repr__(self) -> str:
+        return f"Deadline(budget={self.budget:g}, remaining={self.remaining():.3f})"
+
+def accepts_deadline(check_fn) -> bool:
+    """True if a check function takes a `deadline` keyword (DNS, TCP and SSL checks do)."""
+    try:
+        return "deadline" in inspect.signature(check_fn).parameters
+    except (TypeError, ValueError):
+        return False
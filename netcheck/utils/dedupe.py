@@ -0,0 +1,114 @@
+import hashlib
+import math
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Keys remembered exactly before switching to Bloom filters
+EXACT_LIMIT = 100_000
+# Each new Bloom stage holds twice as many keys at half the false-positive rate
+_GROWTH = 2
+_TIGHTENING = 0.5
+
+def _hash_pair(key: str) -> Tuple[int, int]:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` keys at `fp_rate` (Kirsch-Mitzenmacher double hashing)."""
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = max(1, capacity)
+        self.bits = max(8, int(math.ceil(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.bits / self.capacity * math.log(2))))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def add(self, key: str) -> None:
+        self._add_hashed(*_hash_pair(key))
+
+    def __contains__(self, key: str) -> bool:
+        return self._contains_hashed(*_hash_pair(key))
+
+    def _add_hashed(self, h1: int, h2: int) -> None:
+        array, bits = self._array, self.bits
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % bits
+            array[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def _contains_hashed(self, h1: int, h2: int) -> bool:
+        array, bits = self._array, self.bits
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % bits
+            if not array[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+class DuplicateFilter:
+    """
+    Remembers keys it has seen. Exact (a set) up to `exact_limit` keys, then
+    switches to a scalable chain of Bloom filters whose combined
+    false-positive rate stays below `fp_rate`. With a Bloom filter, a new key
+    is wrongly reported as a duplicate with at most that probability, and
+    memory stays around 1-2 bytes per key instead of a set entry per key.
+    """
+    def __init__(self, fp_rate: float = 0.001, exact_limit: int = EXACT_LIMIT):
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.fp_rate = fp_rate
+        self.exact_limit = exact_limit
+        self._exact: Optional[Set[str]] = set()
+        self._stages: List[BloomFilter] = []
+        self.duplicates = 0
+
+    @property
+    def exact(self) -> bool:
+        return self._exact is not None
+
+    def _new_stage(self) -> BloomFilter:
+        # Stage i gets fp_rate * (1 - r) * r^i, so the whole chain sums to <= fp_rate
+        i = len(self._stages)
+        stage = BloomFilter(max(self.exact_limit, 1) * 2 * _GROWTH ** i,
+                            self.fp_rate * (1 - _TIGHTENING) * _TIGHTENING ** i)
+        self._stages.append(stage)
+        return stage
+
+    def seen(self, key: str) -> bool:
+        """Records the key; returns True if it had been recorded before."""
+        if self._exact is not None:
+            if key in self._exact:
+                self.duplicates += 1
+                return True
+            if len(self._exact) < self.exact_limit:
+                self._exact.add(key)
+                return False
+            # Too many keys to keep exactly: move them into the first Bloom stage
+            stage = self._new_stage()
+            for known in self._exact:
+                stage.add(known)
+            self._exact = None
+
+        h1, h2 = _hash_pair(key)
+        for stage in self._stages:
+            if stage._contains_hashed(h1, h2):
+                self.duplicates += 1
+                return True
+        stage = self._stages[-1]
+        if stage.count >= stage.capacity:
+            stage = self._new_stage()
+        stage._add_hashed(h1, h2)
+        return False
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the Bloom stages (0 while still exact)."""
+        return sum(len(stage) for stage in self._stages)
+
+def dedupe_targets(targets: Iterable[Tuple[str, Any]], seen: DuplicateFilter) -> Iterator[Tuple[str, Any]]:
+    """
+    Drops (host, port) targets that were already produced, comparing hosts
+    case-insensitively; `seen.duplicates` counts what was dropped.
+    """
+    for host, port in targets:
+        if not seen.seen(f"{host.strip().lower()}:{int(port)}"):
+            yield host, port
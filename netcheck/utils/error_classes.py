@@ -0,0 +1,118 @@
+import errno
+import re
+import socket
+import ssl
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterable, Optional
+
+from netcheck.utils.deadline import DeadlineExceeded
+
+# Why a check failed, stored in result["metadata"]["error_class"]
+REFUSED = "refused"            # the host answered with RST: the port is closed
+RESET = "reset"                # connection dropped mid-way (reset, aborted, broken pipe)
+TIMEOUT = "timeout"            # no reply at all before the timeout
+UNREACHABLE = "unreachable"    # no route to the host or network (ICMP unreachable, interface down)
+DNS_NXDOMAIN = "dns_nxdomain"  # the name does not exist
+DNS_TIMEOUT = "dns_timeout"    # the resolver did not answer in time
+DNS_FAILURE = "dns_failure"    # SERVFAIL, no addresses, other resolver errors
+TLS_FAILURE = "tls_failure"    # handshake or certificate verification failed
+DEADLINE = "deadline"          # the caller's --deadline budget ran out
+HTTP_CLIENT_ERROR = "http_client_error"  # 4xx response
+HTTP_SERVER_ERROR = "http_server_error"  # 5xx response
+UNKNOWN = "unknown"
+
+ERROR_CLASSES = (REFUSED, RESET, TIMEOUT, UNREACHABLE, DNS_NXDOMAIN, DNS_TIMEOUT, DNS_FAILURE,
+                 TLS_FAILURE, DEADLINE, HTTP_CLIENT_ERROR, HTTP_SERVER_ERROR, UNKNOWN)
+
+_ERRNO_CLASSES = {
+    errno.ECONNREFUSED: REFUSED,
+    errno.ECONNRESET: RESET,
+    errno.ECONNABORTED: RESET,
+    errno.EPIPE: RESET,
+    errno.ETIMEDOUT: TIMEOUT,
+    errno.ENETUNREACH: UNREACHABLE,
+    errno.EHOSTUNREACH: UNREACHABLE,
+    errno.ENETDOWN: UNREACHABLE,
+}
+if hasattr(errno, "EHOSTDOWN"):
+    _ERRNO_CLASSES[errno.EHOSTDOWN] = UNREACHABLE
+
+_NXDOMAIN_CODES = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+_ERRNO_PATTERN = re.compile(r"\[Errno (-?\d+)\]")
+
+# When a target's IPs failed in different ways, report the one most worth retrying
+_PRECEDENCE = (TIMEOUT, RESET, UNREACHABLE, DEADLINE, REFUSED, UNKNOWN)
+
+def classify_exception(err: BaseException) -> str:
+    """Error class of an exception raised by a resolver, connect or handshake."""
+    if isinstance(err, DeadlineExceeded):
+        return DEADLINE
+    if isinstance(err, ssl.SSLError):
+        return TLS_FAILURE
+    if isinstance(err, socket.gaierror):
+        if err.errno in _NXDOMAIN_CODES:
+            return DNS_NXDOMAIN
+        return DNS_FAILURE
+    if isinstance(err, OSError) and err.errno in _ERRNO_CLASSES:
+        return _ERRNO_CLASSES[err.errno]
+    if isinstance(err, (socket.timeout, TimeoutError, FutureTimeoutError)):
+        return TIMEOUT
+    return UNKNOWN
+
+def classify_dns_exception(err: BaseException) -> str:
+    """Error class of a failed name resolution (timeouts become DNS_TIMEOUT)."""
+    cls = classify_exception(err)
+    if cls == TIMEOUT:
+        return DNS_TIMEOUT
+    if cls in (DNS_NXDOMAIN, DEADLINE):
+        return cls
+    return DNS_FAILURE
+
+def classify_error_text(error: Optional[str]) -> str:
+    """
+    Error class of a failure message such as one per-IP entry from connect_first
+    ("1.2.3.4 (timed out)", "1.2.3.4 ([Errno 111] Connection refused)").
+    Used for results that carry no metadata.error_class of their own.
+    """
+    if not error:
+        return UNKNOWN
+    text = error.lower()
+    dns = text.startswith("dns resolution failed") or text.startswith("no ip addresses")
+    match = _ERRNO_PATTERN.search(error)
+    if match:
+        code = int(match.group(1))
+        if code < 0 or dns:
+            # getaddrinfo (EAI_*) codes are negative
+            return DNS_NXDOMAIN if code in _NXDOMAIN_CODES else DNS_FAILURE
+        if code in _ERRNO_CLASSES:
+            return _ERRNO_CLASSES[code]
+    if "deadline" in text and "exceeded" in text:
+        return DEADLINE
+    if "timed out" in text or "timeout" in text:
+        return DNS_TIMEOUT if dns else TIMEOUT
+    if dns:
+        return DNS_NXDOMAIN if "not known" in text or "nxdomain" in text else DNS_FAILURE
+    if "ssl" in text or "certificate" in text or "handshake" in text:
+        return TLS_FAILURE
+    if "refused" in text:
+        return REFUSED
+    if "reset" in text or "broken pipe" in text or "aborted" in text:
+        return RESET
+    if "unreachable" in text:
+        return UNREACHABLE
+    return UNKNOWN
+
+def classify_connect_errors(errors: Iterable[str]) -> str:
+    """One class for a target whose resolved IPs all failed (see _PRECEDENCE)."""
+    classes = {classify_error_text(e) for e in errors}
+    for cls in _PRECEDENCE:
+        if cls in classes:
+            return cls
+    return next(iter(classes), UNKNOWN)
+
+def error_class(res: Dict[str, Any]) -> Optional[str]:
+    """A result's error class: None for successes, metadata.error_class if set, else read from the error text."""
+    if res.get("success", False):
+        return None
+    cls = res.get("metadata", {}).get("error_class")
+    return cls or classify_error_text(res.get("error"))
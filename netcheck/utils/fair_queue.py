@@ -0,0 +1,47 @@
+from collections import deque
+from typing import Deque, Generic, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+class _Lane(Generic[T]):
+    __slots__ = ("items", "weight", "deficit")
+
+    def __init__(self, items: Iterator[T], weight: float):
+        self.items = items
+        self.weight = weight
+        self.deficit = 0.0
+
+class FairQueue(Generic[T]):
+    """
+    Merges several lanes (iterables) into one stream by deficit round robin:
+    each turn a lane may yield `weight` items (fractions carry over to its
+    next turn), and lanes that run dry drop out. With equal weights this is
+    plain round robin, so a short lane finishes within a few rounds however
+    long the others are. Lanes are consumed lazily, one item at a time.
+    """
+    def __init__(self) -> None:
+        self._lanes: List[_Lane[T]] = []
+
+    def add(self, items: Iterable[T], weight: float = 1.0) -> None:
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._lanes.append(_Lane(iter(items), weight))
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    def __iter__(self) -> Iterator[T]:
+        active: Deque[_Lane[T]] = deque(self._lanes)
+        self._lanes = []
+        while active:
+            lane = active.popleft()
+            lane.deficit += lane.weight
+            while lane.deficit >= 1.0:
+                try:
+                    item = next(lane.items)
+                except StopIteration:
+                    break
+                lane.deficit -= 1.0
+                yield item
+            else:
+                active.append(lane)
@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 import xml.etree.ElementTree as ET
 
+from netcheck.utils.circuit_breaker import SKIPPED_HOST_DOWN
+
 def strip_ansi(text: str) -> str:
     """Removes ANSI escape codes from a string for accurate length calculation."""
     return re.sub(r'\033\[[0-9;]*m', '', text)
@@ -39,6 +41,125 @@ def get_colors(use_color: bool) -> Dict[str, str]:
         "reset": ""
     }
 
+# Result-set "kinds" used by the TCP formatters: success-only, failure-only, or mixed.
+# They pick the legacy container names / CSV headers and let streaming writers
+# produce the same layout without seeing every result first.
+TCP_JSON_KEYS = {"success": "results", "failed": "failures", "all": "all_results"}
+
+TCP_CSV_HEADERS = {
+    "success": ["Status", "Host", "Port", "Method", "Timestamp"],
+    "failed": ["Status", "Host", "Port", "Reason", "Timestamp"],
+    "all": ["Status", "Host", "Port", "Method/Reason", "Timestamp"],
+}
+
+TCP_XML_CONTAINERS = {"success": "successful_connections", "failed": "failed_connections", "all": "all_results"}
+
+def tcp_result_kind(results: List[Dict[str, Any]]) -> str:
+    """Classifies a TCP result set as 'success', 'failed' or 'all' (mixed)."""
+    if results and all(r.get("success", False) for r in results):
+        return "success"
+    if results and all(not r.get("success", False) for r in results):
+        return "failed"
+    return "all"
+
+def _tcp_host_port(r: Dict[str, Any]):
+    host = r.get("metadata", {}).get("host", r.get("target", "").split(":")[0])
+    port = r.get("metadata", {}).get("port", r.get("target", "").split(":")[-1])
+    return host, port
+
+def tcp_json_entry(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds the legacy JSON entry for one TCP connect result."""
+    host, port = _tcp_host_port(r)
+    try:
+        port = int(port)
+    except ValueError:
+        port = 0
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if r.get("success", False):
+        method = r.get("metadata", {}).get("method", "netcat")
+        return {
+            "status": "success",
+            "host": host,
+            "port": port,
+            "method": method,
+            "timestamp": timestamp
+        }
+    reason = r.get("error", "timeout") or "timeout"
+    return {
+        "status": SKIPPED_HOST_DOWN if r.get("status") == SKIPPED_HOST_DOWN else "failed",
+        "host": host,
+        "port": port,
+        "reason": reason,
+        "timestamp": timestamp
+    }
+
+def tcp_csv_row(r: Dict[str, Any]) -> List[Any]:
+    """Builds the legacy CSV row for one TCP connect result."""
+    host, port = _tcp_host_port(r)
+    status = "SUCCESS" if r.get("success", False) else SKIPPED_HOST_DOWN if r.get("status") == SKIPPED_HOST_DOWN else "FAILED"
+    method_reason = r.get("metadata", {}).get("method", "netcat") if r.get("success", False) else (r.get("error", "timeout") or "timeout")
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return [status, host, port, method_reason, timestamp]
+
+def tcp_xml_element(r: Dict[str, Any]) -> ET.Element:
+    """Builds the legacy <connection> XML element for one TCP connect result."""
+    host, port = _tcp_host_port(r)
+    r_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if r.get("success", False):
+        method = r.get("metadata", {}).get("method", "netcat")
+        return ET.Element("connection", host=host, port=str(port), method=method, timestamp=r_time)
+    reason = r.get("error", "timeout") or "timeout"
+    if r.get("status") == SKIPPED_HOST_DOWN:
+        return ET.Element("connection", host=host, port=str(port), status=SKIPPED_HOST_DOWN, reason=reason, timestamp=r_time)
+    return ET.Element("connection", host=host, port=str(port), reason=reason, timestamp=r_time)
+
+def format_text_table_header() -> List[str]:
+    """Returns the header lines of the bulk text table."""
+    return [
+        "="*80,
+        f"Network Check Results - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "="*80,
+        f"{'Status':12} {'Target':30} {'Latency':10} {'Details'}",
+        "-"*80,
+    ]
+
+def format_text_row(r: Dict[str, Any], c: Dict[str, str]) -> str:
+    """Formats one result as a row of the bulk text table."""
+    target = r.get("target", "")
+    status = r.get("status", "")
+    success = r.get("success", False)
+    latency = f"{r.get('latency_ms', '')}ms" if r.get('latency_ms') is not None else "N/A"
+    details = r.get("error", "") or ""
+    
+    if success:
+        status_str = f"{c['green']}SUCCESS{c['reset']}"
+    else:
+        status_str = f"{c['red']}FAILED{c['reset']}"
+        
+    if status == "REDIRECT":
+        status_str = f"{c['yellow']}REDIRECT{c['reset']}"
+    elif status == SKIPPED_HOST_DOWN:
+        status_str = f"{c['yellow']}{SKIPPED_HOST_DOWN}{c['reset']}"
+        
+    meta = r.get("metadata", {})
+    if "status_code" in meta:
+        details = f"HTTP {meta['status_code']}" + (f" -> {meta['redirect_url']}" if meta.get("redirect_url") else "")
+    elif "days_until_expiry" in meta:
+        details = f"SSL expires in {meta['days_until_expiry']} days"
+    elif "ips" in meta:
+        details = f"IPs: {', '.join(meta['ips'][:3])}"
+        
+    return f"{pad_right(status_str, 12)} {pad_right(target, 30)} {pad_right(latency, 10)} {details}"
+
+def format_text_table_footer(total: int, successes: int, failures: int) -> List[str]:
+    """Returns the summary footer lines of the bulk text table."""
+    return [
+        "="*80,
+        "Check Complete!",
+        f"Total: {total}  |  Successful: {successes}  |  Failed: {failures}",
+        "="*80,
+    ]
+
 def format_json(results: List[Dict[str, Any]]) -> str:
     """Format results to structured JSON matching legacy or specialized formats."""
     if results and len(results) == 1:
@@ -100,32 +221,7 @@ def format_json(results: List[Dict[str, Any]]) -> str:
     all_success = all(r.get("success", False) for r in results) if results else True
     all_fail = all(not r.get("success", False) for r in results) if results else True
     
-    formatted_results = []
-    for r in results:
-        host = r.get("metadata", {}).get("host", r.get("target", "").split(":")[0])
-        try:
-            port = int(r.get("metadata", {}).get("port", r.get("target", "").split(":")[-1]))
-        except ValueError:
-            port = 0
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if r.get("success", False):
-            method = r.get("metadata", {}).get("method", "netcat")
-            formatted_results.append({
-                "status": "success",
-                "host": host,
-                "port": port,
-                "method": method,
-                "timestamp": timestamp
-            })
-        else:
-            reason = r.get("error", "timeout") or "timeout"
-            formatted_results.append({
-                "status": "failed",
-                "host": host,
-                "port": port,
-                "reason": reason,
-                "timestamp": timestamp
-            })
+    formatted_results = [tcp_json_entry(r) for r in results]
             
     if all_success and results:
         data = {
@@ -240,34 +336,9 @@ def format_csv(results: List[Dict[str, Any]]) -> str:
     output = io.StringIO()
     writer = csv.writer(output)
     
-    all_success = all(r.get("success", False) for r in results) if results else True
-    all_fail = all(not r.get("success", False) for r in results) if results else True
-    
-    if all_success and results:
-        writer.writerow(["Status", "Host", "Port", "Method", "Timestamp"])
-        for r in results:
-            host = r.get("metadata", {}).get("host", r.get("target", "").split(":")[0])
-            port = r.get("metadata", {}).get("port", r.get("target", "").split(":")[-1])
-            method = r.get("metadata", {}).get("method", "netcat")
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            writer.writerow(["SUCCESS", host, port, method, timestamp])
-    elif all_fail and results:
-        writer.writerow(["Status", "Host", "Port", "Reason", "Timestamp"])
-        for r in results:
-            host = r.get("metadata", {}).get("host", r.get("target", "").split(":")[0])
-            port = r.get("metadata", {}).get("port", r.get("target", "").split(":")[-1])
-            reason = r.get("error", "timeout") or "timeout"
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            writer.writerow(["FAILED", host, port, reason, timestamp])
-    else:
-        writer.writerow(["Status", "Host", "Port", "Method/Reason", "Timestamp"])
-        for r in results:
-            host = r.get("metadata", {}).get("host", r.get("target", "").split(":")[0])
-            port = r.get("metadata", {}).get("port", r.get("target", "").split(":")[-1])
-            status = "SUCCESS" if r.get("success", False) else "FAILED"
-            method_reason = r.get("metadata", {}).get("method", "netcat") if r.get("success", False) else (r.get("error", "timeout") or "timeout")
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            writer.writerow([status, host, port, method_reason, timestamp])
+    writer.writerow(TCP_CSV_HEADERS[tcp_result_kind(results)])
+    for r in results:
+        writer.writerow(tcp_csv_row(r))
     return output.getvalue()
 
 def format_xml(results: List[Dict[str, Any]]) -> str:
@@ -366,28 +437,10 @@ def format_xml(results: List[Dict[str, Any]]) -> str:
     # Default legacy TCP connect check format
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     root = ET.Element("connectivity_check", date=timestamp)
-    
-    all_success = all(r.get("success", False) for r in results) if results else True
-    all_fail = all(not r.get("success", False) for r in results) if results else True
-    
-    if all_success and results:
-        container = ET.SubElement(root, "successful_connections")
-    elif all_fail and results:
-        container = ET.SubElement(root, "failed_connections")
-    else:
-        container = ET.SubElement(root, "all_results")
+    container = ET.SubElement(root, TCP_XML_CONTAINERS[tcp_result_kind(results)])
         
     for r in results:
-        host = r.get("metadata", {}).get("host", r.get("target", "").split(":")[0])
-        port = str(r.get("metadata", {}).get("port", r.get("target", "").split(":")[-1]))
-        r_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        if r.get("success", False):
-            method = r.get("metadata", {}).get("method", "netcat")
-            ET.SubElement(container, "connection", host=host, port=port, method=method, timestamp=r_time)
-        else:
-            reason = r.get("error", "timeout") or "timeout"
-            ET.SubElement(container, "connection", host=host, port=port, reason=reason, timestamp=r_time)
+        container.append(tcp_xml_element(r))
             
     xml_str = ET.tostring(root, encoding="utf-8").decode("utf-8")
     return '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_str
@@ -663,45 +716,18 @@ def format_text(results: List[Dict[str, Any]], verbose: bool = False, use_color:
             
     # Bulk targets check format (tabular)
     else:
-        lines.append("="*80)
-        lines.append(f"Network Check Results - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("="*80)
-        lines.append(f"{'Status':12} {'Target':30} {'Latency':10} {'Details'}")
-        lines.append("-"*80)
+        lines.extend(format_text_table_header())
         
         successes = 0
         failures = 0
         
         for r in results:
-            target = r.get("target", "")
-            status = r.get("status", "")
-            success = r.get("success", False)
-            latency = f"{r.get('latency_ms', '')}ms" if r.get('latency_ms') is not None else "N/A"
-            details = r.get("error", "") or ""
-            
-            if success:
+            if r.get("success", False):
                 successes += 1
-                status_str = f"{c['green']}SUCCESS{c['reset']}"
             else:
                 failures += 1
-                status_str = f"{c['red']}FAILED{c['reset']}"
-                
-            if status == "REDIRECT":
-                status_str = f"{c['yellow']}REDIRECT{c['reset']}"
-                
-            meta = r.get("metadata", {})
-            if "status_code" in meta:
-                details = f"HTTP {meta['status_code']}" + (f" -> {meta['redirect_url']}" if meta.get("redirect_url") else "")
-            elif "days_until_expiry" in meta:
-                details = f"SSL expires in {meta['days_until_expiry']} days"
-            elif "ips" in meta:
-                details = f"IPs: {', '.join(meta['ips'][:3])}"
-                
-            lines.append(f"{pad_right(status_str, 12)} {pad_right(target, 30)} {pad_right(latency, 10)} {details}")
+            lines.append(format_text_row(r, c))
             
-        lines.append("="*80)
-        lines.append("Check Complete!")
-        lines.append(f"Total: {len(results)}  |  Successful: {successes}  |  Failed: {failures}")
-        lines.append("="*80)
+        lines.extend(format_text_table_footer(len(results), successes, failures))
         
     return "\n".join(lines)
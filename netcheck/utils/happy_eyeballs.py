@@ -0,0 +1,154 @@
+import errno
+import os
+import selectors
+import socket
+import time
+from typing import List, Optional, Tuple
+from netcheck.utils.deadline import Deadline
+
+# RFC 8305 section 5 recommended "Connection Attempt Delay"
+HAPPY_EYEBALLS_DELAY = 0.25
+
+# connect_ex() codes meaning "in progress" (WSAEWOULDBLOCK is 10035 on Windows)
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, 10035}
+
+def interleave_families(ips: List[str]) -> List[str]:
+    """
+    Orders addresses per RFC 8305 section 4: alternate IPv6 and IPv4,
+    starting with IPv6, keeping the resolver order within each family.
+    """
+    v6 = [ip for ip in ips if ":" in ip]
+    v4 = [ip for ip in ips if ":" not in ip]
+    ordered = []
+    for i in range(max(len(v6), len(v4))):
+        if i < len(v6):
+            ordered.append(v6[i])
+        if i < len(v4):
+            ordered.append(v4[i])
+    return ordered
+
+def describe_connect_error(ip: str, err: BaseException) -> str:
+    """Formats a failed attempt the way the sequential connect loop always has."""
+    if isinstance(err, (socket.timeout, TimeoutError)) and not getattr(err, "errno", None):
+        return f"{ip} (timed out)"
+    if isinstance(err, OSError) and err.errno:
+        return f"{ip} ([Errno {err.errno}] {os.strerror(err.errno)})"
+    return f"{ip} ({err})"
+
+def _connect_sequential(ips: List[str], port: int, timeout: float, deadline: Optional[Deadline] = None) -> Tuple[Optional[socket.socket], Optional[str], List[str]]:
+    errors = []
+    for ip in ips:
+        attempt_timeout = timeout
+        if deadline is not None:
+            attempt_timeout = deadline.remaining(timeout)
+            if attempt_timeout <= 0:
+                errors.append(f"{ip} (deadline exceeded)")
+                continue
+        try:
+            family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(attempt_timeout)
+            try:
+                sock.connect((ip, port))
+            except Exception:
+                sock.close()
+                raise
+            return sock, ip, errors
+        except Exception as e:
+            errors.append(f"{ip} ({e})")
+    return None, None, errors
+
+def connect_first(ips: List[str], port: int, timeout: float, attempt_delay: Optional[float] = HAPPY_EYEBALLS_DELAY,
+                  deadline: Optional[Deadline] = None) -> Tuple[Optional[socket.socket], Optional[str], List[str]]:
+    """
+    Connects to the first reachable address in `ips`.
+    With more than one address and an `attempt_delay`, attempts are raced
+    Happy Eyeballs style (RFC 8305): families are interleaved, a new attempt
+    starts every `attempt_delay` seconds (or as soon as one fails), the first
+    success wins and the rest are cancelled, all within one `timeout`.
+    With `attempt_delay=None` addresses are tried one after another, each
+    with up to `timeout`.
+    A `deadline` caps everything further: each sequential attempt, and the
+    race as a whole, only gets what is left of it. check_tcp_connect always
+    passes one covering the whole check, so there later addresses only get
+    what the earlier ones left.
+    Returns (connected socket, winning ip, errors from failed attempts); the
+    socket is None when every attempt failed. The caller owns the socket.
+    """
+    if attempt_delay is None or len(ips) < 2:
+        return _connect_sequential(ips, port, timeout, deadline)
+
+    if deadline is not None:
+        timeout = deadline.remaining(timeout)
+
+    ordered = interleave_families(ips)
+    errors: List[str] = []
+    pending = {}
+    selector = selectors.DefaultSelector()
+    race_end = time.monotonic() + timeout
+    next_start = time.monotonic()
+    next_index = 0
+    winner = None
+
+    try:
+        while winner is None:
+            now = time.monotonic()
+            if now >= race_end:
+                break
+
+            if next_index < len(ordered) and (now >= next_start or not pending):
+                ip = ordered[next_index]
+                next_index += 1
+                try:
+                    sock = socket.socket(socket.AF_INET6 if ":" in ip else socket.AF_INET, socket.SOCK_STREAM)
+                except OSError as e:
+                    errors.append(describe_connect_error(ip, e))
+                    continue
+                sock.setblocking(False)
+                err = sock.connect_ex((ip, port))
+                if err == 0:
+                    winner = (sock, ip)
+                    break
+                if err not in _IN_PROGRESS:
+                    sock.close()
+                    errors.append(describe_connect_error(ip, OSError(err, os.strerror(err))))
+                    continue
+                pending[sock] = ip
+                selector.register(sock, selectors.EVENT_WRITE)
+                next_start = now + attempt_delay
+                continue
+
+            if not pending:
+                break
+
+            wait = race_end - now
+            if next_index < len(ordered):
+                wait = min(wait, max(0.0, next_start - now))
+            for key, _ in selector.select(wait):
+                sock = key.fileobj
+                ip = pending.pop(sock)
+                selector.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err == 0:
+                    winner = (sock, ip)
+                    break
+                sock.close()
+                errors.append(describe_connect_error(ip, OSError(err, os.strerror(err))))
+                # A failed attempt lets the next one start right away
+                next_start = time.monotonic()
+    finally:
+        # Cancel every attempt still in flight
+        for sock, ip in pending.items():
+            selector.unregister(sock)
+            sock.close()
+            if winner is None:
+                errors.append(f"{ip} (timed out)")
+        selector.close()
+
+    if winner is None:
+        return None, None, errors
+
+    sock, ip = winner
+    # Hand back a socket in the same mode the sequential path produces
+    sock.settimeout(timeout)
+    return sock, ip, errors
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+JOURNAL_VERSION = 1
+
+def targets_fingerprint(targets: Iterable[Tuple[Union[str, Sequence], str]]) -> str:
+    """Digest of a batch's raw (host, ports) lines; a journal only resumes the input it was written for."""
+    digest = hashlib.sha256()
+    for host, p_str in targets:
+        digest.update(f"{host}\t{p_str}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+class ScanJournal:
+    """
+    Append-only checkpoint of a batch scan (--journal / --resume), one JSON
+    object per line. The header records the input fingerprint, the number of
+    targets and the `options` that shape the target stream (order, seed,
+    dedupe), which together fix the index of every target; each following
+    line holds a result and the indices of the targets it settles. Lines are
+    flushed at most once per `flush_interval` seconds, so a crash loses at
+    most that much work (it is simply checked again) and a truncated last
+    line is ignored. Completed indices are kept in a bitmap of total/8 bytes.
+    """
+    def __init__(self, path: str, header: Dict[str, Any], done: Optional[bytearray] = None,
+                 completed: int = 0, flush_interval: float = 1.0):
+        self.path = path
+        self.header = header
+        self.total = header["total"]
+        self.completed = completed
+        self.flush_interval = flush_interval
+        self._done = done if done is not None else bytearray((self.total + 7) // 8)
+        # Indices handed out by track() whose result has not come back yet
+        self._pending: Dict[Tuple[str, int], List[int]] = {}
+        self._file = None
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def create(cls, path: str, fingerprint: str, total: int, options: Optional[Dict[str, Any]] = None,
+               flush_interval: float = 1.0) -> "ScanJournal":
+        """Starts a new journal at `path`, replacing any previous one."""
+        header = {"netcheck_journal": JOURNAL_VERSION, "fingerprint": fingerprint, "total": total,
+                  "options": options or {}}
+        journal = cls(path, header, flush_interval=flush_interval)
+        journal._file = open(path, "w", encoding="utf-8")
+        journal._file.write(json.dumps(header) + "\n")
+        journal._file.flush()
+        return journal
+
+    @classmethod
+    def resume(cls, path: str, fingerprint: str, flush_interval: float = 1.0) -> "ScanJournal":
+        """Loads the journal at `path` to continue it; ValueError if it belongs to a different input."""
+        header = None
+        done = bytearray()
+        completed = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash; its target is checked again
+                    continue
+                if header is None:
+                    header = entry
+                    if header.get("netcheck_journal") != JOURNAL_VERSION:
+                        raise ValueError(f"{path} is not a netcheck journal")
+                    if header.get("fingerprint") != fingerprint:
+                        raise ValueError(f"{path} was written for a different input")
+                    done = bytearray((header["total"] + 7) // 8)
+                    continue
+                for index in entry.get("i", ()):
+                    if 0 <= index < header["total"] and not done[index >> 3] & (1 << (index & 7)):
+                        done[index >> 3] |= 1 << (index & 7)
+                        completed += 1
+        if header is None:
+            raise ValueError(f"{path} is empty")
+        journal = cls(path, header, done, completed, flush_interval)
+        journal._file = open(path, "a+", encoding="utf-8")
+        journal._file.seek(0, os.SEEK_END)
+        if journal._file.tell() > 0:
+            journal._file.seek(journal._file.tell() - 1)
+            if journal._file.read(1) != "\n":
+                journal._file.write("\n")
+        return journal
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        return self.header.get("options", {})
+
+    def is_done(self, index: int) -> bool:
+        return bool(self._done[index >> 3] & (1 << (index & 7)))
+
+    def previous_results(self) -> Iterator[Dict[str, Any]]:
+        """The results already in the journal, read back from disk in the order they were written."""
+        self._flush()
+        with open(self.path, "r", encoding="utf-8") as f:
+            next(f, None)
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "result" in entry:
+                    yield entry["result"]
+
+    def track(self, targets: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, int]]:
+        """
+        Numbers `targets` in order (the numbering the header describes), skips
+        those already done and remembers the index of each one handed out.
+        """
+        for index, target in enumerate(targets):
+            if self.is_done(index):
+                continue
+            self._pending.setdefault(target, []).append(index)
+            yield target
+
+    def record(self, target: Tuple[str, int], res: Dict[str, Any]) -> None:
+        """Appends the result of a tracked target; it settles every pending index of that (host, port)."""
+        indices = self._pending.pop(target, ())
+        for index in indices:
+            self._done[index >> 3] |= 1 << (index & 7)
+        self.completed += len(indices)
+        self._file.write(json.dumps({"i": list(indices), "result": res}, default=str) + "\n")
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        try:
+            os.fsync(self._file.fileno())
+        except OSError:
+            pass
+        self._file.close()
+        self._file = None
@@ -0,0 +1,56 @@
+from typing import Iterator, List
+
+_MASK64 = (1 << 64) - 1
+
+def _mix64(x: int) -> int:
+    # splitmix64 finaliser: a cheap, well-spread 64-bit hash
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK64
+    return x ^ (x >> 31)
+
+class FeistelPermutation:
+    """
+    A seeded pseudo-random permutation of range(size) that is computed one
+    index at a time, so huge index spaces (a /8 times 65535 ports) are
+    shuffled in O(1) memory. A balanced Feistel network over the smallest
+    even number of bits covering `size` is a bijection on that power of two;
+    outputs past `size` are fed through again (cycle walking) until they land
+    inside, which keeps it a bijection on range(size). The same seed always
+    gives the same order.
+    """
+    ROUNDS = 4
+
+    def __init__(self, size: int, seed: int):
+        if size < 0:
+            raise ValueError("size must not be negative")
+        self.size = size
+        self.seed = seed
+        self._half = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._mask = (1 << self._half) - 1
+        state = seed & _MASK64
+        self._keys: List[int] = []
+        for _ in range(self.ROUNDS):
+            state = (state + 0x9E3779B97F4A7C15) & _MASK64
+            self._keys.append(_mix64(state))
+
+    def _encrypt(self, x: int) -> int:
+        left, right = x >> self._half, x & self._mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix64(right ^ key) & self._mask)
+        return (left << self._half) | right
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        # The domain is under 4 * size, so this loops fewer than 4 times on average
+        x = self._encrypt(index)
+        while x >= self.size:
+            x = self._encrypt(x)
+        return x
+
+    def __iter__(self) -> Iterator[int]:
+        for index in range(self.size):
+            yield self[index]
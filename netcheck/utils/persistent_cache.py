@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+# Set to 1/true/yes to enable the on-disk cache without --persistent-cache
+ENV_VAR = "NETCHECK_PERSISTENT_CACHE"
+DEFAULT_FILENAME = "cache.sqlite3"
+
+def default_cache_dir() -> str:
+    """$XDG_CACHE_HOME/netcheck, falling back to ~/.cache/netcheck."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "netcheck")
+
+def persistent_cache_requested() -> bool:
+    return os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+class PersistentCache:
+    """
+    SQLite-backed key/value store that outlives a single netcheck process.
+    Uses WAL journaling and a busy timeout so concurrent processes can read
+    and write it at once. Expiry is stored as wall-clock time (monotonic
+    clocks are not comparable across processes). Values must be JSON
+    serializable; tuples come back as lists. Every operation is best effort:
+    a locked or broken database behaves like an empty cache, and a row that
+    no longer decodes is deleted and treated as a miss.
+    """
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = os.path.join(default_cache_dir(), DEFAULT_FILENAME)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """Returns (value, seconds left) for an unexpired entry, else None."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return None
+        try:
+            return json.loads(row[0]), remaining
+        except ValueError:
+            self.delete(namespace, key)
+            return None
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        except sqlite3.Error:
+            pass
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, payload, time.time() + ttl),
+                )
+        except sqlite3.Error:
+            pass
+
+    def items(self, namespace: str) -> List[Tuple[str, Any, float]]:
+        """All unexpired (key, value, seconds left) entries of a namespace, for warming."""
+        now = time.time()
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, value, expires_at FROM entries WHERE namespace = ? AND expires_at > ?", (namespace, now)
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+        entries = []
+        for key, value, expires_at in rows:
+            try:
+                entries.append((key, json.loads(value), expires_at - now))
+            except ValueError:
+                # A corrupt or partly written value is a miss; drop it so it is stored afresh
+                self.delete(namespace, key)
+        return entries
+
+    def purge_expired(self) -> int:
+        try:
+            with self._lock:
+                return self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),)).rowcount
+        except sqlite3.Error:
+            return 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_store: Optional[PersistentCache] = None
+
+def enable_persistent_cache(path: Optional[str] = None) -> PersistentCache:
+    """
+    Opens the on-disk store, drops expired rows, and attaches it to the shared
+    dns_cache, rdns_cache and general_cache (write-through, warmed right away).
+    """
+    global _store
+    from netcheck.utils.cache import dns_cache, rdns_cache, general_cache
+    if _store is None:
+        _store = PersistentCache(path)
+        _store.purge_expired()
+        dns_cache.attach_store(_store, "dns")
+        rdns_cache.attach_store(_store, "rdns")
+        general_cache.attach_store(_store, "general")
+    return _store
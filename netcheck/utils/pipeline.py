@@ -0,0 +1,127 @@
+import heapq
+import itertools
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+class Deferred(float):
+    """Gate answer: ask again about this item after this many seconds; it holds no slot meanwhile."""
+
+class BoundedScheduler:
+    """
+    Feeds work items to an executor through a bounded in-flight window.
+    Items are pulled lazily from the source only when a slot frees up
+    (backpressure), and completions are handed back in completion order,
+    so neither pending futures nor results pile up for large inputs.
+    Items passed to retry_later() wait on a delay heap without holding a
+    slot, and are resubmitted (ahead of fresh items) once they are due.
+    An optional `gate(item)` is asked before every submission: 0 to start
+    now, a number of seconds to start later (the item keeps its slot while
+    it waits), a Deferred(seconds) to ask again later while the item waits
+    without a slot, or None to hold the item back until something completes
+    (a gate may only refuse while one of its own admitted items is in flight).
+    At most `max_deferred` items wait deferred before the source is paused,
+    so a paced host at the head of the input does not stall the others.
+    `release(item)` is called for every admitted item once it completes.
+    No worker thread ever sleeps for the gate.
+    """
+    def __init__(self, submit: Callable[[T], Future], window: int,
+                 gate: Optional[Callable[[T], Optional[float]]] = None,
+                 release: Optional[Callable[[T], None]] = None, max_deferred: int = 4096):
+        self._submit = submit
+        self.window = max(1, window)
+        self._gate = gate
+        self._release = release
+        self.max_deferred = max_deferred
+        self._delayed: List[Tuple[float, int, T]] = []
+        self._starting: List[Tuple[float, int, T]] = []
+        self._seq = itertools.count()
+
+    def retry_later(self, item: T, delay: float) -> None:
+        """Schedules `item` to be submitted again after `delay` seconds (call while consuming run())."""
+        heapq.heappush(self._delayed, (time.monotonic() + max(0.0, delay), next(self._seq), item))
+
+    def run(self, items: Iterable[T]) -> Iterator[Tuple[T, Future]]:
+        completed: "queue.Queue[Tuple[T, Future]]" = queue.Queue()
+        source = iter(items)
+        exhausted = False
+        # Submitted, or admitted by the gate and waiting for their start time
+        in_flight = 0
+        # Refused by the gate; looked at again after the next completion
+        blocked: "deque[T]" = deque()
+        recheck: "deque[T]" = deque()
+        # Deferred by the gate; asked again when due
+        deferred: List[Tuple[float, int, T]] = []
+
+        def start(item: T) -> None:
+            fut = self._submit(item)
+            fut.add_done_callback(lambda f, item=item: completed.put((item, f)))
+
+        while True:
+            now = time.monotonic()
+            while self._starting and self._starting[0][0] <= now:
+                start(heapq.heappop(self._starting)[2])
+
+            while in_flight < self.window:
+                if recheck:
+                    item = recheck.popleft()
+                elif deferred and deferred[0][0] <= now:
+                    item = heapq.heappop(deferred)[2]
+                elif self._delayed and self._delayed[0][0] <= now:
+                    item = heapq.heappop(self._delayed)[2]
+                elif not exhausted and len(blocked) < self.window and len(deferred) < self.max_deferred:
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        continue
+                else:
+                    break
+                if self._gate is not None:
+                    wait = self._gate(item)
+                    if wait is None:
+                        blocked.append(item)
+                        continue
+                    if isinstance(wait, Deferred):
+                        heapq.heappush(deferred, (now + wait, next(self._seq), item))
+                        continue
+                    if wait > 0:
+                        heapq.heappush(self._starting, (now + wait, next(self._seq), item))
+                        in_flight += 1
+                        continue
+                start(item)
+                in_flight += 1
+
+            if in_flight == 0:
+                if blocked:
+                    raise RuntimeError("gate refused items while none of its items were in flight")
+                pending = [heap[0][0] for heap in (deferred, self._delayed) if heap]
+                if not pending:
+                    return
+                # Only retries and deferred items left, none due yet
+                time.sleep(max(0.0, min(pending) - time.monotonic()))
+                continue
+
+            # Wake up for the next gated start, or for the next deferred item or retry
+            # if a slot is free; otherwise wait for a completion
+            due = []
+            if self._starting:
+                due.append(self._starting[0][0])
+            if in_flight < self.window:
+                due.extend(heap[0][0] for heap in (deferred, self._delayed) if heap)
+            wait = max(0.0, min(due) - time.monotonic()) if due else None
+            try:
+                item, fut = completed.get(timeout=wait)
+            except queue.Empty:
+                continue
+            in_flight -= 1
+            if self._release is not None:
+                self._release(item)
+            if blocked:
+                recheck.extend(blocked)
+                blocked.clear()
+            yield item, fut
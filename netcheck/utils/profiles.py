@@ -0,0 +1,25 @@
+from typing import Any, Dict
+
+# Named timing templates (--timing / the MCP tools' "timing" argument). Each
+# sets the per-check timeout, parallel jobs, attempts and retry delay, plus
+# a global connect rate (connects/sec, None = unlimited) and the most checks
+# of a single host in flight at once (None = unlimited). Explicit flags win.
+TIMING_PROFILES: Dict[str, Dict[str, Any]] = {
+    # One connect at a time, one per 2 seconds: for IDS-watched networks
+    "paranoid": {"timeout": 10.0, "jobs": 1, "retry": 3, "retry_delay": 5.0, "max_rate": 0.5, "host_concurrency": 1},
+    # Low, steady load that never bursts at any single host
+    "polite": {"timeout": 8.0, "jobs": 10, "retry": 2, "retry_delay": 2.0, "max_rate": 20.0, "host_concurrency": 2},
+    # The built-in defaults
+    "normal": {"timeout": 5.0, "jobs": 10, "retry": 1, "retry_delay": 1.0, "max_rate": None, "host_concurrency": None},
+    # Fast, reliable LANs and data centres
+    "aggressive": {"timeout": 2.0, "jobs": 100, "retry": 2, "retry_delay": 0.5, "max_rate": 2000.0, "host_concurrency": 32},
+    # As fast as the machine allows; expect false timeouts on lossy paths
+    "insane": {"timeout": 1.0, "jobs": 500, "retry": 1, "retry_delay": 0.25, "max_rate": None, "host_concurrency": None},
+}
+
+def get_timing_profile(name: str) -> Dict[str, Any]:
+    """The settings of a named timing profile (a copy); ValueError for unknown names."""
+    try:
+        return dict(TIMING_PROFILES[name])
+    except KeyError:
+        raise ValueError(f"Unknown timing profile: {name} (expected one of {', '.join(TIMING_PROFILES)})")
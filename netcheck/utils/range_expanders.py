@@ -1,11 +1,117 @@
 import ipaddress
-from typing import List
+import socket
+from collections.abc import Sequence
+from typing import List, Iterator, Union, Any
 
-def expand_ip_range(ip_str: str) -> List[str]:
+class IPRange(Sequence):
     """
-    Expands an IP string representing a single IP, a CIDR block (e.g. 192.168.1.0/24),
-    or a dash-range (e.g. 192.168.1.1-50).
+    Immutable sequence of IP addresses backed by integer bounds.
+    Supports len(), indexing, slicing, `in` and iteration in O(1) memory;
+    addresses are only turned into strings as they are consumed, so a /8 or an
+    IPv6 /64 costs nothing until it is scanned. Use `.size` for ranges too large
+    for len() (more than sys.maxsize addresses).
     """
+    __slots__ = ("_ints", "version")
+
+    def __init__(self, start: int, end: int, version: int = 4):
+        self._ints = range(start, end + 1)
+        self.version = version
+
+    @classmethod
+    def _from_ints(cls, ints: range, version: int) -> "IPRange":
+        obj = cls.__new__(cls)
+        obj._ints = ints
+        obj.version = version
+        return obj
+
+    @property
+    def size(self) -> int:
+        """Number of addresses, without len()'s sys.maxsize limit."""
+        r = self._ints
+        if r.step > 0:
+            return max(0, (r.stop - r.start + r.step - 1) // r.step)
+        return max(0, (r.start - r.stop - r.step - 1) // -r.step)
+
+    def _to_str(self, value: int) -> str:
+        if self.version == 4:
+            return socket.inet_ntoa(value.to_bytes(4, "big"))
+        return str(ipaddress.IPv6Address(value))
+
+    def _to_int(self, ip: Any) -> int:
+        addr = ipaddress.ip_address(ip)
+        if addr.version != self.version:
+            raise ValueError(f"{ip} is not an IPv{self.version} address")
+        return int(addr)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "IPRange"]:
+        if isinstance(index, slice):
+            return IPRange._from_ints(self._ints[index], self.version)
+        return self._to_str(self._ints[index])
+
+    def __iter__(self) -> Iterator[str]:
+        to_str = self._to_str
+        for value in self._ints:
+            yield to_str(value)
+
+    def __reversed__(self) -> Iterator[str]:
+        return iter(self[::-1])
+
+    def __contains__(self, ip: Any) -> bool:
+        try:
+            return self._to_int(ip) in self._ints
+        except ValueError:
+            return False
+
+    def index(self, ip: Any, *args: Any) -> int:
+        try:
+            return self._ints.index(self._to_int(ip), *args)
+        except ValueError:
+            raise ValueError(f"{ip} is not in range")
+
+    def count(self, ip: Any) -> int:
+        return 1 if ip in self else 0
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, IPRange):
+            return self.version == other.version and self._ints == other._ints
+        if isinstance(other, (list, tuple)):
+            return self.size == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.version, self._ints))
+
+    def __repr__(self) -> str:
+        if not self:
+            return f"IPRange(<empty IPv{self.version}>)"
+        return f"IPRange({self[0]!r}..{self[-1]!r}, size={self.size})"
+
+def _network_hosts(network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network]) -> IPRange:
+    """Same addresses as network.hosts(), as an IPRange."""
+    first = int(network.network_address)
+    last = int(network.broadcast_address)
+    if network.num_addresses <= 2:
+        # /32, /31 (and /128, /127): every address is usable
+        return IPRange(first, last, network.version)
+    if network.version == 4:
+        return IPRange(first + 1, last - 1, 4)
+    # IPv6 only skips the Subnet-Router anycast address
+    return IPRange(first + 1, last, 6)
+
+def parse_ip_range(ip_str: Union[str, Sequence]) -> Sequence:
+    """
+    Lazy variant of expand_ip_range: returns an IPRange for CIDR blocks and
+    dash-ranges, or a one-element list for single IPs and hostnames.
+    Sequences that are already expanded (e.g. an IPRange) are returned as-is.
+    """
+    if not isinstance(ip_str, str):
+        return ip_str
     ip_str = ip_str.strip()
     if not ip_str:
         return []
@@ -13,7 +119,7 @@ def expand_ip_range(ip_str: str) -> List[str]:
     if "/" in ip_str:
         try:
             network = ipaddress.ip_network(ip_str, strict=False)
-            return [str(ip) for ip in network.hosts()]
+            return _network_hosts(network)
         except Exception:
             return [ip_str]
             
@@ -33,18 +139,26 @@ def expand_ip_range(ip_str: str) -> List[str]:
                 
             start = ipaddress.ip_address(start_ip)
             end = ipaddress.ip_address(end_ip)
-            
-            ips = []
-            curr = start
-            while curr <= end:
-                ips.append(str(curr))
-                curr += 1
-            return ips
+            if start.version != end.version:
+                return [ip_str]
+            return IPRange(int(start), int(end), start.version)
         except Exception:
             return [ip_str]
     else:
         return [ip_str]
 
+def ip_range_size(hosts: Sequence) -> int:
+    """Number of hosts in a parse_ip_range() result, safe for huge ranges."""
+    return hosts.size if isinstance(hosts, IPRange) else len(hosts)
+
+def expand_ip_range(ip_str: str) -> List[str]:
+    """
+    Expands an IP string representing a single IP, a CIDR block (e.g. 192.168.1.0/24),
+    or a dash-range (e.g. 192.168.1.1-50).
+    Materialises every address; prefer parse_ip_range for large ranges.
+    """
+    return list(parse_ip_range(ip_str))
+
 def expand_port_range(port_str: str) -> List[int]:
     """
     Expands a port range string which can be a single port (80), a list (80,443),
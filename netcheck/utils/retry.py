@@ -1,16 +1,87 @@
 import time
+import random
 import functools
-from typing import Callable, TypeVar, Any, Tuple, Optional
+from typing import Callable, TypeVar, Any, Dict, Tuple, Optional
+
+from netcheck.utils.error_classes import (
+    ERROR_CLASSES, TIMEOUT, RESET, UNREACHABLE, DNS_TIMEOUT, DNS_FAILURE, HTTP_SERVER_ERROR, UNKNOWN, error_class
+)
 
 T = TypeVar('T')
 
+def backoff_delay(attempt: int, delay: float, backoff: float = 1.0, jitter: float = 0.0) -> float:
+    """
+    Seconds to wait after failed attempt number `attempt` (1-based):
+    `delay * backoff ** (attempt - 1)`, spread by up to +/- `jitter`
+    (a fraction of the delay, 0-1) so retries of many targets don't fire in lockstep.
+    """
+    wait = delay * backoff ** (attempt - 1)
+    if jitter > 0:
+        wait *= 1.0 + random.uniform(-jitter, jitter)
+    return max(0.0, wait)
+
+# Failure classes retried by default, with their attempt caps (None: up to --retry).
+# Refusals, NXDOMAIN, TLS failures, 4xx responses and an exhausted --deadline are definitive answers.
+DEFAULT_RETRY_CLASSES: Dict[str, Optional[int]] = {
+    TIMEOUT: None,
+    RESET: None,
+    UNREACHABLE: 2,   # a route may come back (ARP, flapping link), but rarely within seconds
+    DNS_TIMEOUT: None,
+    DNS_FAILURE: None,
+    HTTP_SERVER_ERROR: None,
+    UNKNOWN: None,
+}
+
+class RetryPolicy:
+    """
+    Decides from a failed result's error class (see netcheck/utils/error_classes.py)
+    whether another attempt is worth it. `limits` maps each retried class to
+    the most attempts it may use, or None for as many as the caller allows;
+    classes not in it are never retried.
+    """
+    def __init__(self, limits: Optional[Dict[str, Optional[int]]] = None):
+        self.limits = dict(DEFAULT_RETRY_CLASSES if limits is None else limits)
+
+    def should_retry(self, result: Dict[str, Any], attempt: int) -> bool:
+        """True if `result`, the outcome of attempt number `attempt`, should be tried again."""
+        cls = error_class(result)
+        if cls is None or cls not in self.limits:
+            return False
+        limit = self.limits[cls]
+        return limit is None or attempt < limit
+
+    @classmethod
+    def parse(cls, spec: str) -> "RetryPolicy":
+        """
+        Builds a policy from a --retry-on value: comma-separated classes, each
+        optionally capped as class=attempts (e.g. "timeout,reset,unreachable=2"),
+        or "all" / "none" / "default".
+        """
+        spec = spec.strip().lower()
+        if spec == "default":
+            return cls()
+        if spec == "all":
+            return cls({name: None for name in ERROR_CLASSES})
+        limits: Dict[str, Optional[int]] = {}
+        if spec != "none":
+            for part in filter(None, (p.strip() for p in spec.split(","))):
+                name, _, cap = part.partition("=")
+                name = name.strip()
+                if name not in ERROR_CLASSES:
+                    raise ValueError(f"Unknown error class: {name} (expected one of {', '.join(ERROR_CLASSES)})")
+                limits[name] = int(cap) if cap.strip() else None
+        return cls(limits)
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
 def with_retry(
     retries: int = 1,
     delay: float = 1.0,
     backoff: float = 1.0,
-    exceptions: Tuple[type, ...] = (Exception,)
+    exceptions: Tuple[type, ...] = (Exception,),
+    jitter: float = 0.0
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
-    """Decorator to retry a function on exception with optional exponential backoff."""
+    """Decorator to retry a function on exception with optional exponential backoff and jitter."""
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
@@ -21,7 +92,8 @@ def with_retry(
                 retries=retries,
                 delay=delay,
                 backoff=backoff,
-                exceptions=exceptions
+                exceptions=exceptions,
+                jitter=jitter
             )
         return wrapper
     return decorator
@@ -33,13 +105,13 @@ def retry_call(
     retries: int = 1,
     delay: float = 1.0,
     backoff: float = 1.0,
-    exceptions: Tuple[type, ...] = (Exception,)
+    exceptions: Tuple[type, ...] = (Exception,),
+    jitter: float = 0.0
 ) -> T:
     """Helper function to execute a callable with retries."""
     if kwargs is None:
         kwargs = {}
     
-    current_delay = delay
     last_exception = None
     
     for attempt in range(1, retries + 1):
@@ -48,8 +120,7 @@ def retry_call(
         except exceptions as e:
             last_exception = e
             if attempt < retries:
-                time.sleep(current_delay)
-                current_delay *= backoff
+                time.sleep(backoff_delay(attempt, delay, backoff, jitter))
             
     if last_exception:
         raise last_exception
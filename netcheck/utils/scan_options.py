@@ -0,0 +1,34 @@
+from typing import Optional
+
+from netcheck.utils.circuit_breaker import HostCircuitBreaker
+from netcheck.utils.concurrency import AIMDController
+from netcheck.utils.retry import RetryPolicy, DEFAULT_RETRY_POLICY
+from netcheck.utils.throttle import ScanThrottle
+
+class ScanOptions:
+    """
+    How the checks of a quick or batch scan are run: per-connect `timeout`,
+    `jobs` in flight, up to `retries` attempts waiting `retry_delay` *
+    `retry_backoff` ** (n - 1) (+/- `retry_jitter`) between them for the
+    error classes `retry_policy` retries, the `engine`, the per-target
+    `deadline`, and the optional circuit `breaker`, adaptive `concurrency`
+    controller and `throttle`. One object is built per run (see
+    build_scan_options in netcheck/cli.py) and handed down unchanged.
+    """
+    def __init__(self, timeout: float = 5.0, jobs: int = 10, retries: int = 1, retry_delay: float = 1.0,
+                 retry_backoff: float = 1.0, retry_jitter: float = 0.0, retry_policy: Optional[RetryPolicy] = None,
+                 engine: str = "thread", deadline: Optional[float] = None,
+                 breaker: Optional[HostCircuitBreaker] = None, concurrency: Optional[AIMDController] = None,
+                 throttle: Optional[ScanThrottle] = None):
+        self.timeout = timeout
+        self.jobs = jobs
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.retry_backoff = retry_backoff
+        self.retry_jitter = retry_jitter
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.engine = engine
+        self.deadline = deadline
+        self.breaker = breaker
+        self.concurrency = concurrency
+        self.throttle = throttle
@@ -0,0 +1,161 @@
+import json
+import csv
+import sys
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, Optional, TextIO
+import xml.etree.ElementTree as ET
+
+from netcheck.utils.formatters import (
+    get_colors, format_text_table_header, format_text_row, format_text_table_footer,
+    tcp_json_entry, tcp_csv_row, tcp_xml_element,
+    TCP_JSON_KEYS, TCP_CSV_HEADERS, TCP_XML_CONTAINERS,
+)
+
+class StreamWriter(ABC):
+    """
+    Incremental writer for TCP connect results.
+    Emits each result as soon as it is written, so memory stays flat no matter
+    how many results pass through. `kind` ('success', 'failed', 'all') selects
+    the same container names / headers the batch formatters use.
+    """
+    def __init__(self, stream: TextIO, kind: str = "all"):
+        self.stream = stream
+        self.kind = kind
+        self.count = 0
+        self.successes = 0
+        self.failures = 0
+        self._closed = False
+
+    def write(self, result: Dict[str, Any]) -> None:
+        if result.get("success", False):
+            self.successes += 1
+        else:
+            self.failures += 1
+        self._write_result(result)
+        self.count += 1
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._write_footer()
+        self.stream.flush()
+        # Writers opened on files own them; the console streams stay open
+        if self.stream not in (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__):
+            self.stream.close()
+
+    @abstractmethod
+    def _write_result(self, result: Dict[str, Any]) -> None:
+        """Writes one result in the writer's format."""
+
+    def _write_footer(self) -> None:
+        pass
+
+class TextStreamWriter(StreamWriter):
+    def __init__(self, stream: TextIO, kind: str = "all", use_color: Optional[bool] = None):
+        super().__init__(stream, kind)
+        if use_color is None:
+            use_color = stream.isatty() if hasattr(stream, "isatty") else False
+        self._colors = get_colors(use_color)
+        self.stream.write("\n".join(format_text_table_header()) + "\n")
+
+    def _write_result(self, result: Dict[str, Any]) -> None:
+        self.stream.write(format_text_row(result, self._colors) + "\n")
+
+    def _write_footer(self) -> None:
+        self.stream.write("\n".join(format_text_table_footer(self.count, self.successes, self.failures)) + "\n")
+
+class CsvStreamWriter(StreamWriter):
+    def __init__(self, stream: TextIO, kind: str = "all"):
+        super().__init__(stream, kind)
+        self._writer = csv.writer(stream)
+        self._writer.writerow(TCP_CSV_HEADERS[kind])
+
+    def _write_result(self, result: Dict[str, Any]) -> None:
+        self._writer.writerow(tcp_csv_row(result))
+
+class JsonStreamWriter(StreamWriter):
+    """Writes the legacy JSON document layout one array element at a time."""
+    def __init__(self, stream: TextIO, kind: str = "all"):
+        super().__init__(stream, kind)
+        check_date = json.dumps(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        self.stream.write(f'{{\n  "check_date": {check_date},\n  "{TCP_JSON_KEYS[kind]}": [')
+
+    def _write_result(self, result: Dict[str, Any]) -> None:
+        entry = json.dumps(tcp_json_entry(result), indent=2).replace("\n", "\n    ")
+        self.stream.write(("," if self.count else "") + "\n    " + entry)
+
+    def _write_footer(self) -> None:
+        self.stream.write("\n  ]\n}\n")
+
+class XmlStreamWriter(StreamWriter):
+    """Writes the legacy <connectivity_check> document one <connection> at a time."""
+    def __init__(self, stream: TextIO, kind: str = "all"):
+        super().__init__(stream, kind)
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.stream.write(f'<connectivity_check date="{date}"><{TCP_XML_CONTAINERS[kind]}>')
+
+    def _write_result(self, result: Dict[str, Any]) -> None:
+        self.stream.write(ET.tostring(tcp_xml_element(result), encoding="unicode"))
+
+    def _write_footer(self) -> None:
+        self.stream.write(f"</{TCP_XML_CONTAINERS[self.kind]}></connectivity_check>\n")
+
+def open_stream_writer(fmt: str, stream: TextIO, kind: str = "all", use_color: Optional[bool] = None) -> StreamWriter:
+    """Returns the incremental writer for an output format name."""
+    if fmt == "json":
+        return JsonStreamWriter(stream, kind)
+    elif fmt == "csv":
+        return CsvStreamWriter(stream, kind)
+    elif fmt == "xml":
+        return XmlStreamWriter(stream, kind)
+    else:
+        return TextStreamWriter(stream, kind, use_color=use_color)
+
+class BatchFileSinks:
+    """
+    Streams batch results into the dated result/fail/combined files.
+    Files are opened on first use so, as before, an empty success or failure
+    file is never created.
+    """
+    def __init__(self, fmt: str, res_filename: str, fail_filename: str, comb_filename: Optional[str] = None):
+        self.fmt = fmt
+        self.res_filename = res_filename
+        self.fail_filename = fail_filename
+        self.comb_filename = comb_filename
+        self._success: Optional[StreamWriter] = None
+        self._fail: Optional[StreamWriter] = None
+        self._combined: Optional[StreamWriter] = None
+        if comb_filename:
+            self._combined = self._open(comb_filename, "all")
+
+    def _open(self, filename: str, kind: str) -> StreamWriter:
+        return open_stream_writer(self.fmt, open(filename, "w"), kind, use_color=False)
+
+    @property
+    def success_count(self) -> int:
+        return self._success.count if self._success else 0
+
+    @property
+    def fail_count(self) -> int:
+        return self._fail.count if self._fail else 0
+
+    def write(self, result: Dict[str, Any]) -> None:
+        if result.get("success", False):
+            if self._success is None:
+                self._success = self._open(self.res_filename, "success")
+            self._success.write(result)
+        else:
+            if self._fail is None:
+                self._fail = self._open(self.fail_filename, "failed")
+            self._fail.write(result)
+        if self._combined:
+            self._combined.write(result)
+
+    def close(self) -> None:
+        for writer in (self._success, self._fail, self._combined):
+            if writer:
+                writer.close()
@@ -0,0 +1,141 @@
+import ipaddress
+import time
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+from netcheck.utils.pipeline import Deferred
+
+# Subnet a destination is paced with by --subnet-rate
+IPV4_SUBNET_PREFIX = 24
+IPV6_SUBNET_PREFIX = 64
+
+# Idle (full again) per-host/per-subnet buckets are dropped every this many admissions
+_PRUNE_INTERVAL = 4096
+
+class TokenBucket:
+    """
+    Rate limiter allowing `rate` events per second with bursts of up to `burst`.
+    reserve() books the next free slot and says how long to wait for it
+    (generic cell rate algorithm), so callers schedule work for later instead
+    of sleeping or polling.
+    """
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else 1.0)
+        self._interval = 1.0 / rate
+        self._tolerance = (self.burst - 1.0) * self._interval
+        self._tat = 0.0  # theoretical arrival time of the next event
+
+    def earliest(self, now: float) -> float:
+        """The first moment (>= now) a token is available, without taking it."""
+        return max(self._tat - self._tolerance, now)
+
+    def take(self, at: float) -> None:
+        """Takes one token for use at `at` (no earlier than earliest())."""
+        self._tat = max(self._tat, at) + self._interval
+
+    def idle(self, now: float) -> bool:
+        """True when the bucket is full again, i.e. indistinguishable from a new one."""
+        return self._tat <= now
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Takes one token; returns the seconds to wait before using it (0 for right away)."""
+        if now is None:
+            now = time.monotonic()
+        at = self.earliest(now)
+        self.take(at)
+        return at - now
+
+def subnet_of(address: str) -> Optional[Tuple[int, int]]:
+    """The /24 (IPv4) or /64 (IPv6) an IP address belongs to, as a hashable key; None for non-IPs."""
+    try:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+    except ValueError:
+        return None
+    if ip.version == 4:
+        return 4, int(ip) >> (32 - IPV4_SUBNET_PREFIX)
+    return 6, int(ip) >> (128 - IPV6_SUBNET_PREFIX)
+
+class ScanThrottle:
+    """
+    Admission control for a scan, used as a BoundedScheduler gate. Limits are
+    hierarchical and all optional: `pps` connects per second overall, and
+    per destination `host_rate` connects per second to one host,
+    `subnet_rate` to one /24 (IPv4) or /64 (IPv6), and at most `per_host`
+    checks of one host at a time. A check starts once every level it
+    belongs to has a token. A host or subnet that is over its rate is
+    deferred without holding an in-flight slot, so the rest of the scan
+    keeps going at full speed. Hostnames are placed in a subnet by their
+    first address in `addresses` (host -> IPs, e.g. from pre_resolve_hosts);
+    unknown names only get the host-level limits. Used from the scheduler's
+    thread only.
+    """
+    def __init__(self, pps: Optional[float] = None, per_host: Optional[int] = None,
+                 host_rate: Optional[float] = None, subnet_rate: Optional[float] = None):
+        self.pps = pps
+        self.per_host = per_host
+        self.host_rate = host_rate
+        self.subnet_rate = subnet_rate
+        self.addresses: Dict[str, List[str]] = {}
+        self._bucket = TokenBucket(pps, burst=max(1.0, pps / 10)) if pps else None
+        self._active: Dict[str, int] = {}
+        self._host_buckets: Dict[str, TokenBucket] = {}
+        self._subnet_buckets: Dict[Hashable, TokenBucket] = {}
+        self._admitted = 0
+
+    def subnet_key(self, host: str) -> Optional[Tuple[int, int]]:
+        """The subnet `host` is paced with (see subnet_of), or None if it has no known address."""
+        ips = self.addresses.get(host)
+        return subnet_of(ips[0] if ips else host)
+
+    @staticmethod
+    def _lane(table: Dict[Hashable, TokenBucket], key: Hashable, rate: float) -> TokenBucket:
+        bucket = table.get(key)
+        if bucket is None:
+            bucket = table[key] = TokenBucket(rate)
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        # A /16 sweep touches 65k hosts once each; keep only buckets still pacing someone
+        for table in (self._host_buckets, self._subnet_buckets):
+            for key in [k for k, b in table.items() if b.idle(now)]:
+                del table[key]
+
+    def admit(self, host: str) -> Union[float, Deferred, None]:
+        """
+        Seconds until a check of `host` may start; a Deferred while its host or
+        subnet is over its rate; None while the host is at its concurrency limit.
+        """
+        active = self._active.get(host, 0)
+        if self.per_host and active >= self.per_host:
+            return None
+        now = time.monotonic()
+        lanes = []
+        if self.host_rate:
+            lanes.append(self._lane(self._host_buckets, host, self.host_rate))
+        if self.subnet_rate:
+            subnet = self.subnet_key(host)
+            if subnet is not None:
+                lanes.append(self._lane(self._subnet_buckets, subnet, self.subnet_rate))
+        at = max([now] + [lane.earliest(now) for lane in lanes])
+        if at > now:
+            return Deferred(at - now)
+        if self._bucket is not None:
+            at = self._bucket.earliest(now)
+            self._bucket.take(at)
+        for lane in lanes:
+            lane.take(at)
+        self._active[host] = active + 1
+        self._admitted += 1
+        if self._admitted % _PRUNE_INTERVAL == 0:
+            self._prune(now)
+        return at - now
+
+    def release(self, host: str) -> None:
+        """A check admitted for `host` has finished."""
+        active = self._active.get(host, 0) - 1
+        if active > 0:
+            self._active[host] = active
+        else:
+            self._active.pop(host, None)
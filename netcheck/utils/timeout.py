@@ -1,23 +1,112 @@
+import threading
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
-from typing import Callable, TypeVar, Any
+from typing import Callable, TypeVar, Any, Dict, Optional
 
 T = TypeVar('T')
 
-# Global ThreadPoolExecutor for executing operations within timeout boundaries
-_timeout_executor = ThreadPoolExecutor(max_workers=200, thread_name_prefix="timeout_runner")
+class PoolSaturatedError(RuntimeError):
+    """Raised instead of queueing more work when every worker of a TimeoutPool is taken."""
+
+class TimeoutPool:
+    """
+    Thread pool for running blocking calls (getaddrinfo, gethostbyaddr) under a timeout.
+    A call that times out while still queued is cancelled, so it never occupies
+    a worker. A call that already started can't be interrupted; it is counted
+    as `stuck` until it returns. Once running + queued calls reach
+    max_workers + max_queue, new calls fail fast with PoolSaturatedError instead
+    of silently queueing behind stuck workers.
+    """
+    def __init__(self, max_workers: int = 200, max_queue: Optional[int] = None, name: str = "timeout_runner",
+                 label: str = "pool"):
+        self.max_workers = max_workers
+        self.max_queue = max_workers if max_queue is None else max_queue
+        self.label = label
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._running = 0
+        self._queued = 0
+        self._stuck = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the pool's saturation metrics."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._running,
+                "queued": self._queued,
+                "stuck": self._stuck,
+                "timed_out": self.timed_out,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+            }
+
+    def run(self, timeout: float, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Executes func(*args, **kwargs) on the pool and waits up to `timeout` seconds.
+        Raises concurrent.futures.TimeoutError if the timeout is exceeded and
+        PoolSaturatedError if the pool has no room left.
+        """
+        if timeout is None or timeout <= 0:
+            return func(*args, **kwargs)
+
+        with self._lock:
+            if self._running + self._queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturatedError(
+                    f"{self.label} saturated: {self._stuck} of {self.max_workers} workers stuck "
+                    f"on timed-out calls, {self._queued} calls queued"
+                )
+            self._queued += 1
+
+        state = {"finished": False, "abandoned": False}
+
+        def _call():
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    state["finished"] = True
+                    if state["abandoned"]:
+                        self._stuck -= 1
+
+        future = self._executor.submit(_call)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            with self._lock:
+                finished = state["finished"]
+                if not finished:
+                    self.timed_out += 1
+                    if future.cancel():
+                        # Never started: drop it from the queue instead of leaking a worker later
+                        self._queued -= 1
+                        self.cancelled += 1
+                    else:
+                        state["abandoned"] = True
+                        self._stuck += 1
+            if finished:
+                # Returned just as the wait expired
+                return future.result()
+            raise TimeoutError(f"Operation timed out after {timeout} seconds")
+
+# Global pool for executing operations within timeout boundaries
+_timeout_pool = TimeoutPool(max_workers=200, name="timeout_runner", label="resolver")
 
 def run_with_timeout(timeout: float, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
     """
     Executes func(*args, **kwargs) in a background thread and waits up to `timeout` seconds.
-    Raises concurrent.futures.TimeoutError if the timeout is exceeded.
+    Raises concurrent.futures.TimeoutError if the timeout is exceeded, and
+    PoolSaturatedError ("resolver saturated") when all workers are taken.
     """
-    if timeout is None or timeout <= 0:
-        return func(*args, **kwargs)
-        
-    future = _timeout_executor.submit(func, *args, **kwargs)
-    try:
-        return future.result(timeout=timeout)
-    except TimeoutError:
-        # Note: The background thread will continue to run until it completes,
-        # but control is returned to the caller immediately.
-        raise TimeoutError(f"Operation timed out after {timeout} seconds")
+    return _timeout_pool.run(timeout, func, *args, **kwargs)
+
+def timeout_pool_stats() -> Dict[str, int]:
+    """Saturation metrics of the shared run_with_timeout pool."""
+    return _timeout_pool.stats()
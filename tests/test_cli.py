@@ -1,8 +1,10 @@
 import io
 import sys
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 from netcheck.cli import main, print_help
+from netcheck.utils.scan_options import ScanOptions
 
 class TestNetCheckCLI(unittest.TestCase):
     
@@ -118,6 +120,49 @@ class TestNetCheckCLI(unittest.TestCase):
             self.assertEqual(cm.exception.code, 0)
             mock_exec.assert_called_once()
 
+    @patch('netcheck.cli.execute_concurrent_checks')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_quick_flag_async_engine(self, mock_stdout, mock_exec):
+        mock_exec.return_value = [
+            {"target": "localhost:80", "status": "SUCCESS", "success": True, "error": None}
+        ]
+        with patch('sys.argv', ['netcheck', '--quick', 'localhost', '80', '--engine', 'async']):
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 0)
+            args, kwargs = mock_exec.call_args
+            self.assertEqual(args[1].engine, "async")
+
+    @patch('netcheck.cli.iter_concurrent_checks')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_quick_flag_stream(self, mock_stdout, mock_iter):
+        mock_iter.return_value = iter([
+            (("localhost", 80), {"target": "localhost:80", "status": "SUCCESS", "success": True, "error": None, "metadata": {"host": "localhost", "port": 80}}),
+            (("localhost", 81), {"target": "localhost:81", "status": "FAILED", "success": False, "error": "refused", "metadata": {"host": "localhost", "port": 81}}),
+        ])
+        with patch('sys.argv', ['netcheck', '--quick', 'localhost', '80,81', '--stream', '-f', 'csv']):
+            with self.assertRaises(SystemExit) as cm:
+                main()
+            self.assertEqual(cm.exception.code, 1)
+        lines = mock_stdout.getvalue().splitlines()
+        self.assertEqual(lines[0], "Status,Host,Port,Method/Reason,Timestamp")
+        self.assertEqual(len(lines), 3)
+
+    @patch('netcheck.cli.execute_concurrent_checks')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_quick_test_accepts_lazy_range(self, mock_stdout, mock_exec):
+        from netcheck.cli import run_quick_test
+        from netcheck.utils.range_expanders import parse_ip_range
+        mock_exec.return_value = [
+            {"target": "10.0.0.1:22", "status": "SUCCESS", "success": True, "error": None}
+        ]
+        with self.assertRaises(SystemExit):
+            run_quick_test(parse_ip_range("10.0.0.0/16"), "22,80", ScanOptions(1.0, 10, 1, 0.0), "text", None)
+        args, kwargs = mock_exec.call_args
+        self.assertEqual(kwargs["total"], 65534 * 2)
+        # Targets are handed over as a lazy iterator, not a materialised list
+        self.assertNotIsInstance(args[0], list)
+
     @patch('netcheck.mcp.server.start_mcp_server')
     def test_mcp_flag(self, mock_start_mcp):
         with patch('sys.argv', ['netcheck', '--mcp']):
@@ -221,5 +266,340 @@ class TestNetCheckCLI(unittest.TestCase):
             self.assertEqual(cm.exception.code, 0)
             mock_get_interfaces.assert_called_once_with(all_interfaces=True)
 
+    @patch('netcheck.cli.atexit.register')
+    @patch('netcheck.cli.run_check_with_retry')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_stats_flag(self, mock_stdout, mock_run_retry, mock_register):
+        mock_run_retry.return_value = {"target": "google.com", "status": "SUCCESS", "success": True, "error": None, "metadata": {"ips": []}}
+        with patch('sys.argv', ['netcheck', 'dns', 'google.com', '--stats']):
+            with self.assertRaises(SystemExit):
+                main()
+        mock_register.assert_called_once()
+        from netcheck.cli import format_runtime_stats
+        report = format_runtime_stats()
+        self.assertIn("dns_cache:", report)
+        self.assertIn("hit rate", report)
+        self.assertIn("resolver pool:", report)
+
+    @patch('netcheck.cli.check_tcp_connect')
+    @patch('netcheck.cli.dns_lookup')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_batch_pre_resolves_hostnames(self, mock_stdout, mock_dns, mock_connect):
+        import os
+        import tempfile
+        mock_dns.side_effect = lambda host, timeout: (
+            {"success": True, "error": None, "metadata": {"ips": ["127.0.0.1"]}} if host == "good.test"
+            else {"success": False, "error": "Name or service not known", "metadata": {"ips": []}})
+        mock_connect.side_effect = lambda host, port, timeout, **kw: {
+            "target": f"{host}:{port}", "status": "SUCCESS", "success": True, "error": None, "latency_ms": 1.0,
+            "metadata": {"host": host, "port": port}}
+        with tempfile.TemporaryDirectory() as tmp:
+            batch = os.path.join(tmp, "hosts.txt")
+            with open(batch, "w") as f:
+                f.write("good.test 80,443\nbad.test 1-3\ngood.test 22\n10.0.0.1 22\n")
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                with patch('sys.argv', ['netcheck', '--resolve-jobs', '4', '-f', 'json', batch]):
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(cm.exception.code, 1)
+        # Each hostname is resolved once; IP literals are never looked up
+        self.assertEqual(sorted(c.args[0] for c in mock_dns.call_args_list), ["bad.test", "good.test"])
+        # Only resolvable targets take a connect slot
+        self.assertEqual(sorted((c.args[0], c.args[1]) for c in mock_connect.call_args_list),
+                         [("10.0.0.1", 22), ("good.test", 22), ("good.test", 80), ("good.test", 443)])
+        self.assertEqual(mock_stdout.getvalue().count("DNS Resolution failed: Name or service not known"), 3)
+
+    def test_interleave_spreads_lines_and_hosts(self):
+        from netcheck.cli import iter_interleaved_targets, iter_expanded_targets
+        lines = [("10.0.0.0/24", "22,80"), ("db.test", "5432"), ("10.0.1.1-2", "443")]
+        order = list(iter_interleaved_targets(lines))
+        self.assertEqual(sorted(order), sorted(iter_expanded_targets(lines)))
+        # The one-target line goes second, not after 512 checks of the /24
+        self.assertEqual(order[:5], [("10.0.0.1", 22), ("db.test", 5432), ("10.0.1.1", 443), ("10.0.0.2", 22), ("10.0.1.2", 443)])
+        # No host is checked twice in a row
+        self.assertTrue(all(a[0] != b[0] for a, b in zip(order, order[1:])))
+
+    def test_randomized_order_covers_all_lines_reproducibly(self):
+        from netcheck.cli import iter_randomized_targets, iter_expanded_targets
+        lines = [("10.0.0.0/24", "22,80"), ("db.test", "5432"), ("10.0.1.1-2", "443-445")]
+        order = list(iter_randomized_targets(lines, 99))
+        self.assertEqual(sorted(order), sorted(iter_expanded_targets(lines)))
+        self.assertEqual(order, list(iter_randomized_targets(lines, 99)))
+        self.assertNotEqual(order, list(iter_expanded_targets(lines)))
+
+    @patch('netcheck.cli.execute_concurrent_checks')
+    def test_randomize_reports_seed_and_shuffles_quick_scan(self, mock_exec):
+        mock_exec.return_value = [{"target": "10.0.0.1:80", "status": "SUCCESS", "success": True, "error": None}]
+        with patch('sys.argv', ['netcheck', 'tcp', '10.0.0.1-20', '1-50', '--randomize']), \
+                patch('sys.stdout', new_callable=io.StringIO), patch('sys.stderr', new_callable=io.StringIO) as mock_stderr:
+            with self.assertRaises(SystemExit):
+                main()
+        seed = int(mock_stderr.getvalue().split("--seed ")[1].split(")")[0])
+        from netcheck.cli import iter_randomized_targets
+        self.assertEqual(list(mock_exec.call_args[0][0]), list(iter_randomized_targets([("10.0.0.1-20", "1-50")], seed)))
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_resume_skips_checks_already_in_journal(self, mock_connect):
+        import json
+        import os
+        import tempfile
+        mock_connect.side_effect = lambda host, port, timeout, **kw: {
+            "target": f"{host}:{port}", "status": "SUCCESS", "success": True, "error": None, "latency_ms": 1.0,
+            "metadata": {"host": host, "port": port}}
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with open("targets.txt", "w") as f:
+                    f.write("10.0.0.1-4 80\n10.0.0.9 22,443\n")
+                with patch('sys.argv', ['netcheck', '--journal', 'scan.journal', '--interleave', '-f', 'json', 'targets.txt']), \
+                        patch('sys.stdout', new_callable=io.StringIO):
+                    with self.assertRaises(SystemExit):
+                        main()
+                self.assertEqual(mock_connect.call_count, 6)
+                # Keep the header and the first two results, as if the run had been killed there
+                with open("scan.journal") as f:
+                    kept = f.readlines()[:3]
+                with open("scan.journal", "w") as f:
+                    f.writelines(kept)
+                mock_connect.reset_mock()
+                with patch('sys.argv', ['netcheck', '--resume', 'scan.journal', '-f', 'json', 'targets.txt']), \
+                        patch('sys.stdout', new_callable=io.StringIO), patch('sys.stderr', new_callable=io.StringIO) as mock_stderr:
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+                with open(next(n for n in os.listdir(".") if n.startswith("result-"))) as f:
+                    written = json.load(f)
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(cm.exception.code, 0)
+        self.assertIn("2/6 checks already done", mock_stderr.getvalue())
+        # Only the four unfinished targets are connected; the output files still list all six
+        self.assertEqual(mock_connect.call_count, 4)
+        finished = {json.loads(line)["result"]["target"] for line in kept[1:]}
+        self.assertFalse(finished & {f"{c.args[0]}:{c.args[1]}" for c in mock_connect.call_args_list})
+        self.assertEqual(len(written["results"]), 6)
+
+    @patch('netcheck.cli.run_batch_targets')
+    def test_interleave_flag_reaches_batch_run(self, mock_batch):
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            batch = os.path.join(tmp, "targets.txt")
+            with open(batch, "w") as f:
+                f.write("10.0.0.1 80\n")
+            with patch('sys.argv', ['netcheck', '--interleave', batch]):
+                main()
+        self.assertTrue(mock_batch.call_args[1]["interleave"])
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_dedupe_endpoints_connects_once_per_endpoint(self, mock_connect):
+        from netcheck.cli import iter_concurrent_checks
+        mock_connect.side_effect = lambda host, port, timeout, **kw: {
+            "target": f"{host}:{port}", "status": "SUCCESS", "success": True, "error": None, "latency_ms": 1.0,
+            "metadata": {"host": host, "port": port, "ip": "127.0.0.1"}}
+        endpoints = {"web.test": ["127.0.0.1"], "alias.test": ["127.0.0.1"], "other.test": ["127.0.0.2"]}
+        targets = [("web.test", 80), ("alias.test", 80), ("127.0.0.1", 80), ("127.0.0.1", 443), ("other.test", 80)]
+        results = dict(iter_concurrent_checks(targets, ScanOptions(1.0, 2, 1, 0.0), endpoints=endpoints))
+        # web.test, alias.test and 127.0.0.1 share 127.0.0.1:80 and are connected once
+        self.assertEqual(mock_connect.call_count, 3)
+        self.assertEqual(set(results), set(targets))
+        copies = [r for r in results.values() if "deduplicated_from" in r["metadata"]]
+        self.assertEqual(len(copies), 2)
+        for res in copies:
+            self.assertTrue(res["success"])
+            self.assertEqual(res["target"], f"{res['metadata']['host']}:80")
+            self.assertIn(res["metadata"]["deduplicated_from"], ("web.test:80", "alias.test:80", "127.0.0.1:80"))
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_unresolved_hosts_keep_their_dns_error_class(self, mock_connect):
+        from netcheck.cli import iter_concurrent_checks
+        unresolved = {
+            "slow.test": {"success": False, "error": "DNS timeout", "metadata": {"error_class": "dns_timeout"}},
+            "gone.test": {"success": False, "error": "Name or service not known", "metadata": {}},
+        }
+        results = dict(iter_concurrent_checks([("slow.test", 80), ("gone.test", 80)], ScanOptions(1.0, 2, 3, 0.0), unresolved=unresolved))
+        mock_connect.assert_not_called()
+        self.assertEqual(results[("slow.test", 80)]["metadata"]["error_class"], "dns_timeout")
+        self.assertEqual(results[("gone.test", 80)]["metadata"]["error_class"], "dns_nxdomain")
+        self.assertEqual(results[("gone.test", 80)]["error"], "DNS Resolution failed: Name or service not known")
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_circuit_breaker_skips_down_host(self, mock_connect):
+        from netcheck.cli import iter_concurrent_checks
+        from netcheck.utils.circuit_breaker import HostCircuitBreaker
+        def fake_connect(host, port, timeout, **kw):
+            if host == "10.0.0.9":
+                return {"target": f"{host}:{port}", "status": "FAILED", "success": False, "latency_ms": 1000.0,
+                        "error": "All connection attempts failed: 10.0.0.9 (timed out)",
+                        "metadata": {"host": host, "port": port, "timed_out": True}}
+            return {"target": f"{host}:{port}", "status": "FAILED", "success": False, "latency_ms": 1.0,
+                    "error": "All connection attempts failed: 10.0.0.1 ([Errno 111] Connection refused)",
+                    "metadata": {"host": host, "port": port, "timed_out": False}}
+        mock_connect.side_effect = fake_connect
+        breaker = HostCircuitBreaker(threshold=3)
+        targets = [(h, p) for h in ("10.0.0.9", "10.0.0.1") for p in range(1, 11)]
+        results = list(iter_concurrent_checks(targets, ScanOptions(1.0, 1, 2, 0.0, breaker=breaker), window=1))
+        statuses = [res["status"] for (host, _), res in results if host == "10.0.0.9"]
+        self.assertEqual(statuses.count("FAILED"), 2)
+        self.assertEqual(statuses.count("SKIPPED_HOST_DOWN"), 8)
+        # A host that refuses connections is alive and is checked in full
+        self.assertTrue(all(res["status"] == "FAILED" for (host, _), res in results if host == "10.0.0.1"))
+        # Port 2 stopped retrying as soon as the third timeout opened the breaker
+        self.assertEqual(sum(1 for c in mock_connect.call_args_list if c.args[0] == "10.0.0.9"), 3)
+        self.assertEqual(breaker.skipped, 8)
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_retry_backoff_does_not_hold_worker(self, mock_connect):
+        from netcheck.cli import iter_concurrent_checks
+        attempts = {}
+        def fake_connect(host, port, timeout, **kw):
+            attempts[port] = attempts.get(port, 0) + 1
+            ok = port != 1 or attempts[port] == 3
+            return {"target": f"{host}:{port}", "status": "SUCCESS" if ok else "FAILED", "success": ok,
+                    "latency_ms": 1.0, "error": None if ok else "All connection attempts failed: 10.0.0.1 (timed out)",
+                    "metadata": {"host": host, "port": port}}
+        mock_connect.side_effect = fake_connect
+        targets = [("10.0.0.1", p) for p in range(1, 6)]
+        start = time.monotonic()
+        results = list(iter_concurrent_checks(targets, ScanOptions(1.0, 1, 3, 0.1, retry_backoff=2.0), window=1))
+        # Port 1 waits 0.1s then 0.2s between attempts while the single worker checks ports 2-5
+        self.assertEqual([p for (_, p), _ in results], [2, 3, 4, 5, 1])
+        self.assertTrue(all(res["success"] for _, res in results))
+        self.assertEqual(attempts[1], 3)
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_closed_ports_are_not_retried(self, mock_connect):
+        from netcheck.cli import iter_concurrent_checks
+        from netcheck.modules.tcp import new_tcp_result, mark_tcp_failure
+        def fake_connect(host, port, timeout, **kw):
+            reason = "(timed out)" if port == 2 else "([Errno 111] Connection refused)"
+            return mark_tcp_failure(new_tcp_result(host, port), [host], [f"{host} {reason}"], time.perf_counter())
+        mock_connect.side_effect = fake_connect
+        results = dict(iter_concurrent_checks([("10.0.0.1", p) for p in (1, 2, 3)], ScanOptions(1.0, 2, 3, 0.0)))
+        self.assertEqual({p: res["metadata"]["error_class"] for (_, p), res in results.items()},
+                         {1: "refused", 2: "timeout", 3: "refused"})
+        self.assertEqual([c.args[1] for c in mock_connect.call_args_list].count(2), 3)
+        self.assertEqual(mock_connect.call_count, 5)
+
+    def test_invalid_retry_on_is_rejected(self):
+        with patch('sys.argv', ['netcheck', '--retry-on', 'timeout,sometimes', '-q', '127.0.0.1', '80']), \
+             patch('sys.stderr', new_callable=io.StringIO) as err:
+            with self.assertRaises(SystemExit):
+                main()
+        self.assertIn("Unknown error class: sometimes", err.getvalue())
+
+    def test_invalid_dedupe_fp_rate_is_rejected(self):
+        for rate in ("0", "1", "1.5", "often"):
+            with patch('sys.argv', ['netcheck', '--dedupe', '--dedupe-fp-rate', rate, '-q', '127.0.0.1', '80']), \
+                 patch('sys.stderr', new_callable=io.StringIO) as err:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn("--dedupe-fp-rate", err.getvalue())
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_dedupe_progress_reaches_the_total(self, mock_connect):
+        from netcheck.cli import execute_concurrent_checks
+        from netcheck.utils.dedupe import DuplicateFilter, dedupe_targets
+        mock_connect.side_effect = lambda host, port, *a, **kw: {"target": f"{host}:{port}", "success": True, "status": "SUCCESS", "latency_ms": 1.0, "metadata": {}}
+        targets = [("10.0.0.1", p) for p in range(1, 9)] * 2
+        seen = DuplicateFilter()
+        with patch('sys.stdout', new_callable=io.StringIO) as out:
+            out.isatty = lambda: True
+            execute_concurrent_checks(dedupe_targets(iter(targets), seen), ScanOptions(1.0, 4, 1, 0.0), total=len(targets), seen=seen)
+        self.assertEqual(mock_connect.call_count, 8)
+        self.assertIn("Progress: 8/8 completed (100%)", out.getvalue())
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_auto_jobs_backs_off_when_timeouts_appear(self, mock_connect):
+        import threading
+        from netcheck.cli import iter_concurrent_checks
+        from netcheck.utils.concurrency import AIMDController
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+        def fake_connect(host, port, timeout, **kw):
+            # Stand-in for a firewall that drops SYNs beyond 12 concurrent connects
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                dropped = in_flight > 12
+            time.sleep(0.002)
+            with lock:
+                in_flight -= 1
+            if dropped:
+                return {"target": f"{host}:{port}", "status": "FAILED", "success": False, "latency_ms": 2.0,
+                        "error": "All connection attempts failed: 10.0.0.1 (timed out)",
+                        "metadata": {"host": host, "port": port, "error_class": "timeout"}}
+            return {"target": f"{host}:{port}", "status": "SUCCESS", "success": True, "latency_ms": 2.0,
+                    "error": None, "metadata": {"host": host, "port": port}}
+        mock_connect.side_effect = fake_connect
+        aimd = AIMDController(4, floor=2, ceiling=64)
+        results = list(iter_concurrent_checks([("10.0.0.1", p) for p in range(1, 801)], ScanOptions(1.0, 4, 1, 0.0, concurrency=aimd)))
+        self.assertEqual(len(results), 800)
+        self.assertGreaterEqual(aimd.decreases, 1)
+        self.assertLessEqual(peak, aimd.peak)
+        self.assertLessEqual(aimd.limit, 16)
+
+    @patch('netcheck.cli.execute_concurrent_checks')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_auto_jobs_reports_trajectory(self, mock_stdout, mock_exec):
+        mock_exec.return_value = [{"target": "localhost:80", "status": "SUCCESS", "success": True, "error": None}]
+        with patch('sys.argv', ['netcheck', '--quick', 'localhost', '80', '--auto-jobs', '--max-jobs', '64']), \
+             patch('sys.stderr', new_callable=io.StringIO) as err:
+            with self.assertRaises(SystemExit):
+                main()
+        controller = mock_exec.call_args[0][1].concurrency
+        self.assertEqual((controller.limit, controller.floor, controller.ceiling), (10, 4, 64))
+        self.assertIn("Concurrency (--auto-jobs 4-64): started at 10", err.getvalue())
+
+    @patch('netcheck.cli.execute_concurrent_checks')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_timing_profile_sets_defaults_that_flags_override(self, mock_stdout, mock_exec):
+        mock_exec.return_value = [{"target": "localhost:80", "status": "SUCCESS", "success": True, "error": None}]
+        with patch('sys.argv', ['netcheck', '--quick', 'localhost', '80', '--timing', 'polite', '-t', '3']):
+            with self.assertRaises(SystemExit):
+                main()
+        options = mock_exec.call_args[0][1]
+        self.assertEqual((options.timeout, options.jobs, options.retries, options.retry_delay), (3.0, 10, 2, 2.0))
+        self.assertEqual((options.throttle.pps, options.throttle.per_host), (20.0, 2))
+
+    @patch('netcheck.cli.execute_concurrent_checks')
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_host_and_subnet_rate_flags_build_throttle(self, mock_stdout, mock_exec):
+        mock_exec.return_value = [{"target": "10.0.0.1:80", "status": "SUCCESS", "success": True, "error": None}]
+        with patch('sys.argv', ['netcheck', 'tcp', '10.0.0.1', '1-100', '--host-rate', '5', '--subnet-rate', '50']):
+            with self.assertRaises(SystemExit):
+                main()
+        throttle = mock_exec.call_args[0][1].throttle
+        self.assertEqual((throttle.pps, throttle.host_rate, throttle.subnet_rate), (None, 5.0, 50.0))
+
+    @patch('netcheck.cli.check_tcp_connect')
+    def test_mcp_tcp_tool_honours_timing_profile(self, mock_connect):
+        import json
+        from netcheck.mcp.tools import call_tool
+        mock_connect.side_effect = lambda host, port, timeout, **kw: {
+            "target": f"{host}:{port}", "status": "SUCCESS", "success": True, "latency_ms": 1.0, "error": None,
+            "metadata": {"host": host, "port": port, "timeout": timeout}}
+        res = call_tool("check_tcp_connectivity", {"host": "10.0.0.1-2", "port": "80,443", "timing": "aggressive"})
+        rows = json.loads(res["content"][0]["text"])
+        self.assertEqual([r["target"] for r in rows], ["10.0.0.1:80", "10.0.0.1:443", "10.0.0.2:80", "10.0.0.2:443"])
+        self.assertTrue(all(r["metadata"]["timeout"] == 2.0 for r in rows))
+
+    @patch('netcheck.resolverd.server.UNIX_SOCKETS', False)
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_resolverd_reports_unsupported_platform(self, mock_stderr):
+        with patch('sys.argv', ['netcheck', 'resolverd']):
+            with self.assertRaises(SystemExit) as cm:
+                main()
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("not supported on this platform", mock_stderr.getvalue())
+
 if __name__ == '__main__':
     unittest.main()
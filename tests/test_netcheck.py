@@ -3,18 +3,35 @@ import socket
 import urllib.request
 import urllib.error
 import io
+import os
 from concurrent.futures import TimeoutError
 from unittest.mock import patch, MagicMock
 
 # Import our library modules
 from netcheck.utils.normalize import normalize_host, parse_line_to_raw_host_port
-from netcheck.utils.range_expanders import expand_ip_range, expand_port_range
-from netcheck.utils.cache import Cache
-from netcheck.utils.timeout import run_with_timeout
-from netcheck.utils.retry import with_retry, retry_call
+from netcheck.utils.range_expanders import expand_ip_range, expand_port_range, parse_ip_range, IPRange
+from netcheck.utils.cache import Cache, dns_cache
+from netcheck.utils.persistent_cache import PersistentCache
+from netcheck.utils.timeout import run_with_timeout, TimeoutPool, PoolSaturatedError
+from netcheck.utils.retry import with_retry, retry_call, backoff_delay, RetryPolicy
+from netcheck.utils.error_classes import classify_connect_errors, classify_exception, error_class
+from netcheck.utils.pipeline import BoundedScheduler, Deferred
+from netcheck.utils.dedupe import DuplicateFilter, dedupe_targets
+from netcheck.utils.circuit_breaker import HostCircuitBreaker
+from netcheck.utils.concurrency import AIMDController
+from netcheck.utils.throttle import TokenBucket, ScanThrottle, subnet_of
+from netcheck.utils.fair_queue import FairQueue
+from netcheck.utils.permutation import FeistelPermutation
+from netcheck.utils.journal import ScanJournal, targets_fingerprint
+from netcheck.utils.sinks import open_stream_writer, BatchFileSinks
+from netcheck.utils.happy_eyeballs import interleave_families, connect_first
+from netcheck.utils.deadline import Deadline, DeadlineExceeded
 from netcheck.cli import run_check_with_retry
-from netcheck.modules.dns import dns_lookup
+from netcheck.modules.dns import dns_lookup, set_resolver
+from netcheck.modules.resolver import StubResolver, parse_resolv_conf
+from netcheck.resolverd.client import ResolverdClient, set_resolverd
 from netcheck.modules.tcp import check_tcp_connect
+from netcheck.modules.async_tcp import AsyncCheckExecutor, async_check_tcp_connect, async_run_check_with_retry
 from netcheck.modules.http import check_http_status
 from netcheck.modules.ssl import check_ssl_certificate
 from netcheck.modules.ping import ping_host
@@ -44,6 +61,28 @@ class TestNetCheckUtilities(unittest.TestCase):
         # CIDR /30 has 2 usable host IPs
         self.assertEqual(expand_ip_range("192.168.1.0/30"), ["192.168.1.1", "192.168.1.2"])
 
+    def test_lazy_ip_range(self):
+        hosts = parse_ip_range("10.0.0.0/8")
+        self.assertIsInstance(hosts, IPRange)
+        self.assertEqual(len(hosts), 2 ** 24 - 2)
+        self.assertEqual(hosts[0], "10.0.0.1")
+        self.assertEqual(hosts[-1], "10.255.255.254")
+        self.assertEqual(list(hosts[9:12]), ["10.0.0.10", "10.0.0.11", "10.0.0.12"])
+        self.assertIn("10.1.2.3", hosts)
+        self.assertNotIn("11.0.0.1", hosts)
+        self.assertEqual(hosts.index("10.0.1.0"), 255)
+        self.assertEqual(parse_ip_range("192.168.1.1-3"), ["192.168.1.1", "192.168.1.2", "192.168.1.3"])
+        self.assertEqual(parse_ip_range("example.com"), ["example.com"])
+
+    def test_lazy_ipv6_range_beyond_len(self):
+        hosts = parse_ip_range("2001:db8::/64")
+        self.assertEqual(hosts.size, 2 ** 64 - 1)
+        self.assertEqual(hosts[0], "2001:db8::1")
+        self.assertEqual(hosts[-1], "2001:db8::ffff:ffff:ffff:ffff")
+        self.assertEqual(list(hosts[:2]), ["2001:db8::1", "2001:db8::2"])
+        with self.assertRaises(OverflowError):
+            len(hosts)
+
     def test_expand_port_range(self):
         self.assertEqual(expand_port_range("80"), [80])
         self.assertEqual(expand_port_range("80,443"), [80, 443])
@@ -58,6 +97,60 @@ class TestNetCheckUtilities(unittest.TestCase):
         time.sleep(0.15)
         self.assertIsNone(cache.get("key"))
 
+    def test_cache_lru_bound_and_stats(self):
+        cache = Cache(default_ttl=60.0, max_entries=4, shards=1)
+        for i in range(4):
+            cache.set(f"k{i}", i)
+        cache.get("k0")  # k0 is now most recently used, k1 the oldest
+        cache.set("k4", 4)
+        self.assertEqual(len(cache), 4)
+        self.assertIsNone(cache.get("k1"))
+        self.assertEqual(cache.get("k0"), 0)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1))
+        self.assertEqual(stats["hit_rate"], round(2 / 3, 4))
+
+        # Sharded caches keep the overall bound
+        sharded = Cache(max_entries=64, shards=8)
+        for i in range(1000):
+            sharded.set(str(i), i)
+        self.assertLessEqual(len(sharded), 64)
+
+    def test_cache_sweep_drops_unread_expired_entries(self):
+        import time
+        cache = Cache(default_ttl=0.05)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60.0)
+        time.sleep(0.1)
+        self.assertEqual(cache.sweep(), 1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_cache_single_flight(self):
+        import threading
+        import time
+        cache = Cache(default_ttl=60.0)
+        calls = []
+        def loader():
+            calls.append(1)
+            time.sleep(0.2)
+            return "loaded"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["loaded"] * 20)
+
+        # Uncacheable values are shared with concurrent waiters but not stored
+        cache.get_or_load("miss", lambda: None, should_cache=lambda v: v is not None)
+        self.assertIsNone(cache.get("miss"))
+        with self.assertRaises(ValueError):
+            cache.get_or_load("err", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
     def test_timeout_mechanism(self):
         def slow_func():
             import time
@@ -71,6 +164,38 @@ class TestNetCheckUtilities(unittest.TestCase):
         with self.assertRaises(TimeoutError):
             run_with_timeout(0.1, slow_func)
 
+    def test_timeout_pool_cancels_queued_work_and_fails_fast(self):
+        import threading
+        import time
+        release = threading.Event()
+        ran = []
+        pool = TimeoutPool(max_workers=1, max_queue=1, label="resolver")
+
+        with self.assertRaises(TimeoutError):
+            pool.run(0.1, release.wait)
+        # The only worker is stuck, so this call sits in the queue and is cancelled on timeout
+        with self.assertRaises(TimeoutError):
+            pool.run(0.1, lambda: ran.append(1))
+        stats = pool.stats()
+        self.assertEqual((stats["stuck"], stats["queued"], stats["cancelled"], stats["timed_out"]), (1, 0, 1, 2))
+
+        # With the worker stuck and the queue full, new calls are rejected immediately
+        blocker = threading.Thread(target=lambda: self.assertRaises(TimeoutError, pool.run, 0.5, ran.append, 2))
+        blocker.start()
+        time.sleep(0.05)
+        start = time.monotonic()
+        with self.assertRaises(PoolSaturatedError) as ctx:
+            pool.run(5.0, ran.append, 3)
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertIn("resolver saturated", str(ctx.exception))
+        blocker.join()
+
+        release.set()
+        time.sleep(0.05)
+        self.assertEqual(pool.stats()["stuck"], 0)
+        self.assertEqual(ran, [])
+        self.assertEqual(pool.stats()["rejected"], 1)
+
     def test_retry_mechanism(self):
         calls = 0
         @with_retry(retries=3, delay=0.01)
@@ -84,6 +209,101 @@ class TestNetCheckUtilities(unittest.TestCase):
         self.assertEqual(fail_twice(), "success")
         self.assertEqual(calls, 3)
 
+    def test_backoff_delay_grows_and_jitters(self):
+        self.assertEqual([backoff_delay(n, 0.5, 2.0) for n in (1, 2, 3)], [0.5, 1.0, 2.0])
+        waits = [backoff_delay(2, 1.0, 3.0, jitter=0.2) for _ in range(200)]
+        self.assertTrue(all(2.4 <= w <= 3.6 for w in waits))
+        self.assertGreater(len(set(waits)), 1)
+
+    def test_error_classes(self):
+        self.assertEqual(classify_connect_errors(["10.0.0.1 ([Errno 111] Connection refused)"]), "refused")
+        # One IP timing out outweighs another refusing: a retry may still get through
+        self.assertEqual(classify_connect_errors(["::1 ([Errno 111] Connection refused)", "10.0.0.1 (timed out)"]), "timeout")
+        self.assertEqual(classify_exception(ConnectionResetError(104, "reset")), "reset")
+        self.assertEqual(classify_exception(socket.gaierror(socket.EAI_NONAME, "Name or service not known")), "dns_nxdomain")
+        self.assertEqual(error_class({"success": False, "error": "DNS Resolution failed: [Errno -2] Name or service not known"}), "dns_nxdomain")
+        self.assertEqual(error_class({"success": False, "error": "x", "metadata": {"error_class": "tls_failure"}}), "tls_failure")
+        self.assertIsNone(error_class({"success": True}))
+
+    def test_retry_policy_retries_transient_classes_only(self):
+        attempts = []
+        def check(cls):
+            attempts.append(cls)
+            return {"success": False, "error": cls, "metadata": {"error_class": cls}}
+
+        for cls, expected in (("refused", 1), ("dns_nxdomain", 1), ("timeout", 4), ("unreachable", 2)):
+            attempts.clear()
+            run_check_with_retry(check, (cls,), retries=4, delay=0.0)
+            self.assertEqual(len(attempts), expected, cls)
+
+        policy = RetryPolicy.parse("refused=3,timeout")
+        self.assertEqual(policy.limits, {"refused": 3, "timeout": None})
+        attempts.clear()
+        run_check_with_retry(check, ("refused",), retries=5, delay=0.0, policy=policy)
+        self.assertEqual(len(attempts), 3)
+        self.assertTrue(RetryPolicy.parse("all").should_retry({"success": False, "error": "refused"}, 1))
+        self.assertFalse(RetryPolicy.parse("none").should_retry({"success": False, "error": "timed out"}, 1))
+        with self.assertRaises(ValueError):
+            RetryPolicy.parse("timeout,bogus")
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "netcheck", "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_store_round_trip_and_expiry(self):
+        store = PersistentCache(self.path)
+        store.set("dns", "example.com", {"ips": ["192.0.2.1"]}, ttl=60)
+        store.set("dns", "old.example", {"ips": []}, ttl=-1)
+        value, remaining = store.get("dns", "example.com")
+        self.assertEqual(value, {"ips": ["192.0.2.1"]})
+        self.assertTrue(0 < remaining <= 60)
+        self.assertIsNone(store.get("dns", "old.example"))
+        self.assertIsNone(store.get("rdns", "example.com"))
+        self.assertEqual(store.purge_expired(), 1)
+        store.close()
+
+    def test_corrupt_rows_are_misses(self):
+        store = PersistentCache(self.path)
+        store.set("dns", "good.example", ["192.0.2.1"], ttl=60)
+        store.set("dns", "torn.example", ["192.0.2.2"], ttl=60)
+        store.set("dns", "torn2.example", ["192.0.2.3"], ttl=60)
+        store._conn.execute("UPDATE entries SET value = '[\"192.0.2' WHERE key LIKE 'torn%'")
+        self.assertIsNone(store.get("dns", "torn.example"))
+        self.assertEqual([key for key, _, _ in store.items("dns")], ["good.example"])
+        # Both were deleted, so they are stored afresh on the next write
+        self.assertEqual(store._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0], 1)
+        store.close()
+
+    def test_caches_share_entries_across_processes(self):
+        # Two Cache/PersistentCache pairs stand in for two netcheck processes
+        first, second = PersistentCache(self.path), PersistentCache(self.path)
+        writer, reader = Cache(), Cache()
+        writer.attach_store(first, "dns")
+        writer.set("warm.example", "192.0.2.1", ttl=60)
+
+        self.assertEqual(reader.attach_store(second, "dns"), 1)
+        self.assertEqual(reader.get("warm.example"), "192.0.2.1")
+
+        # Written after warming: plain reads stay in memory, but a load checks the store first
+        writer.set("late.example", "192.0.2.2", ttl=60)
+        with patch.object(second, "get", wraps=second.get) as store_get:
+            self.assertIsNone(reader.get("late.example"))
+            self.assertIsNone(reader.get_negative("late.example"))
+            self.assertEqual(store_get.call_count, 0)
+            loader = MagicMock(return_value="192.0.2.99")
+            self.assertEqual(reader.get_or_load("late.example", loader), "192.0.2.2")
+            self.assertEqual(reader.get_or_load("late.example", loader), "192.0.2.2")
+            self.assertEqual(store_get.call_count, 1)
+        loader.assert_not_called()
+        self.assertEqual(reader.stats()["hits"], 3)
+        first.close()
+        second.close()
+
 class TestNetCheckModules(unittest.TestCase):
     @patch("socket.getaddrinfo")
     def test_dns_lookup_success(self, mock_getaddrinfo):
@@ -103,6 +323,74 @@ class TestNetCheckModules(unittest.TestCase):
         self.assertFalse(res["success"])
         self.assertEqual(res["status"], "FAILED")
 
+    @patch("socket.gethostbyaddr", side_effect=socket.herror("no PTR"))
+    @patch("socket.getaddrinfo")
+    def test_dns_lookup_coalesces_concurrent_misses(self, mock_getaddrinfo, _mock_rev):
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        def slow_resolve(*args):
+            time.sleep(0.2)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.35", 0))]
+        mock_getaddrinfo.side_effect = slow_resolve
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: dns_lookup("coalesce.example"), range(16)))
+        self.assertEqual(mock_getaddrinfo.call_count, 1)
+        self.assertTrue(all(r["success"] and r["metadata"]["ips"] == ["93.184.216.35"] for r in results))
+
+    @patch("netcheck.modules.tcp.connect_first")
+    @patch("socket.gethostbyaddr")
+    def test_reverse_dns_is_opt_in(self, mock_rev, mock_connect):
+        mock_rev.return_value = ("ptr.example", ["alias.example"], ["198.51.100.7"])
+        mock_connect.return_value = (None, None, ["198.51.100.7: [Errno 111] Connection refused"])
+        res = dns_lookup("198.51.100.7")
+        self.assertIsNone(res["metadata"]["reverse_dns"])
+        check_tcp_connect("198.51.100.7", 9, 0.2)
+        mock_connect.assert_called_once()
+        mock_rev.assert_not_called()
+
+        for _ in range(3):
+            res = dns_lookup("198.51.100.7", reverse=True)
+            self.assertEqual(res["metadata"]["reverse_dns"], "ptr.example")
+        # PTR answers have their own cache
+        self.assertEqual(mock_rev.call_count, 1)
+
+    @patch("socket.getaddrinfo")
+    def test_dns_negative_cache(self, mock_getaddrinfo):
+        mock_getaddrinfo.side_effect = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        first = dns_lookup("nxdomain.invalid")
+        second = dns_lookup("nxdomain.invalid")
+        self.assertEqual(mock_getaddrinfo.call_count, 1)
+        self.assertFalse(second["success"])
+        self.assertEqual(second["error"], first["error"])
+        self.assertTrue(second["metadata"]["cached"])
+        self.assertNotIn("cached", first["metadata"])
+
+        # Resolver failures (SERVFAIL) use their own, shorter TTL
+        cache = Cache(negative_ttls={"nxdomain": 300.0, "servfail": 0.05})
+        cache.set_negative("a", "nx", "nxdomain")
+        cache.set_negative("b", "sf", "servfail")
+        import time
+        time.sleep(0.1)
+        self.assertEqual(cache.get_negative("a"), "nx")
+        self.assertIsNone(cache.get_negative("b"))
+
+    @patch("socket.getaddrinfo")
+    def test_dns_servfail_and_timeouts_are_negatively_cached(self, mock_getaddrinfo):
+        import time
+        def resolver(host, *args):
+            if host == "servfail.example":
+                raise socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")
+            time.sleep(0.5)
+        mock_getaddrinfo.side_effect = resolver
+        # Looked up under a generous outer budget, as TCP and SSL checks do
+        for _ in range(2):
+            dns_lookup("servfail.example", timeout=1.0, deadline=Deadline(10.0))
+            slow = dns_lookup("timeout.example", timeout=0.1, deadline=Deadline(10.0))
+        self.assertEqual(mock_getaddrinfo.call_count, 2)
+        self.assertTrue(slow["metadata"]["cached"])
+        self.assertEqual(slow["metadata"]["error_class"], "dns_timeout")
+
     @patch("socket.socket")
     @patch("netcheck.modules.tcp.dns_lookup")
     def test_tcp_connect_success(self, mock_dns, mock_socket):
@@ -145,6 +433,636 @@ class TestNetCheckModules(unittest.TestCase):
         self.assertIn("primary_ip", res["metadata"])
         self.assertIn("interfaces", res["metadata"])
 
+class TestAsyncEngine(unittest.TestCase):
+    def setUp(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(128)
+        self.open_port = self.listener.getsockname()[1]
+        # Grab a port that is guaranteed closed by binding and releasing it
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(("127.0.0.1", 0))
+        self.closed_port = probe.getsockname()[1]
+        probe.close()
+
+    def tearDown(self):
+        self.listener.close()
+
+    def test_async_connect_matches_sync_result_shape(self):
+        import asyncio
+        res = asyncio.run(async_check_tcp_connect("127.0.0.1", self.open_port, 2.0))
+        self.assertTrue(res["success"])
+        self.assertEqual(res["status"], "SUCCESS")
+        self.assertEqual(res["target"], f"127.0.0.1:{self.open_port}")
+        self.assertEqual(set(res["metadata"]), set(check_tcp_connect("127.0.0.1", self.open_port, 2.0)["metadata"]))
+
+        res = asyncio.run(async_check_tcp_connect("127.0.0.1", self.closed_port, 2.0))
+        self.assertFalse(res["success"])
+        self.assertIn("All connection attempts failed", res["error"])
+
+    def test_async_executor_runs_many_checks(self):
+        with AsyncCheckExecutor(max_in_flight=50) as executor:
+            futures = [
+                executor.submit(async_run_check_with_retry, async_check_tcp_connect, args=("127.0.0.1", self.open_port, 2.0))
+                for _ in range(100)
+            ]
+            results = [f.result(timeout=10) for f in futures]
+        self.assertTrue(all(r["success"] for r in results))
+
+class TestHappyEyeballs(unittest.TestCase):
+    # RFC 5737 TEST-NET-1: never answers, so a connect either hangs or fails fast
+    DEAD_IP = "192.0.2.1"
+
+    def setUp(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.port = self.listener.getsockname()[1]
+
+    def tearDown(self):
+        self.listener.close()
+
+    def test_interleave_families(self):
+        ips = ["10.0.0.1", "10.0.0.2", "2001:db8::1", "2001:db8::2", "10.0.0.3"]
+        self.assertEqual(interleave_families(ips), ["2001:db8::1", "10.0.0.1", "2001:db8::2", "10.0.0.2", "10.0.0.3"])
+
+    def test_dead_first_address_does_not_cost_full_timeout(self):
+        import time
+        start = time.monotonic()
+        sock, ip, errors = connect_first([self.DEAD_IP, "127.0.0.1"], self.port, 3.0)
+        elapsed = time.monotonic() - start
+        self.assertIsNotNone(sock)
+        sock.close()
+        self.assertEqual(ip, "127.0.0.1")
+        self.assertLess(elapsed, 1.5)
+
+    @patch("netcheck.modules.tcp.dns_lookup")
+    def test_tcp_and_async_checks_race(self, mock_dns):
+        import asyncio
+        import time
+        mock_dns.return_value = {"success": True, "metadata": {"ips": [self.DEAD_IP, "127.0.0.1"]}}
+        start = time.monotonic()
+        res = check_tcp_connect("dual.example", self.port, 3.0)
+        self.assertTrue(res["success"])
+        self.assertEqual(res["metadata"]["ip"], "127.0.0.1")
+
+        with patch("netcheck.modules.async_tcp.dns_lookup", mock_dns):
+            res = asyncio.run(async_check_tcp_connect("dual.example", self.port, 3.0))
+        self.assertTrue(res["success"])
+        self.assertLess(time.monotonic() - start, 3.0)
+
+class TestDeadlineBudget(unittest.TestCase):
+    def test_child_deadline_never_outlives_parent(self):
+        parent = Deadline(0.5)
+        child = Deadline(10.0, parent=parent)
+        self.assertLessEqual(child.remaining(), 0.5)
+        self.assertEqual(Deadline(0.0).remaining(), 0.0)
+        with self.assertRaises(DeadlineExceeded):
+            Deadline(0.0).check("connect")
+
+    @patch("socket.getaddrinfo")
+    def test_dns_lookup_only_gets_remaining_budget(self, mock_getaddrinfo):
+        import time
+        mock_getaddrinfo.side_effect = lambda *a: time.sleep(1.0)
+        start = time.monotonic()
+        res = dns_lookup("slow.example", timeout=5.0, deadline=Deadline(0.2))
+        self.assertFalse(res["success"])
+        self.assertLess(time.monotonic() - start, 0.8)
+        # A timeout caused by the caller's short budget is not negatively cached
+        self.assertIsNone(dns_cache.get_negative("slow.example"))
+
+    @patch("netcheck.modules.tcp.dns_lookup")
+    def test_tcp_check_stops_when_dns_used_the_budget(self, mock_dns):
+        mock_dns.return_value = {"success": True, "metadata": {"ips": ["127.0.0.1"]}}
+        res = check_tcp_connect("spent.example", 80, 2.0, deadline=Deadline(0.0))
+        self.assertFalse(res["success"])
+        self.assertIn("Deadline", res["error"])
+
+    def test_retry_budget_caps_attempts(self):
+        seen = []
+        def failing_check(host, deadline=None):
+            seen.append(deadline)
+            return {"success": False, "error": "timed out"}
+
+        res = run_check_with_retry(failing_check, ("h",), retries=10, delay=0.2, budget=0.5)
+        self.assertFalse(res["success"])
+        self.assertLessEqual(len(seen), 3)
+        self.assertTrue(all(d is seen[0] and d is not None for d in seen))
+
+        # Checks that don't take a deadline keep their signature untouched
+        calls = []
+        run_check_with_retry(lambda host: calls.append(host) or {"success": True}, ("h",), budget=1.0)
+        self.assertEqual(calls, ["h"])
+
+class LocalStubDNSServer:
+    """Tiny authoritative DNS server on 127.0.0.1 (UDP + TCP on one port) for resolver tests."""
+    def __init__(self):
+        import threading
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind(("127.0.0.1", 0))
+        self.port = self.udp.getsockname()[1]
+        self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp.bind(("127.0.0.1", self.port))
+        self.tcp.listen(8)
+        self.queries = 0
+        for target in (self._serve_udp, self._serve_tcp):
+            threading.Thread(target=target, daemon=True).start()
+
+    def close(self):
+        self.udp.close()
+        self.tcp.close()
+
+    @staticmethod
+    def _record(rtype, ttl, rdata):
+        import struct
+        return b"\xc0\x0c" + struct.pack("!HHIH", rtype, 1, ttl, len(rdata)) + rdata
+
+    def _answer(self, query, over_tcp):
+        import struct
+        qid = struct.unpack("!H", query[:2])[0]
+        offset, labels = 12, []
+        while query[offset]:
+            labels.append(query[offset + 1:offset + 1 + query[offset]].decode())
+            offset += 1 + query[offset]
+        question = query[12:offset + 5]
+        qtype = struct.unpack("!H", query[offset + 1:offset + 3])[0]
+        name = ".".join(labels)
+
+        flags, records = 0x8180, []
+        if name == "fail.test":
+            flags |= 2
+        elif name in ("big.test", "spoof.test") and not over_tcp:
+            flags |= 0x0200
+        elif name == "spoof.test":
+            # An answer to a different question than the one asked
+            question = b"\x01a\x04test\x00" + struct.pack("!HH", qtype, 1)
+            if qtype == 1:
+                records.append(self._record(1, 60, socket.inet_aton("192.0.2.99")))
+        elif name in ("a.test", "big.test", "short.test", "cname.test") or name.startswith("h"):
+            if qtype == 1:
+                ttl = {"short.test": 1, "big.test": 60}.get(name, 120)
+                if name == "cname.test":
+                    target = b"\x01a\x04test\x00"
+                    records.append(self._record(5, 30, target))
+                records.append(self._record(1, ttl, socket.inet_aton("192.0.2.%d" % (len(name) % 250))))
+        else:
+            flags |= 3
+        return struct.pack("!HHHHHH", qid, flags, 1, len(records), 0, 0) + question + b"".join(records)
+
+    def _serve_udp(self):
+        while True:
+            try:
+                data, addr = self.udp.recvfrom(512)
+            except OSError:
+                return
+            self.queries += 1
+            self.udp.sendto(self._answer(data, False), addr)
+
+    def _serve_tcp(self):
+        import struct
+        while True:
+            try:
+                conn, _ = self.tcp.accept()
+            except OSError:
+                return
+            with conn:
+                length = struct.unpack("!H", conn.recv(2))[0]
+                reply = self._answer(conn.recv(length), True)
+                conn.sendall(struct.pack("!H", len(reply)) + reply)
+
+class TestStubResolver(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalStubDNSServer()
+        self.resolver = StubResolver(["127.0.0.1"], port=self.server.port, attempt_timeout=1.0,
+                                     hosts={"pinned.test": ["203.0.113.9"]})
+
+    def tearDown(self):
+        self.resolver.close()
+        self.server.close()
+        set_resolver("system")
+
+    def test_answers_carry_record_ttls(self):
+        self.assertEqual(self.resolver.resolve("a.test"), (["192.0.2.6"], 120.0))
+        # CNAME chains report the smallest TTL along the chain
+        self.assertEqual(self.resolver.resolve("cname.test"), (["192.0.2.10"], 30.0))
+        self.assertEqual(self.resolver.resolve("pinned.test"), (["203.0.113.9"], None))
+
+    def test_truncated_answer_falls_back_to_tcp(self):
+        self.assertEqual(self.resolver.resolve("big.test"), (["192.0.2.8"], 60.0))
+
+    def test_tcp_answer_to_another_question_is_ignored(self):
+        with self.assertRaises((TimeoutError, socket.gaierror)):
+            self.resolver.resolve("spoof.test", 2.0)
+
+    def test_in_flight_queries_are_capped(self):
+        with patch("netcheck.modules.resolver.MAX_PENDING_QUERIES", 2):
+            sent = [self.resolver._send("127.0.0.1", "h%d.test" % i, 1) for i in range(3)]
+        with self.assertRaises(OSError):
+            sent[2][1].result(timeout=0)
+        self.assertEqual(len({qid for qid, _ in sent[:2]}), 2)
+
+    def test_failures_map_to_getaddrinfo_errors(self):
+        with self.assertRaises(socket.gaierror) as nx:
+            self.resolver.resolve("missing.test")
+        self.assertEqual(nx.exception.errno, socket.EAI_NONAME)
+        with self.assertRaises(socket.gaierror) as servfail:
+            self.resolver.resolve("fail.test")
+        self.assertEqual(servfail.exception.errno, socket.EAI_AGAIN)
+
+    def test_many_pipelined_queries_share_one_socket(self):
+        from concurrent.futures import ThreadPoolExecutor
+        import threading
+        names = ["h%d.test" % i for i in range(300)]
+        with ThreadPoolExecutor(max_workers=100) as pool:
+            answers = list(pool.map(lambda n: self.resolver.resolve(n, 5.0)[0], names))
+        self.assertTrue(all(len(a) == 1 for a in answers))
+        self.assertEqual(len(self.resolver._sockets), 1)
+        self.assertEqual(len([t for t in threading.enumerate() if t.name == "stub_resolver"]), 1)
+
+    def test_dns_lookup_uses_builtin_resolver_and_ttl(self):
+        import time
+        set_resolver("builtin", self.resolver)
+        res = dns_lookup("short.test")
+        self.assertTrue(res["success"])
+        self.assertEqual(res["metadata"]["ips"], ["192.0.2.10"])
+        self.assertIsNotNone(dns_cache.get("short.test"))
+        time.sleep(1.1)
+        self.assertIsNone(dns_cache.get("short.test"))
+
+    def test_parse_resolv_conf(self):
+        import tempfile
+        import os
+        with tempfile.NamedTemporaryFile("w", suffix=".conf", delete=False) as f:
+            f.write("# comment\nnameserver 10.0.0.53\nnameserver 2001:db8::53\nsearch corp.example lab.example\noptions ndots:2 timeout:3 attempts:4\n")
+        try:
+            conf = parse_resolv_conf(f.name)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(conf["nameservers"], ["10.0.0.53", "2001:db8::53"])
+        self.assertEqual(conf["search"], ["corp.example", "lab.example"])
+        self.assertEqual((conf["ndots"], conf["timeout"], conf["attempts"]), (2, 3.0, 4))
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "resolverd needs Unix domain sockets")
+class TestResolverDaemon(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        import threading
+        from netcheck.resolverd.server import ResolverDaemon
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dns = LocalStubDNSServer()
+        self.resolver = StubResolver(["127.0.0.1"], port=self.dns.port, attempt_timeout=1.0)
+        set_resolver("builtin", self.resolver)
+        self.daemon = ResolverDaemon(os.path.join(self.tmp.name, "resolverd.sock"), workers=4)
+        self.daemon.start()
+        threading.Thread(target=self.daemon.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.daemon.shutdown()
+        self.resolver.close()
+        self.dns.close()
+        self.tmp.cleanup()
+        set_resolver("system")
+        set_resolverd(True)
+
+    def test_clients_share_the_daemon_cache(self):
+        dns_cache.clear()
+        first, second = ResolverdClient(self.daemon.path), ResolverdClient(self.daemon.path)
+        a = first.lookup("hdaemon.test", 2.0)
+        b = second.lookup("hdaemon.test", 2.0)
+        self.assertEqual(a["metadata"]["ips"], ["192.0.2.12"])
+        self.assertEqual(b["metadata"]["ips"], ["192.0.2.12"])
+        self.assertEqual(self.dns.queries, 2)  # one A + AAAA resolution for both clients
+        self.assertGreaterEqual(first.call("stats", 2.0)["dns_cache"]["hits"], 1)
+        first.close()
+        second.close()
+
+    def test_lookup_waits_no_longer_than_its_timeout(self):
+        import socket
+        import time
+        # A daemon that accepts requests but never answers
+        silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        silent.bind(os.path.join(self.tmp.name, "silent.sock"))
+        silent.listen(1)
+        client = ResolverdClient(os.path.join(self.tmp.name, "silent.sock"))
+        start = time.monotonic()
+        self.assertIsNone(client.lookup("hslow.test", 0.2))
+        self.assertLess(time.monotonic() - start, 0.4)
+        client.close()
+        silent.close()
+
+    def test_socket_directory_must_be_private(self):
+        from netcheck.resolverd.server import ResolverDaemon
+        shared = os.path.join(self.tmp.name, "shared")
+        os.mkdir(shared)
+        os.chmod(shared, 0o755)
+        with self.assertRaises(OSError):
+            ResolverDaemon(os.path.join(shared, "resolverd.sock")).start()
+        # A symlink to a private directory is refused too
+        link = os.path.join(self.tmp.name, "link")
+        os.symlink(self.tmp.name, link)
+        with self.assertRaises(OSError):
+            ResolverDaemon(os.path.join(link, "resolverd.sock")).start()
+        # Clients do not connect through either, even to a live daemon
+        os.symlink(self.daemon.path, os.path.join(shared, "resolverd.sock"))
+        self.assertIsNone(ResolverdClient(os.path.join(shared, "resolverd.sock")).lookup("hdaemon.test", 1.0))
+        self.assertIsNone(ResolverdClient(os.path.join(link, "resolverd.sock")).lookup("hdaemon.test", 1.0))
+
+    def test_dns_lookup_falls_back_without_daemon(self):
+        set_resolverd(True, os.path.join(self.tmp.name, "missing.sock"))
+        res = dns_lookup("hlocal.test", timeout=2.0)
+        self.assertTrue(res["success"])
+        self.assertEqual(res["metadata"]["ips"], ["192.0.2.11"])
+
+class TestDuplicateFilter(unittest.TestCase):
+    def test_dedupe_targets_is_exact_for_small_inputs(self):
+        seen = DuplicateFilter()
+        targets = [("a.test", 80), ("A.test", "80"), ("a.test", 443), ("10.0.0.1", 22), ("a.test", 80)]
+        self.assertEqual(list(dedupe_targets(iter(targets), seen)), [("a.test", 80), ("a.test", 443), ("10.0.0.1", 22)])
+        self.assertEqual(seen.duplicates, 2)
+        self.assertTrue(seen.exact)
+
+    def test_switches_to_bloom_filter_within_fp_rate(self):
+        seen = DuplicateFilter(fp_rate=0.01, exact_limit=500)
+        false_duplicates = sum(seen.seen(f"host{i}:80") for i in range(20000))
+        self.assertFalse(seen.exact)
+        self.assertLess(false_duplicates, 20000 * 0.01 * 1.5)
+        # Bloom filters never forget a key
+        self.assertTrue(all(seen.seen(f"host{i}:80") for i in range(0, 20000, 7)))
+        self.assertLess(seen.memory_bytes(), 20000 * 4)
+
+class TestStreamingPipeline(unittest.TestCase):
+    def test_bounded_scheduler_deferred_host_does_not_starve_others(self):
+        from concurrent.futures import ThreadPoolExecutor
+        import time
+        # One slow-paced host with many targets ahead of a fast one
+        throttle = ScanThrottle(host_rate=20.0)
+        fast_rate = ScanThrottle()
+        items = [("slow", i) for i in range(6)] + [("fast", i) for i in range(30)]
+        started = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            scheduler = BoundedScheduler(lambda item: executor.submit(lambda: item), window=4,
+                                         gate=lambda item: throttle.admit(item[0]) if item[0] == "slow" else fast_rate.admit(item[0]),
+                                         release=lambda item: (throttle if item[0] == "slow" else fast_rate).release(item[0]))
+            start = time.monotonic()
+            for item, _ in scheduler.run(items):
+                started[item] = time.monotonic() - start
+        self.assertEqual(sorted(started), sorted(items))
+        # The fast host finished while the slow one was still being paced at 20/s
+        self.assertLess(max(t for (h, _), t in started.items() if h == "fast"), 0.1)
+        self.assertGreaterEqual(max(t for (h, _), t in started.items() if h == "slow"), 0.24)
+
+    def test_bounded_scheduler_gate_limits_per_host_without_sleeping_workers(self):
+        from concurrent.futures import ThreadPoolExecutor
+        import threading
+        import time
+        lock = threading.Lock()
+        running = {}
+        peaks = {}
+
+        def work(item):
+            host = item[0]
+            with lock:
+                running[host] = running.get(host, 0) + 1
+                peaks[host] = max(peaks.get(host, 0), running[host])
+            time.sleep(0.005)
+            with lock:
+                running[host] -= 1
+            return item
+
+        throttle = ScanThrottle(pps=400, per_host=1)
+        items = [("a", i) for i in range(20)] + [("b", i) for i in range(20)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            scheduler = BoundedScheduler(lambda item: executor.submit(work, item), window=8,
+                                         gate=lambda item: throttle.admit(item[0]),
+                                         release=lambda item: throttle.release(item[0]))
+            start = time.monotonic()
+            done = [item for item, _ in scheduler.run(items)]
+            elapsed = time.monotonic() - start
+        self.assertEqual(sorted(done), sorted(items))
+        self.assertEqual(peaks, {"a": 1, "b": 1})
+        # 40 starts at 400/s (burst 40) are not held back much, but never faster than the bucket
+        self.assertGreaterEqual(elapsed, 0.05)
+
+    def test_bounded_scheduler_applies_backpressure(self):
+        from concurrent.futures import ThreadPoolExecutor
+        import threading
+        pulled = 0
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def source():
+            nonlocal pulled
+            for i in range(200):
+                pulled += 1
+                yield i
+
+        def work(i):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            with lock:
+                in_flight -= 1
+            return i * 2
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            scheduler = BoundedScheduler(lambda i: executor.submit(work, i), window=8)
+            seen = []
+            for item, fut in scheduler.run(source()):
+                # The source is never more than one window ahead of the consumer
+                self.assertLessEqual(pulled - len(seen), 8)
+                seen.append(fut.result())
+        self.assertEqual(sorted(seen), [i * 2 for i in range(200)])
+        self.assertLessEqual(peak, 4)
+
+    def test_bounded_scheduler_runs_fresh_items_during_retry_delay(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            scheduler = BoundedScheduler(lambda i: executor.submit(lambda: i), window=1)
+            order = []
+            for item, fut in scheduler.run(iter(["a", "b", "c"])):
+                order.append(item)
+                if item == "a":
+                    scheduler.retry_later("a-retry", 0.1)
+        # The retry waited on the delay heap, not in the only worker slot
+        self.assertEqual(order, ["a", "b", "c", "a-retry"])
+
+    def test_stream_writers_match_batch_formatters(self):
+        from netcheck.utils.formatters import format_json, format_csv, format_xml
+        import json
+        import xml.etree.ElementTree as ET
+        results = [
+            {"target": "a:80", "success": True, "status": "SUCCESS", "latency_ms": 1.0, "metadata": {"host": "a", "port": 80}},
+            {"target": "b:81", "success": False, "status": "FAILED", "latency_ms": None, "error": "refused", "metadata": {"host": "b", "port": 81}},
+        ]
+
+        class KeepOpen(io.StringIO):
+            def close(self):
+                pass
+
+        outputs = {}
+        for fmt in ("json", "csv", "xml"):
+            buf = KeepOpen()
+            writer = open_stream_writer(fmt, buf, "all")
+            for r in results:
+                writer.write(r)
+            writer.close()
+            outputs[fmt] = buf.getvalue()
+
+        streamed = json.loads(outputs["json"])["all_results"]
+        batch = json.loads(format_json(results))["all_results"]
+        strip_ts = lambda rows: [{k: v for k, v in row.items() if k != "timestamp"} for row in rows]
+        self.assertEqual(strip_ts(streamed), strip_ts(batch))
+        self.assertEqual(outputs["csv"].splitlines()[0], format_csv(results).splitlines()[0])
+        self.assertEqual(len(ET.fromstring(outputs["xml"].split("\n", 1)[1]).find("all_results")), 2)
+        self.assertEqual(ET.fromstring(format_xml(results).split("\n", 1)[1]).find("all_results")[1].get("reason"), "refused")
+
+    def test_stream_writer_subclasses_must_write_results(self):
+        from netcheck.utils.sinks import StreamWriter
+
+        class Incomplete(StreamWriter):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete(io.StringIO())
+
+    def test_batch_file_sinks_split_by_outcome(self):
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            res_file = os.path.join(tmp, "result.csv")
+            fail_file = os.path.join(tmp, "fail.csv")
+            sinks = BatchFileSinks("csv", res_file, fail_file)
+            sinks.write({"target": "a:80", "success": True, "metadata": {"host": "a", "port": 80}})
+            sinks.write({"target": "a:81", "success": True, "metadata": {"host": "a", "port": 81}})
+            sinks.close()
+            self.assertEqual((sinks.success_count, sinks.fail_count), (2, 0))
+            with open(res_file) as f:
+                self.assertEqual(f.readline().strip(), "Status,Host,Port,Method,Timestamp")
+            # No failures means no failure file, as in buffered batch mode
+            self.assertFalse(os.path.exists(fail_file))
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_circuit_breaker_opens_probes_and_closes(self):
+        timeout = {"success": False, "metadata": {"timed_out": True}}
+        refused = {"success": False, "metadata": {"timed_out": False}}
+        breaker = HostCircuitBreaker(threshold=2, probe_interval=0.05)
+        breaker.record("h", timeout)
+        self.assertTrue(breaker.allow("h"))
+        breaker.record("h", timeout)
+        self.assertTrue(breaker.is_open("h"))
+        self.assertFalse(breaker.allow("h"))
+        import time
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow("h"))   # one probe per interval
+        self.assertFalse(breaker.allow("h"))
+        breaker.record("h", refused)          # any answer means the host is up
+        self.assertFalse(breaker.is_open("h"))
+        self.assertEqual((breaker.opened, breaker.skipped), (1, 2))
+
+class TestAIMDController(unittest.TestCase):
+    def test_aimd_controller_slow_start_cut_and_bounds(self):
+        ok = {"success": True, "latency_ms": 10.0}
+        timeout = {"success": False, "error": "x", "metadata": {"error_class": "timeout"}}
+        aimd = AIMDController(8, floor=4, ceiling=40)
+        for expected in (16, 32, 40):  # slow start doubles each clean round, up to the ceiling
+            for _ in range(aimd.limit):
+                aimd.record(ok)
+            self.assertEqual(aimd.limit, expected)
+        for _ in range(aimd.limit):
+            aimd.record(timeout)
+        self.assertEqual(aimd.limit, 20)
+        for _ in range(aimd.limit):
+            aimd.record(ok)
+        self.assertEqual(aimd.limit, 21)  # additive increase after the first cut
+        # An RTT well above the best round seen counts as congestion too
+        for _ in range(aimd.limit):
+            aimd.record({"success": True, "latency_ms": 100.0})
+        self.assertEqual(aimd.limit, 10)
+        for _ in range(3):
+            for _ in range(max(aimd.limit, 8)):
+                aimd.record(timeout)
+        self.assertEqual(aimd.limit, 4)
+        self.assertEqual([limit for _, limit in aimd.trajectory], [8, 16, 32, 40, 20, 21, 10, 5, 4])
+        self.assertIn("peak 40, final 4", aimd.summary())
+
+class TestScanThrottle(unittest.TestCase):
+    def test_token_bucket_and_scan_throttle(self):
+        bucket = TokenBucket(10.0, burst=3)
+        self.assertEqual([round(bucket.reserve(now=100.0), 3) for _ in range(5)], [0.0, 0.0, 0.0, 0.1, 0.2])
+        throttle = ScanThrottle(per_host=2)
+        self.assertEqual((throttle.admit("a"), throttle.admit("a"), throttle.admit("a"), throttle.admit("b")), (0.0, 0.0, None, 0.0))
+        throttle.release("a")
+        self.assertEqual(throttle.admit("a"), 0.0)
+
+    def test_scan_throttle_paces_hosts_and_subnets(self):
+        self.assertEqual(subnet_of("10.1.2.3"), subnet_of("10.1.2.200"))
+        self.assertNotEqual(subnet_of("10.1.2.3"), subnet_of("10.1.3.3"))
+        self.assertEqual(subnet_of("2001:db8::1"), subnet_of("2001:db8::ffff:1"))
+        self.assertIsNone(subnet_of("example.com"))
+
+        throttle = ScanThrottle(host_rate=1.0, subnet_rate=1.0)
+        throttle.addresses["web.example"] = ["10.0.0.9"]
+        self.assertEqual(throttle.admit("10.0.0.1"), 0.0)
+        # Same host, and a different host in the same /24 (by name), wait without a slot
+        again = throttle.admit("10.0.0.1")
+        self.assertIsInstance(again, Deferred)
+        self.assertGreater(again, 0.9)
+        self.assertIsInstance(throttle.admit("web.example"), Deferred)
+        self.assertEqual(throttle.admit("10.0.1.1"), 0.0)
+        self.assertEqual(throttle.admit("other.example"), 0.0)
+
+class TestFairQueue(unittest.TestCase):
+    def test_fair_queue_round_robins_by_weight(self):
+        queue = FairQueue()
+        queue.add(range(100))
+        queue.add("ab")
+        queue.add("XYZ", weight=2)
+        merged = list(queue)
+        self.assertEqual(merged[:8], [0, "a", "X", "Y", 1, "b", "Z", 2])
+        self.assertEqual(merged[8:], list(range(3, 100)))
+
+class TestFeistelPermutation(unittest.TestCase):
+    def test_feistel_permutation_is_a_seeded_bijection(self):
+        for size in (0, 1, 2, 5, 255, 256, 1000):
+            self.assertEqual(sorted(FeistelPermutation(size, 7)), list(range(size)))
+        self.assertEqual(list(FeistelPermutation(1000, 7)), list(FeistelPermutation(1000, 7)))
+        self.assertNotEqual(list(FeistelPermutation(1000, 7)), list(FeistelPermutation(1000, 8)))
+        self.assertNotEqual(list(FeistelPermutation(1000, 7)), list(range(1000)))
+        # Random access into a space far too large to list
+        huge = FeistelPermutation(2 ** 32 * 65535, 1)
+        self.assertLess(huge[123456789], len(huge))
+        with self.assertRaises(IndexError):
+            huge[len(huge)]
+
+class TestScanJournal(unittest.TestCase):
+    def test_scan_journal_resumes_after_a_crash(self):
+        import tempfile
+        lines = [("10.0.0.1-3", "80,443")]
+        targets = [(f"10.0.0.{h}", p) for h in (1, 2, 3) for p in (80, 443)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scan.journal")
+            journal = ScanJournal.create(path, targets_fingerprint(lines), len(targets), {"seed": 5})
+            tracked = journal.track(iter(targets))
+            for target in [next(tracked) for _ in range(3)]:
+                journal.record(target, {"target": "%s:%d" % target, "success": True})
+            journal.close()
+            # A line torn by the crash is ignored and its target checked again
+            with open(path, "a") as f:
+                f.write('{"i": [3], "res')
+
+            resumed = ScanJournal.resume(path, targets_fingerprint(lines))
+            self.assertEqual((resumed.completed, resumed.options), (3, {"seed": 5}))
+            remaining = list(resumed.track(iter(targets)))
+            self.assertEqual(remaining, targets[3:])
+            for target in remaining:
+                resumed.record(target, {"target": "%s:%d" % target, "success": False})
+            resumed.close()
+            self.assertEqual([r["target"] for r in resumed.previous_results()], ["%s:%d" % t for t in targets])
+            with self.assertRaises(ValueError):
+                ScanJournal.resume(path, targets_fingerprint([("10.0.0.9", "80")]))
+
 class TestMCPIntegration(unittest.TestCase):
     def test_mcp_tools_list(self):
         tool_names = [t["name"] for t in TOOLS_LIST]
@@ -359,5 +1277,20 @@ class TestFormatterOutputs(unittest.TestCase):
         self.assertEqual(root.tag, "ping_check")
         self.assertEqual(root.find("packet_loss_pct").text, "0.0")
 
+    def test_skipped_host_down_is_distinct_in_every_format(self):
+        from netcheck.utils.formatters import format_json, format_csv, format_xml, format_text
+        import json
+        import xml.etree.ElementTree as ET
+        results = [
+            {"target": "a:80", "success": False, "status": "FAILED", "latency_ms": 1.0, "error": "refused", "metadata": {"host": "a", "port": 80}},
+            {"target": "a:81", "success": False, "status": "SKIPPED_HOST_DOWN", "latency_ms": None, "error": "Skipped: host down", "metadata": {"host": "a", "port": 81}},
+        ]
+        rows = json.loads(format_json(results))["failures"]
+        self.assertEqual([r["status"] for r in rows], ["failed", "SKIPPED_HOST_DOWN"])
+        self.assertEqual([line.split(",")[0] for line in format_csv(results).splitlines()[1:]], ["FAILED", "SKIPPED_HOST_DOWN"])
+        connections = ET.fromstring(format_xml(results).split("\n", 1)[1]).find("failed_connections")
+        self.assertEqual([c.get("status") for c in connections], [None, "SKIPPED_HOST_DOWN"])
+        self.assertIn("SKIPPED_HOST_DOWN", format_text(results, use_color=False))
+
 if __name__ == "__main__":
     unittest.main()